@@ -1,7 +1,36 @@
-from collections import defaultdict
-
 from Admin.cell import Cell
 from Common.board import GameBoard as IGameBoard
+from Lib.bitboard import CELL_INDEX, read_board
+from Lib.zobrist import height_key, player_keys
+
+# Coordinate pairs of the standard 6x6 board, row by row
+ROW_MAJOR_CELLS = [(x, y) for y in range(6) for x in range(6)]
+
+
+class CellMap(dict):
+    """
+    Dictionary mapping coordinate pairs to Cells that creates an empty Cell the first
+    time a coordinate pair is looked up, and remembers the order Cells were created in
+    """
+
+    def __init__(self):
+        """
+        Initializes an empty CellMap
+        """
+        super().__init__()
+        # Position of every coordinate pair in the order the Cells were created
+        self.rank = {}  # type: Dict[Tuple[int, int], int]
+
+    def __missing__(self, key):
+        """
+        Creates an empty Cell for a coordinate pair that has not been looked up before
+
+        :param key: Coordinate pair of the Cell
+        :return:    The new Cell
+        """
+        self.rank[key] = len(self)
+        cell = self[key] = Cell()
+        return cell
 
 
 class GameBoard(IGameBoard):
@@ -12,7 +41,13 @@ class GameBoard(IGameBoard):
         Initializes this GameBoard with default values
         """
         # The dictionary backend mapping coordinate pairs to Cells
-        self.__board = defaultdict(Cell)  # type: DefaultDict[Tuple[int, int], Cell]
+        self.__board = CellMap()  # type: CellMap
+        # Live index of where every worker on the board is
+        self.__workers = {}  # type: Dict[Tuple[str, int], Tuple[int, int]]
+        # Zobrist key of the heights and workers of the standard cells, kept up to date by every change
+        self.__key = 0  # type: int
+        # Heights and occupancy of the standard cells, built on first use and kept up to date by every change
+        self.__bits = None  # type: Optional[BitBoard]
 
     def place_worker(self, pid, wid, x, y):
         """
@@ -28,7 +63,7 @@ class GameBoard(IGameBoard):
         :type y:    int
         """
         # Place the worker in the destination coordinates by setting its player_id and worker_id
-        self.__get_cell(x, y).place_worker(pid, wid)
+        self.__set_worker(pid, wid, x, y)
 
     def move_worker(self, x1, y1, x2, y2):
         """
@@ -46,9 +81,9 @@ class GameBoard(IGameBoard):
         # Get the origin Cell of the worker
         origin_cell = self.__get_cell(x1, y1)
         # Place the worker in the destination coordinates by setting its player_id and worker_id
-        self.__get_cell(x2, y2).place_worker(origin_cell.player_id, origin_cell.worker_id)
+        self.__set_worker(origin_cell.player_id, origin_cell.worker_id, x2, y2)
         # Remove the worker from the origin Cell
-        origin_cell.clear_worker()
+        self.__set_worker(None, None, x1, y1)
 
     def build_floor(self, x, y, n=1):
         """
@@ -61,8 +96,47 @@ class GameBoard(IGameBoard):
         :param n: Represents how many floors to build
         :type n:  int
         """
+        cell = self.__get_cell(x, y)
+        index = CELL_INDEX.get((x, y))
+        if index is not None:
+            self.__key ^= height_key(index, cell.height) ^ height_key(index, cell.height + n)
+            if self.__bits is not None:
+                self.__bits.set_height(index, cell.height + n)
         # Build onto the building at the given coordinates
-        self.__get_cell(x, y).build(n)
+        cell.build(n)
+
+    def __set_worker(self, pid, wid, x, y):
+        """
+        Sets the worker in the Cell at x,y and keeps the worker index in sync
+
+        :param pid: Identifies the player whose worker to set, None to clear the Cell
+        :type pid:  Optional[str]
+        :param wid: Identifies the worker to set, None to clear the Cell
+        :type wid:  Optional[int]
+        :param x:   Represents the x coordinate of the targeted board cell
+        :type x:    int
+        :param y:   Represents the y coordinate of the targeted board cell
+        :type y:    int
+        """
+        cell = self.__get_cell(x, y)
+        # Drop the worker currently in the Cell from the index, unless it was indexed elsewhere
+        replaced = (cell.player_id, cell.worker_id)
+        if self.__workers.get(replaced) == (x, y):
+            del self.__workers[replaced]
+
+        index = CELL_INDEX.get((x, y))
+        if index is not None:
+            if cell.player_id:
+                self.__key ^= player_keys(cell.player_id)[index]
+            if pid:
+                self.__key ^= player_keys(pid)[index]
+            if self.__bits is not None:
+                self.__bits.set_occupied(index, bool(pid))
+
+        cell.place_worker(pid, wid)
+        # Cells without a player id have never counted as holding a worker
+        if pid:
+            self.__workers[(pid, wid)] = (x, y)
 
     def __get_cell(self, x, y):
         """
@@ -90,6 +164,58 @@ class GameBoard(IGameBoard):
         """
         return self.__get_cell(x, y).height
 
+    def get_heights(self):
+        """
+        Returns the height of every cell of the standard board, row by row, without
+        creating Cells for the ones that have not been looked up yet
+
+        :return: Height of the Cells at (0,0), (1,0), ... (5,5)
+        :rtype   List[int]
+        """
+        cells = self.__board
+        return [cells[xy].height if xy in cells else 0 for xy in ROW_MAJOR_CELLS]
+
+    def get_bitboard(self):
+        """
+        Returns the heights and occupancy of the standard cells, kept up to date by every
+        change from the first call on. Callers must not change it, Lib.bitboard.from_board
+        gives a copy that can be changed.
+
+        :return: Heights and occupancy of the board
+        :rtype   BitBoard
+        """
+        if self.__bits is None:
+            self.__bits = read_board(self)
+        return self.__bits
+
+    def peek(self, x, y):
+        """
+        Returns the contents of the Cell at the given coordinates without creating
+        the Cell if it has not been looked up yet
+
+        :param x: Represents the x coordinate of the Cell to get
+        :type x:  int
+        :param y: Represents the y coordinate of the Cell to get
+        :type y:  int
+        :return:  Height, player ID and worker ID of the Cell
+        :rtype    Tuple[int, Optional[str], Optional[int]]
+        """
+        cell = self.__board.get((x, y))
+        if cell is None:
+            return 0, None, None
+        return cell.height, cell.player_id, cell.worker_id
+
+    def hash_key(self):
+        """
+        Returns the Zobrist key of the heights and workers of the standard cells, the
+        same for any two boards in the same position. Workers are told apart by their
+        player only, and cells off the standard board are not part of the key.
+
+        :return:  64 bit key of the position
+        :rtype    int
+        """
+        return self.__key
+
     def get_player_id(self, x, y):
         """
         Gets the player ID for the given coordinates if there is one
@@ -127,14 +253,7 @@ class GameBoard(IGameBoard):
         :return:    x, y coordinate of the Worker, or None if it does not exist
         :rtype      Optional[Tuple[int, int]]
         """
-        # Iterate over the entire __board
-        for key, value in self.__board.items():
-            # Search for a Cell with the given player_id and worker_id
-            if value.player_id == pid and value.worker_id == wid:
-                # Return its coordinates
-                return key
-        # Otherwise, there was no Cell matching the given player_id and worker_id
-        return None
+        return self.__workers.get((pid, wid))
 
     def find_player_workers(self, pid):
         """
@@ -143,11 +262,9 @@ class GameBoard(IGameBoard):
         :param pid: string, id of player
         :return: [(N, N), ...], positions of player's workers
         """
-        workers = []
-        for key, value in self.__board.items():
-            if value.player_id and value.player_id == pid:
-                workers.append(key)
-        return workers
+        workers = [xy for (player_id, _), xy in self.__workers.items() if player_id == pid]
+        # Keep the order Cells were created in, which callers like gen_moves have always relied on
+        return sorted(workers, key=self.__board.rank.__getitem__)
 
     def find_workers(self):
         """
@@ -156,12 +273,5 @@ class GameBoard(IGameBoard):
         :return: x, y coordinates of the workers, or None if there are no workers
         :rtype   Optional[List[Tuple[int, int]]]
         """
-        workers = []
-        # Iterate over the entire __board
-        for key, value in self.__board.items():
-            # Search for a Cell with the given player_id and worker_id
-            if value.player_id:
-                # Return its coordinates
-                workers.append(key)
-        # Otherwise, there was no Cell matching the given player_id and worker_id
-        return workers
+        # Keep the order Cells were created in, which callers like gen_moves have always relied on
+        return sorted(self.__workers.values(), key=self.__board.rank.__getitem__)
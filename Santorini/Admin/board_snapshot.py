@@ -0,0 +1,255 @@
+# Copy-on-write views of a GameBoard, handed to players and observers instead of deep copies
+import copy
+import weakref
+
+from Common.board import GameBoard as IGameBoard
+from Lib.bitboard import read_board
+
+
+class BoardSnapshot(IGameBoard):
+    """
+    Read-only view of a GameBoard that turns into a private deep copy the first
+    time it is written to, or when the board it views is about to change.
+
+    While attached, reads go to the viewed board through peek when it has one,
+    so looking at a GameBoard through a snapshot never creates Cells in it.
+    """
+
+    def __init__(self, board):
+        """
+        Initializes a BoardSnapshot viewing the given board
+
+        :param board: GameBoard, the board to view
+        """
+        # The board this snapshot reads from, either the viewed board or a private copy of it
+        self.__board = board  # type: GameBoard
+        # Whether __board is a private copy
+        self.__detached = False  # type: bool
+
+    @property
+    def detached(self):
+        """
+        Whether this snapshot has its own copy of the board
+
+        :return: bool, True once detached
+        """
+        return self.__detached
+
+    def detach(self):
+        """
+        Replaces the viewed board with a private deep copy, if not done already
+        """
+        if not self.__detached:
+            self.__board = copy.deepcopy(self.__board)
+            self.__detached = True
+
+    def __deepcopy__(self, memo):
+        """
+        Copy the board as it looks through this snapshot
+
+        :return: GameBoard, an independent copy of the board
+        """
+        return copy.deepcopy(self.__board, memo)
+
+    def place_worker(self, pid, wid, x, y):
+        """
+        Places a worker with given pid and wid at the cell x,y of this snapshot's own copy
+
+        :param pid: Identifies the player whose worker to place
+        :type pid:  str
+        :param wid: Identifies the worker to place
+        :type wid:  int
+        :param x:   Represents the x coordinate of the targeted board cell
+        :type x:    int
+        :param y:   Represents the y coordinate of the targeted board cell
+        :type y:    int
+        """
+        self.detach()
+        self.__board.place_worker(pid, wid, x, y)
+
+    def move_worker(self, x1, y1, x2, y2):
+        """
+        Moves a worker from x1,y1 to x2,y2 on this snapshot's own copy
+
+        :param x1: Represents the x coordinate of the source board cell
+        :type x1:  int
+        :param y1: Represents the y coordinate of the source board cell
+        :type y1:  int
+        :param x2: Represents the x coordinate of the destination board cell
+        :type x2:  int
+        :param y2: Represents the y coordinate of the destination board cell
+        :type y2:  int
+        """
+        self.detach()
+        self.__board.move_worker(x1, y1, x2, y2)
+
+    def build_floor(self, x, y, n=1):
+        """
+        Adds n floors to the Cell at x,y of this snapshot's own copy
+
+        :param x: Represents the x coordinate of the board cell
+        :type x:  int
+        :param y: Represents the y coordinate of the board cell
+        :type y:  int
+        :param n: Represents how many floors to build
+        :type n:  int
+        """
+        self.detach()
+        self.__board.build_floor(x, y, n)
+
+    def get_height(self, x, y):
+        """
+        Returns the height of the Cell at the given coordinates
+
+        :param x: Represents the x coordinate of the Cell to get
+        :type x:  int
+        :param y: Represents the y coordinate of the Cell to get
+        :type y:  int
+        :return:  Height of the Cell
+        :rtype    float
+        """
+        return self.peek(x, y)[0]
+
+    def get_player_id(self, x, y):
+        """
+        Gets the player ID for the given coordinates if there is one
+
+        :param x: Represents the x coordinate of the Cell to get
+        :type x:  int
+        :param y: Represents the y coordinate of the Cell to get
+        :type y:  int
+        :return:  Player ID if there is one, else None
+        :rtype    Optional[str]
+        """
+        return self.peek(x, y)[1]
+
+    def get_worker_id(self, x, y):
+        """
+        Gets the worker ID for the given coordinates if there is one
+
+        :param x: Represents the x coordinate of the Cell to get
+        :type x:  int
+        :param y: Represents the y coordinate of the Cell to get
+        :type y:  int
+        :return:  Worker ID if there is one, else None
+        :rtype    Optional[int]
+        """
+        return self.peek(x, y)[2]
+
+    def peek(self, x, y):
+        """
+        Returns the contents of the Cell at the given coordinates
+
+        :param x: Represents the x coordinate of the Cell to get
+        :type x:  int
+        :param y: Represents the y coordinate of the Cell to get
+        :type y:  int
+        :return:  Height, player ID and worker ID of the Cell
+        :rtype    Tuple[int, Optional[str], Optional[int]]
+        """
+        board = self.__board
+        # A private copy is read like any board, the viewed board is only peeked at
+        if self.__detached or not hasattr(board, 'peek'):
+            return board.get_height(x, y), board.get_player_id(x, y), board.get_worker_id(x, y)
+        return board.peek(x, y)
+
+    def get_heights(self):
+        """
+        Returns the height of every cell of the standard board, row by row
+
+        :return: Height of the Cells at (0,0), (1,0), ... (5,5)
+        :rtype   Sequence[int]
+        """
+        get_heights = getattr(self.__board, 'get_heights', None)
+        if get_heights is None:
+            return [self.get_height(x, y) for y in range(6) for x in range(6)]
+        return get_heights()
+
+    def get_bitboard(self):
+        """
+        Returns the heights and occupancy of the board as it looks through this snapshot.
+        Callers must not change it.
+
+        :return: Heights and occupancy of the board
+        :rtype   BitBoard
+        """
+        get_bitboard = getattr(self.__board, 'get_bitboard', None)
+        if get_bitboard is None:
+            return read_board(self)
+        return get_bitboard()
+
+    def hash_key(self):
+        """
+        Returns the Zobrist key of the position
+
+        :return: 64 bit key of the position
+        :rtype   int
+        """
+        return self.__board.hash_key()
+
+    def find_worker(self, pid, wid):
+        """
+        Method to find the x, y coordinates of the given Worker ID
+
+        :param pid: Identifies the player whose worker to look up
+        :type  pid: str
+        :param wid: Identifies the worker to look up
+        :type  wid: int
+        :return:    x, y coordinate of the Worker, or None if it does not exist
+        :rtype      Optional[Tuple[int, int]]
+        """
+        return self.__board.find_worker(pid, wid)
+
+    def find_player_workers(self, pid):
+        """
+        Find all workers of given player.
+
+        :param pid: string, id of player
+        :return: [(N, N), ...], positions of player's workers
+        """
+        return self.__board.find_player_workers(pid)
+
+    def find_workers(self):
+        """
+        Method to find the x, y coordinates of all the workers on the board
+
+        :return: x, y coordinates of the workers, or None if there are no workers
+        :rtype   Optional[List[Tuple[int, int]]]
+        """
+        return self.__board.find_workers()
+
+
+class SnapshotTracker:
+    """
+    Hands out BoardSnapshots of one board and remembers the ones still in use,
+    so that they can be detached before the board changes under them.
+    """
+
+    def __init__(self, board):
+        """
+        Initializes a SnapshotTracker for the given board
+
+        :param board: GameBoard, the board to hand out snapshots of
+        """
+        # The board snapshots are taken of
+        self.__board = board  # type: GameBoard
+        # Snapshots still viewing the board, dropped automatically once nobody holds them
+        self.__live = weakref.WeakSet()  # type: WeakSet[BoardSnapshot]
+
+    def snapshot(self):
+        """
+        Takes a snapshot of the board
+
+        :return: BoardSnapshot, view of the board
+        """
+        snapshot = BoardSnapshot(self.__board)
+        self.__live.add(snapshot)
+        return snapshot
+
+    def detach_all(self):
+        """
+        Detaches every snapshot still in use, call before changing the board
+        """
+        for snapshot in list(self.__live):
+            snapshot.detach()
+        self.__live.clear()
@@ -0,0 +1,305 @@
+from Common.board import GameBoard as IGameBoard
+from Lib.bitboard import read_board
+from Lib.zobrist import height_key, player_keys
+
+# Number of cells along each side of the board
+BOARD_SIZE = 6
+
+# Maps every on-board coordinate pair to its offset in the flat cell arrays
+CELL_INDEX = {(x, y): y * BOARD_SIZE + x for y in range(BOARD_SIZE) for x in range(BOARD_SIZE)}
+
+# Coordinates along either side that are on the board, a set so a lookup only hashes an int
+ON_BOARD = frozenset(range(BOARD_SIZE))
+
+# Maps every offset in the flat cell arrays back to its coordinate pair
+COORDINATES = [(x, y) for y in range(BOARD_SIZE) for x in range(BOARD_SIZE)]
+
+
+class CompactGameBoard(IGameBoard):
+    """
+    Class representing a Santorini game board backed by flat fixed-size arrays
+    instead of a dictionary of Cells.
+
+    Cells are laid out row by row, so the cell at x,y lives at offset y * 6 + x.
+    Lookups outside of the board behave like an empty ground-level Cell, the
+    same as the dictionary backed GameBoard. Reads check the coordinates against
+    ON_BOARD and index the arrays directly, without building a key tuple or a Cell.
+    """
+
+    def __init__(self):
+        """
+        Initializes this CompactGameBoard with default values
+        """
+        # Height of the building in every cell
+        self.__heights = bytearray(BOARD_SIZE * BOARD_SIZE)  # type: bytearray
+        # Occupant of every cell as a slot in __workers, 0 if the cell is empty
+        self.__occupants = bytearray(BOARD_SIZE * BOARD_SIZE)  # type: bytearray
+        # (player_id, worker_id) for every occupant slot, slot 0 is the empty cell
+        self.__workers = [(None, None)]  # type: List[Tuple[Optional[str], Optional[int]]]
+        # Reverse lookup of __workers
+        self.__slots = {(None, None): 0}  # type: Dict[Tuple[Optional[str], Optional[int]], int]
+        # Live index of where every worker on the board is, in the order they were placed
+        self.__positions = {}  # type: Dict[Tuple[str, int], Tuple[int, int]]
+        # Zobrist key of the heights and workers, kept up to date by every change
+        self.__key = 0  # type: int
+        # Heights and occupancy as a BitBoard, built on first use and kept up to date by every change
+        self.__bits = None  # type: Optional[BitBoard]
+
+    def __deepcopy__(self, memo):
+        """
+        Copy this board without walking its contents, player and worker ids are immutable
+
+        :return: CompactGameBoard, an independent copy of this board
+        """
+        board = CompactGameBoard.__new__(CompactGameBoard)
+        board.__heights = bytearray(self.__heights)
+        board.__occupants = bytearray(self.__occupants)
+        board.__workers = list(self.__workers)
+        board.__slots = dict(self.__slots)
+        board.__positions = dict(self.__positions)
+        board.__key = self.__key
+        board.__bits = None if self.__bits is None else self.__bits.copy()
+        return board
+
+    def place_worker(self, pid, wid, x, y):
+        """
+        Places a worker with given pid and wid at the cell x,y
+
+        :param pid: Identifies the player whose worker to place
+        :type pid:  str
+        :param wid: Identifies the worker to place
+        :type wid:  int
+        :param x:   Represents the x coordinate of the targeted board cell
+        :type x:    int
+        :param y:   Represents the y coordinate of the targeted board cell
+        :type y:    int
+        """
+        self.__set_occupant(self.__index(x, y), self.__slot(pid, wid))
+
+    def move_worker(self, x1, y1, x2, y2):
+        """
+        Moves a worker from x1,y1 to x2,y2.
+
+        :param x1: Represents the x coordinate of the source board cell
+        :type x1:  int
+        :param y1: Represents the y coordinate of the source board cell
+        :type y1:  int
+        :param x2: Represents the x coordinate of the destination board cell
+        :type x2:  int
+        :param y2: Represents the y coordinate of the destination board cell
+        :type y2:  int
+        """
+        origin = self.__index(x1, y1)
+        # Copy the occupant into the destination before clearing the origin
+        self.__set_occupant(self.__index(x2, y2), self.__occupants[origin])
+        self.__set_occupant(origin, 0)
+
+    def build_floor(self, x, y, n=1):
+        """
+        Adds 1 to the height of the Cell at x,y.
+
+        :param x: Represents the x coordinate of the Worker board cell
+        :type x:  int
+        :param y: Represents the y coordinate of the Worker board cell
+        :type y:  int
+        :param n: Represents how many floors to build
+        :type n:  int
+        """
+        index = self.__index(x, y)
+        height = self.__heights[index]
+        self.__heights[index] = height + n
+        self.__key ^= height_key(index, height) ^ height_key(index, height + n)
+        if self.__bits is not None:
+            self.__bits.set_height(index, height + n)
+
+    def get_height(self, x, y):
+        """
+        Returns the height of the Cell at the given coordinates
+
+        :param x: Represents the x coordinate of the Cell to get
+        :type x:  int
+        :param y: Represents the y coordinate of the Cell to get
+        :type y:  int
+        :return:  Height of the Cell
+        :rtype    float
+        """
+        if x in ON_BOARD and y in ON_BOARD:
+            return self.__heights[y * BOARD_SIZE + x]
+        return 0
+
+    def get_heights(self):
+        """
+        Returns the height of every cell, row by row
+
+        :return: Height of the Cells at (0,0), (1,0), ... (5,5)
+        :rtype   bytes
+        """
+        return bytes(self.__heights)
+
+    def get_bitboard(self):
+        """
+        Returns the heights and occupancy of the board, kept up to date by every change
+        from the first call on. Callers must not change it, Lib.bitboard.from_board gives
+        a copy that can be changed.
+
+        :return: Heights and occupancy of the board
+        :rtype   BitBoard
+        """
+        if self.__bits is None:
+            self.__bits = read_board(self)
+        return self.__bits
+
+    def hash_key(self):
+        """
+        Returns the Zobrist key of the heights and workers, the same for any two boards
+        in the same position. Workers are told apart by their player only.
+
+        :return:  64 bit key of the position
+        :rtype    int
+        """
+        return self.__key
+
+    def peek(self, x, y):
+        """
+        Returns the contents of the Cell at the given coordinates
+
+        :param x: Represents the x coordinate of the Cell to get
+        :type x:  int
+        :param y: Represents the y coordinate of the Cell to get
+        :type y:  int
+        :return:  Height, player ID and worker ID of the Cell
+        :rtype    Tuple[int, Optional[str], Optional[int]]
+        """
+        if x in ON_BOARD and y in ON_BOARD:
+            index = y * BOARD_SIZE + x
+            pid, wid = self.__workers[self.__occupants[index]]
+            return self.__heights[index], pid, wid
+        return 0, None, None
+
+    def get_player_id(self, x, y):
+        """
+        Gets the player ID for the given coordinates if there is one
+
+        :param x: Represents the x coordinate of the Cell to get
+        :type x:  int
+        :param y: Represents the y coordinate of the Cell to get
+        :type y:  int
+        :return:  Player ID if there is one, else None
+        :rtype    Optional[str]
+        """
+        if x in ON_BOARD and y in ON_BOARD:
+            return self.__workers[self.__occupants[y * BOARD_SIZE + x]][0]
+        return None
+
+    def get_worker_id(self, x, y):
+        """
+        Gets the worker ID for the given coordinates if there is one
+
+        :param x: Represents the x coordinate of the Cell to get
+        :type x:  int
+        :param y: Represents the y coordinate of the Cell to get
+        :type y:  int
+        :return:  Worker ID if there is one, else None
+        :rtype    Optional[int]
+        """
+        if x in ON_BOARD and y in ON_BOARD:
+            return self.__workers[self.__occupants[y * BOARD_SIZE + x]][1]
+        return None
+
+    def find_worker(self, pid, wid):
+        """
+        Method to find the x, y coordinates of the given Worker ID
+
+        :param pid: Identifies the player whose worker to look up
+        :type  pid: str
+        :param wid: Identifies the worker to look up
+        :type  wid: int
+        :return:    x, y coordinate of the Worker, or None if it does not exist
+        :rtype      Optional[Tuple[int, int]]
+        """
+        return self.__positions.get((pid, wid))
+
+    def find_player_workers(self, pid):
+        """
+        Find all workers of given player.
+
+        :param pid: string, id of player
+        :return: [(N, N), ...], positions of player's workers
+        """
+        return [xy for (player_id, _), xy in self.__positions.items() if player_id == pid]
+
+    def find_workers(self):
+        """
+        Method to find the x, y coordinates of all the workers on the board
+
+        :return: x, y coordinates of the workers, or None if there are no workers
+        :rtype   Optional[List[Tuple[int, int]]]
+        """
+        return list(self.__positions.values())
+
+    def __set_occupant(self, index, slot):
+        """
+        Sets the occupant of a cell and keeps the worker index in sync
+
+        :param index: Offset of the cell in the cell arrays
+        :type index:  int
+        :param slot:  Occupant slot of the worker, 0 to clear the cell
+        :type slot:   int
+        """
+        xy = COORDINATES[index]
+        # Drop the worker currently in the cell from the index, unless it was indexed elsewhere
+        replaced = self.__workers[self.__occupants[index]]
+        if self.__positions.get(replaced) == xy:
+            del self.__positions[replaced]
+
+        self.__occupants[index] = slot
+        worker = self.__workers[slot]
+        if replaced[0]:
+            self.__key ^= player_keys(replaced[0])[index]
+        if worker[0]:
+            self.__key ^= player_keys(worker[0])[index]
+        if self.__bits is not None:
+            self.__bits.set_occupied(index, bool(worker[0]))
+        # Cells without a player id have never counted as holding a worker
+        if worker[0]:
+            self.__positions[worker] = xy
+
+    def __slot(self, pid, wid):
+        """
+        Looks up the occupant slot for the given worker, registering it if it is new
+
+        :param pid: Identifies the player whose worker to look up
+        :type pid:  str
+        :param wid: Identifies the worker to look up
+        :type wid:  int
+        :return:    Occupant slot of the worker
+        :rtype      int
+        """
+        # Placing a worker without a player clears the cell, like Cell.place_worker(None, None)
+        if pid is None:
+            return 0
+
+        key = (pid, wid)
+        slot = self.__slots.get(key)
+        if slot is None:
+            slot = len(self.__workers)
+            self.__workers.append(key)
+            self.__slots[key] = slot
+        return slot
+
+    def __index(self, x, y):
+        """
+        Looks up the offset of (x,y) in the cell arrays
+
+        :param x: Represents the x coordinate of the Cell
+        :type x:  int
+        :param y: Represents the y coordinate of the Cell
+        :type y:  int
+        :return:  Offset of the Cell in the cell arrays
+        :rtype    int
+        :raise IndexError: if (x,y) is not on the board
+        """
+        try:
+            return CELL_INDEX[(x, y)]
+        except KeyError:
+            raise IndexError("({}, {}) is not on the board".format(x, y))
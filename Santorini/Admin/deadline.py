@@ -0,0 +1,189 @@
+"""
+Deadlines for calls into players. run_with_deadline raises DeadlineExceeded in
+the calling thread once a call runs past its time limit, like timeout_decorator,
+without building a decorated function per call and from any thread.
+
+On the main thread the limit is enforced with a SIGALRM interval timer whose
+handler is installed once. On any other thread one shared watchdog thread
+raises DeadlineExceeded asynchronously in the late thread. An asynchronous
+exception is only delivered while the thread runs Python code, so off the main
+thread a call blocked in C (a socket read, a sleep) is interrupted once it
+returns to Python; give such calls their own timeouts.
+"""
+import ctypes
+import itertools
+import signal
+import threading
+import time
+
+from Common.exception import DeadlineExceeded
+
+
+class AlarmTimer:
+    """
+    Enforces deadlines on the main thread with a SIGALRM interval timer.
+    """
+
+    def __init__(self):
+        """
+        Initializes an unarmed AlarmTimer
+        """
+        # Whether a call is running under the timer, the alarm is ignored otherwise
+        self.__armed = False  # type: bool
+
+    def run(self, seconds, fn, args):
+        """
+        Call fn with args, raising DeadlineExceeded if it runs for more than seconds
+
+        :param seconds: float, time limit of the call
+        :param fn: function, function to call
+        :param args: tuple, arguments of the call
+        :return: any, result of the call
+        :raise DeadlineExceeded: if the call runs past its time limit
+        """
+        # Reinstall the handler only if something else replaced it since the last call
+        if signal.getsignal(signal.SIGALRM) != self.__on_alarm:
+            signal.signal(signal.SIGALRM, self.__on_alarm)
+
+        self.__armed = True
+        signal.setitimer(signal.ITIMER_REAL, seconds)
+        try:
+            return fn(*args)
+        finally:
+            # Disarm before stopping the timer so an alarm in between is ignored
+            self.__armed = False
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+    def __on_alarm(self, signum, frame):
+        """
+        Raise DeadlineExceeded in the main thread if a call is still running
+
+        :param signum: int, signal number
+        :param frame: frame, frame interrupted by the signal
+        :raise DeadlineExceeded: if a call is running under the timer
+        """
+        if self.__armed:
+            self.__armed = False
+            raise DeadlineExceeded()
+
+
+class Watchdog:
+    """
+    Enforces deadlines on any thread from a single background thread, which is
+    started the first time a deadline is armed and waits for the earliest one.
+    """
+
+    def __init__(self):
+        """
+        Initializes a Watchdog without any armed deadlines
+        """
+        # Guards the fields below and wakes the watchdog thread when an earlier deadline is armed
+        self.__condition = threading.Condition()
+        # (expiry, thread id) of every armed deadline by token
+        self.__armed = {}  # type: Dict[int, Tuple[float, int]]
+        # Source of unique tokens
+        self.__tokens = itertools.count()
+        # The watchdog thread, None until the first deadline is armed
+        self.__thread = None  # type: Optional[threading.Thread]
+
+    def run(self, seconds, fn, args):
+        """
+        Call fn with args, raising DeadlineExceeded if it runs for more than seconds
+
+        :param seconds: float, time limit of the call
+        :param fn: function, function to call
+        :param args: tuple, arguments of the call
+        :return: any, result of the call
+        :raise DeadlineExceeded: if the call runs past its time limit
+        """
+        token = self.__arm(seconds)
+        try:
+            result = fn(*args)
+        finally:
+            fired = self.__disarm(token)
+
+        # The deadline fired after the call returned but before it was disarmed
+        if fired:
+            raise DeadlineExceeded()
+        return result
+
+    def __arm(self, seconds):
+        """
+        Arm a deadline for the current thread
+
+        :param seconds: float, time from now until the deadline
+        :return: int, token to disarm the deadline with
+        """
+        expiry = time.monotonic() + seconds
+        with self.__condition:
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.__watch, name="deadline-watchdog", daemon=True)
+                self.__thread.start()
+
+            token = next(self.__tokens)
+            earliest = min((e for e, _ in self.__armed.values()), default=None)
+            self.__armed[token] = (expiry, threading.get_ident())
+            # Only wake the watchdog if it is waiting for a later deadline
+            if earliest is None or expiry < earliest:
+                self.__condition.notify()
+            return token
+
+    def __disarm(self, token):
+        """
+        Disarm a deadline of the current thread
+
+        :param token: int, token the deadline was armed with
+        :return: bool, True if the deadline fired
+        """
+        with self.__condition:
+            if self.__armed.pop(token, None) is not None:
+                return False
+
+        # Drop the exception if it is still pending, the caller raises it instead
+        ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(threading.get_ident()), None)
+        return True
+
+    def __watch(self):
+        """
+        Fire every deadline that passes, forever
+        """
+        with self.__condition:
+            while True:
+                if not self.__armed:
+                    self.__condition.wait()
+                    continue
+
+                token, (expiry, thread_id) = min(self.__armed.items(), key=lambda item: item[1][0])
+                remaining = expiry - time.monotonic()
+                if remaining > 0:
+                    self.__condition.wait(remaining)
+                    continue
+
+                del self.__armed[token]
+                ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id),
+                                                           ctypes.py_object(DeadlineExceeded))
+
+
+# Deadlines of the main thread, None where there are no interval timers
+ALARM_TIMER = AlarmTimer() if hasattr(signal, 'setitimer') else None
+
+# Deadlines of every other thread
+WATCHDOG = Watchdog()
+
+
+def run_with_deadline(seconds, fn, *args):
+    """
+    Call fn with args, raising DeadlineExceeded in the calling thread if it runs
+    for more than seconds. Calls without a positive time limit are not limited.
+
+    :param seconds: float, time limit of the call
+    :param fn: function, function to call
+    :param args: any, arguments of the call
+    :return: any, result of the call
+    :raise DeadlineExceeded: if the call runs past its time limit
+    """
+    if not seconds or seconds <= 0:
+        return fn(*args)
+    if ALARM_TIMER is not None and threading.current_thread() is threading.main_thread():
+        return ALARM_TIMER.run(seconds, fn, args)
+    return WATCHDOG.run(seconds, fn, args)
@@ -0,0 +1,282 @@
+# Compact binary records of whole games
+#
+# A record file starts with FILE_MAGIC and holds one game after another. Every game is
+# a header followed by its actions:
+#
+#   header:  GAME_HEADER, (length of the first player's id, length of the second
+#            player's id, result, number of actions), then both ids in UTF-8
+#   actions: one ACTION record per place, move or build, in the order they were taken
+#
+# The first player is the one that placed and moved first. The result packs the index
+# of the winner in its lowest bit and the index of the GameOverCondition in CONDITIONS
+# above it. An action packs, from the highest bit down, its kind (2 bits), the index of
+# its player (1 bit), the worker (1 bit), the cell it is taken from (6 bits) and the cell
+# it is taken to (6 bits). Cells are bit indexes of Lib.bitboard, and places have no
+# cell they are taken from.
+import mmap
+import struct
+
+from Admin.constants import WORKER_ONE_ID, WORKER_TWO_ID
+from Admin.game_over import GameOverCondition
+from Lib.bitboard import CELL_INDEX, COORDINATES
+
+# Bytes every record file starts with
+FILE_MAGIC = b"SGR\x01"
+
+# Lengths of both player ids, result and number of actions of a game
+GAME_HEADER = struct.Struct("<BBBH")
+
+# One packed action
+ACTION = struct.Struct("<H")
+
+# Kinds of actions, by their code
+ACTION_TYPES = ('place', 'move', 'build')
+
+# Worker ids, by their bit
+WORKER_IDS = (WORKER_ONE_ID, WORKER_TWO_ID)
+
+# Conditions a game can end on, by their code
+CONDITIONS = (GameOverCondition.FairGame, GameOverCondition.Crash, GameOverCondition.Timeout,
+              GameOverCondition.InvalidAction, GameOverCondition.LoserBrokeInTournament)
+
+
+class GameRecord:
+    """
+    Record of one game: who played it, how it ended and every action taken.
+
+    Attributes:
+        players:    (string, string), ids of the players, the one that went first first
+        winner:     N, index of the winner in players
+        condition:  GameOverCondition, how the game ended
+        actions:    [Action, ...], place, move and build actions in the order they were taken,
+                    each with the id of its player under 'p' and the id of its worker under 'wid'
+    """
+
+    def __init__(self, players, winner, condition, actions):
+        """
+        Initialize a record.
+
+        :param players: (string, string), ids of the players, the one that went first first
+        :param winner: N, index of the winner in players
+        :param condition: GameOverCondition, how the game ended
+        :param actions: [Action, ...], actions of the game in order
+        """
+        self.players = tuple(players)
+        self.winner = winner
+        self.condition = condition
+        self.actions = actions
+
+    @property
+    def winner_id(self):
+        """
+        Id of the winner
+
+        :return: string, id of the winner
+        """
+        return self.players[self.winner]
+
+    def __eq__(self, other):
+        return isinstance(other, GameRecord) and (self.players, self.winner, self.condition, self.actions) == \
+               (other.players, other.winner, other.condition, other.actions)
+
+    def __repr__(self):
+        return "GameRecord(players={!r}, winner={}, condition={}, actions={})".format(
+            self.players, self.winner, self.condition.name, len(self.actions))
+
+
+def encode(record):
+    """
+    Pack a record into bytes
+
+    :param record: GameRecord, record to pack
+    :return: bytes, packed record
+    :raise ValueError: if the record does not fit the format
+    """
+    ids = [pid.encode('utf-8') for pid in record.players]
+    result = CONDITIONS.index(record.condition) << 1 | record.winner
+    try:
+        parts = [GAME_HEADER.pack(len(ids[0]), len(ids[1]), result, len(record.actions))] + ids
+    except struct.error as e:
+        raise ValueError("Game does not fit a record: {}".format(e))
+    parts.extend(ACTION.pack(encode_action(action, record.players)) for action in record.actions)
+    return b"".join(parts)
+
+
+def encode_action(action, players):
+    """
+    Pack an action into an int
+
+    :param action: Action, place, move or build with the id of its player under 'p' and of its worker under 'wid'
+    :param players: (string, string), ids of the players of the game
+    :return: int, packed action
+    :raise ValueError: if the action does not fit the format
+    """
+    try:
+        kind = ACTION_TYPES.index(action['type'])
+        player = players.index(action['p'])
+        worker = WORKER_IDS.index(action['wid'])
+        if kind == 0:
+            origin, destination = 0, CELL_INDEX[tuple(action['xy'])]
+        else:
+            origin, destination = CELL_INDEX[tuple(action['xy1'])], CELL_INDEX[tuple(action['xy2'])]
+    except (KeyError, ValueError, TypeError):
+        raise ValueError("Action does not fit a record: {}".format(action))
+    return kind << 14 | player << 13 | worker << 12 | origin << 6 | destination
+
+
+def decode_action(code, players):
+    """
+    Unpack an action
+
+    :param code: int, packed action
+    :param players: (string, string), ids of the players of the game
+    :return: Action, the action with the id of its player under 'p' and of its worker under 'wid'
+    """
+    kind = ACTION_TYPES[code >> 14]
+    action = {'type': kind, 'p': players[code >> 13 & 1], 'wid': WORKER_IDS[code >> 12 & 1]}
+    destination = list(COORDINATES[code & 0x3F])
+    if kind == 'place':
+        action['xy'] = destination
+    else:
+        action['xy1'] = list(COORDINATES[code >> 6 & 0x3F])
+        action['xy2'] = destination
+    return action
+
+
+class GameRecordWriter:
+    """
+    Appends records to a binary file as games finish.
+    """
+
+    def __init__(self, output):
+        """
+        Initialize the writer, starting the file if it is empty.
+
+        :param output: writable binary file, positioned at its end
+        """
+        self.__output = output
+        if output.tell() == 0:
+            output.write(FILE_MAGIC)
+
+    def write(self, record):
+        """
+        Append a record.
+
+        :param record: GameRecord, record to append
+        :raise ValueError: if the record does not fit the format
+        """
+        self.__output.write(encode(record))
+
+    def flush(self):
+        """
+        Flush the records written so far to the file.
+        """
+        self.__output.flush()
+
+
+class GameRecordReader:
+    """
+    Reads the records of a file one after another from a memory map, so files of
+    millions of games are never read into memory at once.
+
+    Iterating decodes every record, len and offsets only read the headers.
+    """
+
+    def __init__(self, path):
+        """
+        Open a record file.
+
+        :param path: string, path of the record file
+        :raise ValueError: if the file is not a record file
+        """
+        self.__file = open(path, 'rb')
+        self.__data = b""
+        try:
+            size = self.__file.seek(0, 2)
+            # Memory maps can not be empty, an empty file has no games
+            self.__data = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            if self.__data and self.__data[:len(FILE_MAGIC)] != FILE_MAGIC:
+                raise ValueError("Not a game record file: {}".format(path))
+        except:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Close the file.
+        """
+        if isinstance(self.__data, mmap.mmap):
+            self.__data.close()
+        self.__file.close()
+
+    def __iter__(self):
+        """
+        Decode every record of the file in order.
+
+        :return: generator of GameRecord
+        """
+        for offset in self.offsets():
+            yield self.read(offset)
+
+    def __len__(self):
+        """
+        Number of records in the file.
+
+        :return: N, number of records
+        """
+        return sum(1 for _ in self.offsets())
+
+    def offsets(self):
+        """
+        Offset of every record in the file, reading nothing but the headers.
+
+        :return: generator of N, offset of every record in order
+        :raise ValueError: if the file ends part way into a record
+        """
+        offset = len(FILE_MAGIC)
+        while offset < len(self.__data):
+            yield offset
+            offset = self.__record_end(offset)
+
+    def read(self, offset):
+        """
+        Decode the record at an offset.
+
+        :param offset: N, offset of the record, one given by offsets
+        :return: GameRecord, the record
+        :raise ValueError: if the file ends part way into the record
+        """
+        data = self.__data
+        self.__record_end(offset)
+        first, second, result, count = GAME_HEADER.unpack_from(data, offset)
+        offset += GAME_HEADER.size
+        players = (bytes(data[offset:offset + first]).decode('utf-8'),
+                   bytes(data[offset + first:offset + first + second]).decode('utf-8'))
+        offset += first + second
+        codes = struct.unpack_from("<{}H".format(count), data, offset)
+        actions = [decode_action(code, players) for code in codes]
+        return GameRecord(players, result & 1, CONDITIONS[result >> 1], actions)
+
+    def __record_end(self, offset):
+        """
+        Offset right after the record at an offset, checking the whole record is in the file.
+
+        :param offset: N, offset of the record
+        :return: N, offset of the next record
+        :raise ValueError: if the file ends part way into the record
+        """
+        data = self.__data
+        # A writer stopped part way through a game leaves its record cut short
+        if offset + GAME_HEADER.size > len(data):
+            raise ValueError("truncated record at offset {}".format(offset))
+        first, second, _, actions = GAME_HEADER.unpack_from(data, offset)
+        end = offset + GAME_HEADER.size + first + second + actions * ACTION.size
+        if end > len(data):
+            raise ValueError("truncated record at offset {}".format(offset))
+        return end
@@ -0,0 +1,181 @@
+# Rule checker that only re-examines the workers affected by the last change to the board
+
+from Admin.rule_checker import RuleChecker
+from Lib.bitboard import CELL_INDEX, board_bits
+from Lib.util import get_neighbors
+from Lib.zobrist import height_key, player_keys
+
+
+class IncrementalRuleChecker(RuleChecker):
+    """
+    RuleChecker that remembers which workers end the game and only re-examines
+    the ones on or next to a cell changed by the actions it is notified of with
+    notify_of_action. Everything else follows the standard rules, and as long as
+    those are not overridden workers are examined on the board's BitBoard.
+
+    The board's Zobrist key tells whether the board changed in any other way since
+    the last check, in which case every cached result is dropped, so changes the
+    checker is not told about cost speed but never correctness. Boards without
+    hash_key are checked like RuleChecker does.
+
+    Workers are gone through in find_workers order and every worker examined gets
+    the cells around it looked up like RuleChecker does, so a GameBoard, which orders
+    its workers by when their cells were first looked up, ends up in the same order
+    and the winner is always the one RuleChecker reports.
+    """
+
+    def __init__(self, board):
+        """
+        Initializes an IncrementalRuleChecker object with the given GameBoard
+
+        :param board: The GameBoard
+        :type board:  GameBoard
+        """
+        super().__init__(board)
+        # The GameBoard that the RuleChecker will be using for operations
+        self.__board = board  # type: GameBoard
+        # The players the cached results were computed for
+        self.__players = None  # type: Optional[Tuple[str, str]]
+        # Zobrist key of the board the cached results hold for, None if they may not hold
+        self.__key = None  # type: Optional[int]
+        # Result of check_worker_game_over for the workers that were examined and have not changed since
+        self.__winners = {}  # type: Dict[Tuple[int, int], Optional[str]]
+        # Cells whose neighbors have all been looked up, the way RuleChecker looks at them
+        self.__looked_around = set()  # type: Set[Tuple[int, int]]
+
+    def notify_of_action(self, action):
+        """
+        Notify the rule checker of an action that was just applied to its board, so only
+        the workers on or next to the changed cells are examined again
+
+        :param action: PLACE | MOVE | BUILD, action applied to the board
+        """
+        hash_key = getattr(self.__board, 'hash_key', None)
+        if hash_key is None or self.__key is None:
+            return
+
+        # The cached results only carry over if this action is the only change since they were computed
+        key = hash_key()
+        if self.__key ^ self.__key_change(action) != key:
+            self.__key = None
+            return
+
+        self.__key = key
+        for xy in (action[cell] for cell in ('xy', 'xy1', 'xy2') if cell in action):
+            self.__forget(tuple(xy))
+
+    def check_game_over(self, player1, player2):
+        """
+        Determines the winner if the game is over
+
+        :param player1: ID of the first player
+        :type player1:  str
+        :param player2: ID of the second player
+        :type player2:  str
+        :return:        Player ID if there is a winner, else None
+        :rtype:         Optional[str]
+        """
+        hash_key = getattr(self.__board, 'hash_key', None)
+        if hash_key is None:
+            return super().check_game_over(player1, player2)
+
+        # Forget the cached results if the board changed in a way this checker was not notified of
+        key = hash_key()
+        if key != self.__key or self.__players != (player1, player2):
+            self.__winners = {}
+        self.__players = (player1, player2)
+        self.__key = key
+
+        # Standard rules can be checked on a bitboard, fetched when the first worker needs examining
+        bits = None
+
+        # Go through the workers in order until one of them decides the game
+        for xy in self.__board.find_workers():
+            winner = self.__winners.get(xy, False)
+            if winner is False:
+                if self.bitboard_rules and xy in CELL_INDEX:
+                    if bits is None:
+                        bits = board_bits(self.__board)
+                    winner = self.__bitboard_winner(bits, xy, player1, player2)
+                else:
+                    winner = self.check_worker_game_over(xy[0], xy[1], player1, player2)
+                self.__winners[xy] = winner
+            if xy not in self.__looked_around:
+                self.__look_around(xy)
+            if winner is not None:
+                return winner
+
+        # Otherwise, the game is not over, so there is no winner
+        return None
+
+    def __bitboard_winner(self, bits, xy, player1, player2):
+        """
+        Determines the winner if the given worker ends the game, the same way as
+        check_worker_game_over under the standard rules
+
+        :param bits: BitBoard, heights and occupancy of the board
+        :param xy: Tuple[int, int], coordinates of the worker
+        :param player1: ID of the first player
+        :param player2: ID of the second player
+        :return: Player ID if this worker decides the game, else None
+        """
+        index = CELL_INDEX[xy]
+        player = self.__board.get_player_id(*xy)
+
+        # Check if current worker is on the third floor
+        if bits.heights[index] == 3:
+            return player
+
+        # If the worker can't build or can't move, the winner will be the other player
+        if not (bits.move_targets(index) and bits.build_targets(index)):
+            return player2 if player == player1 else player1
+
+        # This worker does not end the game
+        return None
+
+    def __look_around(self, xy):
+        """
+        Looks up the cells around a worker in the order check_worker_game_over does,
+        unless the worker is on the third floor, which it decides without looking around
+
+        :param xy: Tuple[int, int], coordinates of the worker
+        """
+        if self.__board.get_height(*xy) == 3:
+            return
+        for neighbor in get_neighbors(*xy):
+            self.__board.get_height(*neighbor)
+        self.__looked_around.add(xy)
+
+    def __key_change(self, action):
+        """
+        Change the given action made to the board's Zobrist key, as read from the board after it
+
+        :param action: PLACE | MOVE | BUILD, action applied to the board
+        :return: int, XOR of the keys the action added and removed
+        """
+        if 'xy' in action:
+            index = CELL_INDEX.get(tuple(action['xy']))
+            if index is None:
+                return 0
+            return player_keys(self.__board.get_player_id(*action['xy']))[index]
+
+        xy1, xy2 = tuple(action['xy1']), tuple(action['xy2'])
+        origin, destination = CELL_INDEX.get(xy1), CELL_INDEX.get(xy2)
+        if action.get('type') == 'move':
+            keys = player_keys(self.__board.get_player_id(*xy2))
+            return (0 if origin is None else keys[origin]) ^ (0 if destination is None else keys[destination])
+
+        if destination is None:
+            return 0
+        height = self.__board.get_height(*xy2)
+        return height_key(destination, height - 1) ^ height_key(destination, height)
+
+    def __forget(self, xy):
+        """
+        Drops the cached results of the workers on or next to a changed cell
+
+        :param xy: Tuple[int, int], coordinates of the changed cell
+        """
+        self.__winners.pop(xy, None)
+        for neighbor in get_neighbors(*xy):
+            self.__winners.pop(neighbor, None)
@@ -6,20 +6,56 @@ Referee uses the ObserverManager to abstract out observer functionalities.
 """
 
 import copy
+import queue
+import threading
+from enum import Enum
+
+
+class QueuePolicy(Enum):
+    """ What an asynchronous ObserverManager does with an update when its queue is full. """
+
+    Block = "Wait for the observers to catch up, slowing down the game"
+    DropNewest = "Drop the new update"
+    DropOldest = "Drop the oldest update in the queue to make room for the new one"
+
 
 class ObserverManager:
     """
     Manage the observers for a referee by updating them.
+
+    By default observers are updated right away, in the referee's thread. Given a queue
+    size, updates are put on a queue of that size instead and a background thread
+    updates the observers, so slow observers do not slow down the game. When the queue
+    is full the policy decides whether the game waits or an update is dropped. Either
+    way observers get the updates they are not dropped from in order, and an observer
+    that breaks is removed.
+
+    Updates hold what they need when they are made. Queued updates hold their own copy
+    of the board, detaching board snapshots when they are queued, so the background
+    thread never reads the board the game goes on with and late updates show the game
+    as it was.
     """
 
-    def __init__(self, observers):
+    def __init__(self, observers, queue_size=None, policy=QueuePolicy.Block):
         """
         Initialize manager's observers, board state, and players
 
         :param observers: [Observer, ...], list of observers 
-        :param board: GameBoard, copy of board
+        :param queue_size: N | None, number of updates waiting for a background thread,
+                           None to update observers right away
+        :param policy: QueuePolicy, what to do with an update when the queue is full
         """
         self.observers = observers
+        self.policy = policy
+        # Number of updates dropped because the queue was full
+        self.dropped = 0  # type: int
+
+        # Updates waiting for the background thread, None when observers are updated right away
+        self.__queue = queue.Queue(queue_size) if queue_size else None  # type: Optional[queue.Queue]
+        # Background thread updating the observers, started with the first update
+        self.__worker = None  # type: Optional[threading.Thread]
+        # Guards the observer list, which the background thread removes broken observers from
+        self.__lock = threading.Lock()
 
 
     def add_observer(self, observer):
@@ -28,14 +64,36 @@ class ObserverManager:
 
         :param observer: Observer, observer of series of games.
         """
-        self.observers.append(observer)
+        with self.__lock:
+            self.observers.append(observer)
+
+
+    def flush(self):
+        """
+        Wait until every queued update is delivered.
+        """
+        if self.__queue is not None:
+            self.__queue.join()
+
+
+    def close(self):
+        """
+        Deliver every queued update and stop the background thread, which the next
+        update starts again.
+        """
+        if self.__worker is not None:
+            # The background thread stops at None, queued behind every update
+            self.__queue.put(None)
+            self.__worker.join()
+            self.__worker = None
 
 
     def update_state(self, board):
         """
         Update observers about state of game.
         """
-        self.__obs(lambda obs: obs.update_state_of_game(board))
+        board = self.__own_board(board)
+        self.__dispatch(lambda obs: obs.update_state_of_game(board))
 
 
     def update_action(self, player, board):
@@ -47,12 +105,13 @@ class ObserverManager:
         last_move = player.last_move()
         last_build = player.last_build()
         wid = last_move[0]
+        board = self.__own_board(board)
 
         def go(observer):
             observer.update_action(wid, last_move[1], last_build[1])
             observer.update_state_of_game(board)
 
-        self.__obs(go)
+        self.__dispatch(go)
 
 
     def give_up(self, pid):
@@ -61,7 +120,7 @@ class ObserverManager:
 
         :param pid: string, id of player
         """
-        self.__obs(lambda obs: obs.give_up(pid))
+        self.__dispatch(lambda obs: obs.give_up(pid))
 
 
     def error(self, pid, message):
@@ -71,7 +130,7 @@ class ObserverManager:
         :param pid: string, player id
         :param message: string, error message
         """
-        self.__obs(lambda obs: obs.error(pid, message))
+        self.__dispatch(lambda obs: obs.error(pid, message))
 
 
     def game_over(self, winner):
@@ -84,7 +143,71 @@ class ObserverManager:
         last_move = winner.last_move()
         wid = last_move[0]
         move_action = last_move[1]
-        self.__obs(lambda obs: obs.game_over(pid, wid, move_action))
+        self.__dispatch(lambda obs: obs.game_over(pid, wid, move_action))
+
+
+    def __own_board(self, board):
+        """
+        Board an update can hold on to: the board itself when observers are updated right
+        away, otherwise a board of its own that the game does not change.
+
+        :param board: GameBoard | BoardSnapshot, board of the update
+        :return: GameBoard | BoardSnapshot, board for the update
+        """
+        if self.__queue is None:
+            return board
+        # A detached snapshot reads its own copy, which only the observers can change
+        if hasattr(board, 'detach'):
+            board.detach()
+            return board
+        return copy.deepcopy(board)
+
+
+    def __dispatch(self, func):
+        """
+        Update observers right away, or queue the update for the background thread
+
+        :param func: (Observer) -> void, function used to update observer
+        """
+        if self.__queue is None:
+            self.__obs(func)
+            return
+
+        if self.__worker is None:
+            self.__worker = threading.Thread(target=self.__deliver, daemon=True)
+            self.__worker.start()
+
+        if self.policy is QueuePolicy.Block:
+            self.__queue.put(func)
+            return
+        while True:
+            try:
+                self.__queue.put_nowait(func)
+                return
+            except queue.Full:
+                self.dropped += 1
+                if self.policy is QueuePolicy.DropNewest:
+                    return
+            # Make room by dropping the oldest update, unless the background thread just took it
+            try:
+                self.__queue.get_nowait()
+                self.__queue.task_done()
+            except queue.Empty:
+                self.dropped -= 1
+
+
+    def __deliver(self):
+        """
+        Update observers with queued updates until told to stop.
+        """
+        while True:
+            func = self.__queue.get()
+            try:
+                if func is None:
+                    return
+                self.__obs(func)
+            finally:
+                self.__queue.task_done()
 
 
     def __obs(self, func):
@@ -93,13 +216,18 @@ class ObserverManager:
 
         :param func: (Observer) -> void, function used to update observer
         """
-        stable_observers = []
-        for observer in self.observers:
+        with self.__lock:
+            observers = list(self.observers)
+
+        broken_observers = []
+        for observer in observers:
             try:
                 func(observer)
-                stable_observers.append(observer)
             except:
-                pass
-        self.observers = stable_observers
+                broken_observers.append(observer)
+
+        if broken_observers:
+            with self.__lock:
+                self.observers = [o for o in self.observers if all(o is not b for b in broken_observers)]
 
 
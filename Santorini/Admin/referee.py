@@ -2,18 +2,18 @@
 import copy
 
 from Admin.board import GameBoard
+from Admin.board_snapshot import SnapshotTracker
+from Admin.deadline import run_with_deadline
 from Admin.rule_checker import RuleChecker
 from Admin.broken_player import BrokenPlayer
 from Admin.game_over import GameOver, GameOverCondition
 from Admin.guarded_player import GuardedPlayer
-from Admin.observer_manager import ObserverManager
+from Admin.observer_manager import ObserverManager, QueuePolicy
 from Admin.constants import *
 from Common.turn_phase import TurnPhase
 from Common.exception import *
 from Lib.continuous_iterator import ContinuousIterator
 
-from timeout_decorator import timeout, TimeoutError
-
 
 class Referee:
     """
@@ -22,7 +22,8 @@ class Referee:
     or invalid action, the opponent is deemed winner automatically. 
     """
 
-    def __init__(self, player_1, player_2, observers=[], time_limit=10, checker_cls=RuleChecker):
+    def __init__(self, player_1, player_2, observers=[], time_limit=10, checker_cls=RuleChecker,
+                 board_cls=GameBoard, observer_queue_size=None, observer_policy=QueuePolicy.Block):
         """
         Initialize Referee.
 
@@ -32,7 +33,12 @@ class Referee:
         :param player_2: Player, player 2
         :param checker_cls: RuleChecker, class to instantiate rule checker from
                             use standard Santorini rule checker as default
+        :param board_cls: GameBoard, class to instantiate the game board from
+                          use the dictionary backed GameBoard as default
         :param observers: [Observer, ...], list of observers for game
+        :param observer_queue_size: N | None, number of observer updates to queue for a background
+                                    thread, None to update observers during the game
+        :param observer_policy: QueuePolicy, what to do with an observer update when the queue is full
         :raise ValueError: if players are the same
         """
         if player_1.get_id() is player_2.get_id():
@@ -42,9 +48,10 @@ class Referee:
 
         self.__time_limit = time_limit
         self.__checker_cls = checker_cls
+        self.__board_cls = board_cls
         self.__init_board_and_checker()
 
-        self.__obs_manager = ObserverManager(observers)
+        self.__obs_manager = ObserverManager(observers, observer_queue_size, observer_policy)
 
 
     @property
@@ -60,11 +67,12 @@ class Referee:
     @property
     def board(self):
         """
-        Get deep copy of board.
+        Get copy-on-write snapshot of board, which stays as it is now even
+        after the board changes.
 
-        :return: GameBoard, copy of board
+        :return: BoardSnapshot, snapshot of board
         """
-        return copy.deepcopy(self.__board)
+        return self.__snapshots.snapshot()
 
     
     @property
@@ -105,12 +113,16 @@ class Referee:
 
             # If outcome isn't a fair game, cut short series
             if game_over.condition is not GameOverCondition.FairGame:
+                self.__obs_manager.close()
                 return game_over 
             winners.append(game_over.winner)   
         
         overall_winner = max(self.__players, key=lambda p: winners.count(p))
         loser = self.__opponent_of(overall_winner)
         self.__reset()
+        # Observers updated in the background have seen the whole series once it is over,
+        # and the background thread is stopped until the next series
+        self.__obs_manager.close()
         return GameOver(overall_winner, loser, GameOverCondition.FairGame)
 
     
@@ -134,7 +146,7 @@ class Referee:
         try:
             # Init: placement
             self.__run_init_phase(board, checker, players)
-            self.__obs_manager.update_state(copy.deepcopy(self.board))
+            self.__obs_manager.update_state(self.board)
 
             # Steady: move and build
             game_over = self.__run_steady_phase(board, checker, players)
@@ -219,11 +231,11 @@ class Referee:
         """
         try: 
             # Get action from player and impose time out
-            action = timeout(self.__time_limit)(self.__prompt)(turn_phase, player, wid)
+            action = run_with_deadline(self.__time_limit, self.__prompt, turn_phase, player, wid)
             self.__act(turn_phase, player, action, wid)
 
         # Timeout error
-        except TimeoutError:
+        except DeadlineExceeded:
             raise BrokenPlayer(player, GameOverCondition.Timeout)
 
         # Illegal action by player
@@ -268,7 +280,9 @@ class Referee:
         if not self.__check(TurnPhase.PLACE, player, action):
             raise IllegalPlaceException()
 
+        self.__snapshots.detach_all()
         self.__board.place_worker(player.get_id(), action['wid'], *action['xy'])
+        self.__checker.notify_of_action(action)
 
 
     def __act_move(self, player, action):
@@ -282,7 +296,9 @@ class Referee:
         if not self.__check(TurnPhase.MOVE, player, action):
             raise IllegalMoveException()
 
+        self.__snapshots.detach_all()
         self.__board.move_worker(*(action['xy1'] + action['xy2']))
+        self.__checker.notify_of_action(action)
 
 
     def __act_build(self, player, action, wid):
@@ -296,7 +312,9 @@ class Referee:
         if not self.__check(TurnPhase.BUILD, player, action, wid):
             raise IllegalBuildException()
 
+        self.__snapshots.detach_all()
         self.__board.build_floor(*action['xy2'])
+        self.__checker.notify_of_action(action)
         self.__obs_manager.update_action(player, self.board)
 
 
@@ -450,8 +468,8 @@ class Referee:
         :raise BrokenPlayer: if player times out
         """
         try:
-            timeout(self.__time_limit)(player.game_over)(message)
-        except TimeoutError:
+            run_with_deadline(self.__time_limit, player.game_over, message)
+        except DeadlineExceeded:
             pass
 
 
@@ -515,11 +533,12 @@ class Referee:
 
     def __init_board_and_checker(self):
         """ 
-        Initialize board with copy of originally given board, and
+        Initialize board with originally given board class, and
         checker with originally given checker class.
         """
-        self.__board = GameBoard()
+        self.__board = self.__board_cls()
         self.__checker = self.__checker_cls(self.__board)
+        self.__snapshots = SnapshotTracker(self.__board)
 
 
     def __reset(self):
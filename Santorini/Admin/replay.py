@@ -0,0 +1,221 @@
+# Rebuilds the boards of a recorded game, checking every action against the rules
+import copy
+
+from Admin.compact_board import CompactGameBoard
+from Admin.rule_checker import RuleChecker
+from Lib.stack_board import StackBoard
+
+# Plies between two boards kept for seeking by default
+DEFAULT_KEYFRAME_INTERVAL = 16
+
+
+class Replay:
+    """
+    Replay of a sequence of place, move and build actions that can seek to the board
+    after any number of them (any ply).
+
+    Every action is checked with the RuleChecker when the replay is made: places,
+    moves and builds have to be valid, each build has to be made by the worker that
+    just moved, and no action may come after the game is over. The replay stops at the
+    first action that breaks these rules, which is reported by invalid_ply.
+
+    A copy of the board is kept every keyframe_interval plies. Seeking starts from the
+    nearest keyframe, or from the current board when that is closer, and pushes or pops
+    the remaining actions on a StackBoard.
+    """
+
+    def __init__(self, actions, players=None, board_cls=CompactGameBoard, checker_cls=RuleChecker,
+                 keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+        """
+        Initialize a replay, checking every action.
+
+        :param actions: [Action, ...], actions in the order they were taken, each with the id of
+                        its player under 'p' and the id of its worker under 'wid'
+        :param players: (string, string), ids of the players, taken from the actions if not given
+        :param board_cls: GameBoard, class of the boards to rebuild
+        :param checker_cls: RuleChecker, class of the rule checker to check actions with
+        :param keyframe_interval: N, plies between two boards kept for seeking
+        """
+        self.players = tuple(players) if players else self.__players_of(actions)
+        self.__board_cls = board_cls
+        self.__checker_cls = checker_cls
+        self.__interval = keyframe_interval
+
+        # Copy of the board after every keyframe_interval plies, the first one empty
+        self.__keyframes = []  # type: List[GameBoard]
+        # Ply of the first action that breaks the rules, None if every action is valid
+        self.invalid_ply = None  # type: Optional[int]
+        # Id of the winner after the last valid action, None if the game is not over
+        self.winner = None  # type: Optional[str]
+        # Valid actions, as StackBoard takes them
+        self.__actions = self.__check_actions(actions)
+
+        # Ply of the first action on the stack, that is of the keyframe it starts from
+        self.__base = 0  # type: int
+        self.__stack = StackBoard(copy.deepcopy(self.__keyframes[0]))
+
+
+    @classmethod
+    def from_record(cls, record, **kwargs):
+        """
+        Replay of a game record.
+
+        :param record: GameRecord, record of a game
+        :return: Replay, replay of the record's actions
+        """
+        return cls(record.actions, record.players, **kwargs)
+
+
+    def __len__(self):
+        """
+        Number of valid actions, the last ply that can be sought.
+
+        :return: N, number of plies
+        """
+        return len(self.__actions)
+
+
+    @property
+    def ply(self):
+        """
+        Number of actions taken on the current board.
+
+        :return: N, current ply
+        """
+        return self.__base + self.__stack.size()
+
+
+    @property
+    def board(self):
+        """
+        Board after the current ply, which changes with the next seek and must not be changed.
+
+        :return: GameBoard, current board
+        """
+        return self.__stack.board
+
+
+    def action(self, ply):
+        """
+        Action taken at the given ply, which leads from the board at ply to the board at ply + 1.
+
+        :param ply: N, ply of the action
+        :return: Action, the action
+        """
+        return self.__actions[ply]
+
+
+    def seek(self, ply):
+        """
+        Rebuild the board after the given number of actions.
+
+        :param ply: N, number of actions to take, negative counts from the end like list indexes
+        :return: GameBoard, board at the ply, see board
+        :raise IndexError: if the ply is out of range
+        """
+        if ply < 0:
+            ply += len(self.__actions) + 1
+        if not 0 <= ply <= len(self.__actions):
+            raise IndexError("Ply out of range: {}".format(ply))
+
+        keyframe = ply // self.__interval * self.__interval
+        # Only boards from the base of the stack on can be reached without a keyframe
+        if ply < self.__base or abs(ply - self.ply) > ply - keyframe:
+            self.__base = keyframe
+            self.__stack = StackBoard(copy.deepcopy(self.__keyframes[keyframe // self.__interval]))
+
+        self.__stack.unwind(ply - self.__base)
+        while self.ply < ply:
+            self.__stack.push(self.__actions[self.ply])
+        return self.__stack.board
+
+
+    def __check_actions(self, actions):
+        """
+        Check actions in order on a new board until one breaks the rules, keeping keyframes.
+
+        :param actions: [Action, ...], actions to check
+        :return: [Action, ...], valid actions, as StackBoard takes them
+        """
+        board = self.__board_cls()
+        checker = self.__checker_cls(board)
+        stack = StackBoard(board)
+        checks = {'place': self.__check_place, 'move': self.__check_move, 'build': self.__check_build}
+
+        valid = []
+        last_move = None
+        for ply, action in enumerate(actions):
+            if ply % self.__interval == 0:
+                self.__keyframes.append(copy.deepcopy(board))
+            check = checks.get(action.get('type'))
+            if self.winner is not None or check is None or not check(checker, action, last_move):
+                self.invalid_ply = ply
+                break
+
+            # StackBoard places workers by the 'pid' key
+            action = dict(action, pid=action['p']) if action['type'] == 'place' else action
+            stack.push(action)
+            valid.append(action)
+            last_move = action if action['type'] == 'move' else None
+            self.winner = checker.check_game_over(*self.players)
+
+        # The board after the last action is a keyframe too when it falls on one, unless that action was invalid
+        if len(self.__keyframes) <= len(valid) // self.__interval:
+            self.__keyframes.append(copy.deepcopy(board))
+        return valid
+
+
+    @staticmethod
+    def __check_place(checker, action, last_move):
+        """
+        Check a place action, which can not come between a move and its build.
+
+        :param checker: RuleChecker, rule checker of the replayed board
+        :param action: PLACE, place action
+        :param last_move: MOVE | None, move waiting for its build
+        :return: bool, True if valid
+        """
+        return last_move is None and checker.check_place(action['p'], action['wid'], *action['xy'])
+
+
+    @staticmethod
+    def __check_move(checker, action, last_move):
+        """
+        Check a move action, which can not come between a move and its build.
+
+        :param checker: RuleChecker, rule checker of the replayed board
+        :param action: MOVE, move action
+        :param last_move: MOVE | None, move waiting for its build
+        :return: bool, True if valid
+        """
+        return last_move is None and checker.check_move(action['p'], *(action['xy1'] + action['xy2']))
+
+
+    @staticmethod
+    def __check_build(checker, action, last_move):
+        """
+        Check a build action, which has to be made by the worker that just moved.
+
+        :param checker: RuleChecker, rule checker of the replayed board
+        :param action: BUILD, build action
+        :param last_move: MOVE | None, move waiting for its build
+        :return: bool, True if valid
+        """
+        return last_move is not None and list(action['xy1']) == list(last_move['xy2']) \
+            and action['p'] == last_move['p'] \
+            and checker.check_build(action['p'], action['wid'], *(action['xy1'] + action['xy2']))
+
+
+    @staticmethod
+    def __players_of(actions):
+        """
+        Ids of the players taking the given actions, in the order they first act.
+
+        :param actions: [Action, ...], actions of a game
+        :return: (string, string), ids of the players
+        """
+        players = []
+        for action in actions:
+            if action.get('p') not in players:
+                players.append(action.get('p'))
+        return tuple((players + [None, None])[:2])
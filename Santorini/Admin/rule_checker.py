@@ -1,7 +1,7 @@
 # Class that checks to see if the requested move conforms to the rules
 
 from Common.rule_checker import RuleChecker as IRuleChecker
-from Lib.util import check_distance, get_adjacent
+from Lib.util import BOARD_RANGE, check_distance, get_neighbors
 
 
 
@@ -17,6 +17,10 @@ class RuleChecker(IRuleChecker):
         """
         # The GameBoard that the RuleChecker will be using for operations
         self.__board = board  # type: GameBoard
+        # Whether moves and builds can be generated with Lib.bitboard instead of this checker,
+        # which is only true as long as the standard move and build rules are not overridden
+        self.bitboard_rules = all(getattr(type(self), rule) is getattr(RuleChecker, rule)
+                                  for rule in ('check_move', 'check_build', 'check_valid_cell'))  # type: bool
 
     def check_build(self, pid, wid, x1, y1, x2, y2):
         """
@@ -122,7 +126,7 @@ class RuleChecker(IRuleChecker):
         :rtype    bool
         """
         # Check that the coordinates are between 0 and 5
-        return x in range(0, 6) and y in range(0, 6)
+        return x in BOARD_RANGE and y in BOARD_RANGE
 
 
     def check_game_over(self, player1, player2):
@@ -138,41 +142,64 @@ class RuleChecker(IRuleChecker):
         """
         # Get coordinates of all workers on the board
         for x1, y1 in self.__board.find_workers():
-            height = self.__board.get_height(x1, y1)
-            player = self.__board.get_player_id(x1, y1)
-            wid = self.__board.get_worker_id(x1, y1)
+            winner = self.check_worker_game_over(x1, y1, player1, player2)
+            if winner is not None:
+                return winner
 
-            # Check if current worker is on the third floor
-            if height is 3:
-                return player
+        # Otherwise, the game is not over, so there is no winner
+        return None
 
-            # Assume there are no valid moves to start
-            can_move = False
+    def check_worker_game_over(self, x1, y1, player1, player2):
+        """
+        Determines the winner if the worker at the given coordinates ends the game,
+        by standing on the third floor or by being unable to move and build
 
-            # Assume there are no valid builds to start
-            can_build = False
+        :param x1:      Represents the x coordinate of the worker board cell
+        :type x1:       int
+        :param y1:      Represents the y coordinate of the worker board cell
+        :type y1:       int
+        :param player1: ID of the first player
+        :type player1:  str
+        :param player2: ID of the second player
+        :type player2:  str
+        :return:        Player ID if this worker decides the game, else None
+        :rtype:         Optional[str]
+        """
+        height = self.__board.get_height(x1, y1)
+        player = self.__board.get_player_id(x1, y1)
+        wid = self.__board.get_worker_id(x1, y1)
 
-            # Iterate over all possible adjacent cells
-            for x2, y2 in get_adjacent(x1, y1):
+        # Check if current worker is on the third floor
+        if height is 3:
+            return player
 
-                # Determine whether the worker can move to this cell
-                if self.check_move(player, x1, y1, x2, y2):
+        # Assume there are no valid moves to start
+        can_move = False
 
-                    # The worker can make a valid move, game is not over
-                    can_move = True
+        # Assume there are no valid builds to start
+        can_build = False
 
-                # Determine whether the worker can build on this cell
-                if self.check_build(player, wid, x1, y1, x2, y2):
-                    # The worker can make a valid build, game is not over
-                    can_build = True
+        # Iterate over all adjacent cells on the board
+        for x2, y2 in get_neighbors(x1, y1):
 
-            # If the worker can't build or can't move, game is over
-            if not (can_move and can_build):
+            # Determine whether the worker can move to this cell
+            if self.check_move(player, x1, y1, x2, y2):
 
-                # The winner will be the other player
-                if self.__board.get_player_id(x1, y1) == player1:
-                    return player2
-                return player1
+                # The worker can make a valid move, game is not over
+                can_move = True
 
-        # Otherwise, the game is not over, so there is no winner
+            # Determine whether the worker can build on this cell
+            if self.check_build(player, wid, x1, y1, x2, y2):
+                # The worker can make a valid build, game is not over
+                can_build = True
+
+        # If the worker can't build or can't move, game is over
+        if not (can_move and can_build):
+
+            # The winner will be the other player
+            if self.__board.get_player_id(x1, y1) == player1:
+                return player2
+            return player1
+
+        # This worker does not end the game
         return None
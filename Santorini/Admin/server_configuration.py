@@ -1,8 +1,12 @@
 
 # Used to configure servers, providing the necessary attributes for the 
 # server to run: minimum players, port number, time to wait for, and repeat or not
+import socket
 from abc import ABC, abstractmethod
 
+# Connections allowed to queue up while the server signs up players, unless configured otherwise
+DEFAULT_BACKLOG = socket.SOMAXCONN
+
 class IServerConfiguration(ABC):
     """
     Server configuration specifying minimum number of players, port number,
@@ -45,4 +49,12 @@ class IServerConfiguration(ABC):
 
         :return: bool, True if repeat, False otherwise
         """
-        pass
\ No newline at end of file
+        pass
+
+    def backlog(self):
+        """
+        How many connections can queue up while the server signs up players?
+
+        :return: N > 0, size of the listen backlog
+        """
+        return DEFAULT_BACKLOG
@@ -0,0 +1,376 @@
+# Plays many games between two in-process players as fast as possible, for self-play data
+import multiprocessing
+
+from Admin.board_snapshot import SnapshotTracker
+from Admin.compact_board import CompactGameBoard
+from Admin.constants import *
+from Admin.game_over import GameOverCondition
+from Admin.incremental_rule_checker import IncrementalRuleChecker
+from Admin.rule_checker import RuleChecker
+from Lib.bitboard import BIT, CELL_INDEX, MAX_HEIGHT, NEIGHBOR_MASK, NEIGHBORS, from_board
+
+# Games a worker process plays before sending its results back by default
+DEFAULT_CHUNK_SIZE = 64
+
+# Height a worker wins the game by standing on
+WINNING_HEIGHT = 3
+
+# Ways of checking for the end of the game that follow the standard rules
+STANDARD_GAME_OVER = (RuleChecker.check_game_over, IncrementalRuleChecker.check_game_over)
+
+
+class SimulatedGame:
+    """
+    Outcome of one simulated game.
+
+    Attributes:
+        game:       N, index of the game in the run
+        first:      string, id of the player that placed and moved first
+        winner:     string, id of the winner
+        loser:      string, id of the loser
+        condition:  GameOverCondition, FairGame, or InvalidAction if the loser broke the rules
+        turns:      N, number of moves made in the game
+    """
+    __slots__ = ('game', 'first', 'winner', 'loser', 'condition', 'turns')
+
+    def __init__(self, game, first, winner, loser, condition, turns):
+        """
+        Initialize the outcome of a game.
+
+        :param game: N, index of the game in the run
+        :param first: string, id of the player that placed and moved first
+        :param winner: string, id of the winner
+        :param loser: string, id of the loser
+        :param condition: GameOverCondition, how the game ended
+        :param turns: N, number of moves made in the game
+        """
+        self.game = game
+        self.first = first
+        self.winner = winner
+        self.loser = loser
+        self.condition = condition
+        self.turns = turns
+
+    def __eq__(self, other):
+        return isinstance(other, SimulatedGame) and all(getattr(self, a) == getattr(other, a) for a in self.__slots__)
+
+    def __repr__(self):
+        return "SimulatedGame(game={}, first={!r}, winner={!r}, loser={!r}, condition={}, turns={})".format(
+            self.game, self.first, self.winner, self.loser, self.condition.name, self.turns)
+
+
+class Simulator:
+    """
+    Simulator plays games of Santorini between two trusted, in-process players. Unlike
+    the Referee it has no time limits, no observers and no GuardedPlayers. Players are
+    handed BoardSnapshots like the Referee does, so a player that changes the board it
+    is given only changes its own copy.
+
+    Actions are still checked against the rules: a player that makes an invalid action
+    loses the game with GameOverCondition.InvalidAction. Any exception a player raises
+    is passed on, since a crashing strategy is a bug in the data it produces.
+
+    Players that only pick among the legal actions can implement pick_move and pick_build
+    next to get_move and get_build, like the random player does. When both players do, the
+    rules are the standard ones and the board is a CompactGameBoard, whose workers keep the
+    order they were placed in, the moves and builds are played on bit masks and the players
+    pick from the legal actions as bit indexes, which makes the same game several times faster.
+
+    Players take turns going first, starting with player_1, like they do in a Referee's
+    series. Game i of a run is started by player_1 when i is even, so sharded runs play
+    the same games as a single process does.
+    """
+
+    def __init__(self, player_1, player_2, checker_cls=IncrementalRuleChecker, board_cls=CompactGameBoard):
+        """
+        Initialize Simulator.
+
+        :param player_1: Player, player 1
+        :param player_2: Player, player 2
+        :param checker_cls: RuleChecker, class to instantiate rule checker from,
+                            the standard rules checked incrementally by default
+        :param board_cls: GameBoard, class to instantiate the game board from,
+                          the array backed CompactGameBoard by default
+        :raise ValueError: if players have the same id
+        """
+        if player_1.get_id() == player_2.get_id():
+            raise ValueError("Players cannot be the same")
+
+        self.__players = [player_1, player_2]
+        self.__checker_cls = checker_cls
+        self.__board_cls = board_cls
+
+
+    def run(self, games, start=0):
+        """
+        Play the given number of games, yielding each outcome as soon as the game is over.
+
+        :param games: N, number of games to play
+        :param start: N, index of the first game, which decides who goes first
+        :return: generator of SimulatedGame, outcome of every game in order
+        """
+        for game in range(start, start + games):
+            yield self.play_game(game)
+
+
+    def run_sharded(self, games, processes, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Play the given number of games on a process pool, each process with its own copy
+        of the players, yielding the outcomes in game order as chunks of games finish.
+
+        :param games: N, number of games to play
+        :param processes: N, number of processes to play on
+        :param chunk_size: N, number of games a process plays before sending back their outcomes
+        :return: generator of SimulatedGame, outcome of every game in order
+        """
+        chunks = [(self, start, min(chunk_size, games - start)) for start in range(0, games, chunk_size)]
+        with multiprocessing.Pool(processes) as pool:
+            for outcomes in pool.imap(simulate_chunk, chunks):
+                yield from outcomes
+
+
+    def play_game(self, game=0):
+        """
+        Play one game.
+
+        :param game: N, index of the game, player_1 goes first when it is even
+        :return: SimulatedGame, outcome of the game
+        """
+        players = self.__players if game % 2 == 0 else self.__players[::-1]
+        ids = [player.get_id() for player in players]
+        board = self.__board_cls()
+        checker = self.__checker_cls(board)
+        snapshots = SnapshotTracker(board)
+
+        turns = 0
+        winner = self.__play_placements(board, snapshots, checker, players, ids)
+        if winner is None and self.__on_bit_masks(board, checker, players):
+            winner, turns = self.__play_bit_turns(board, players, ids)
+        current = 0
+        while winner is None:
+            winner = self.__play_turn(board, snapshots, checker, players[current], ids)
+            turns += 1
+            current = 1 - current
+
+        winner_id, condition = winner
+        loser_id = ids[1] if winner_id == ids[0] else ids[0]
+        for player in players:
+            player.game_over(WIN_MESSAGE if player.get_id() == winner_id else LOSE_MESSAGE)
+        return SimulatedGame(game, ids[0], winner_id, loser_id, condition, turns)
+
+
+    def __play_placements(self, board, snapshots, checker, players, ids):
+        """
+        Have the players place their workers, alternating like the Referee does.
+
+        :param board: GameBoard, board of the game
+        :param snapshots: SnapshotTracker, hands out the snapshots of the board players get
+        :param checker: RuleChecker, rule checker of the game
+        :param players: [Player, Player], players in the order they go
+        :param ids: [string, string], ids of the players
+        :return: (string, GameOverCondition) | None, winner and condition if the game is over
+        """
+        for player, wid in zip(players * 2, [WORKER_ONE_ID, WORKER_ONE_ID, WORKER_TWO_ID, WORKER_TWO_ID]):
+            pid = player.get_id()
+            action = player.get_placement(snapshots.snapshot(), wid, checker)
+            if not self.__is_action(action, 'place') or action['wid'] != wid \
+                    or not checker.check_place(pid, wid, *action['xy']):
+                return self.__opponent(pid, ids), GameOverCondition.InvalidAction
+            snapshots.detach_all()
+            board.place_worker(pid, wid, *action['xy'])
+            checker.notify_of_action(action)
+
+            winner = self.__game_over(checker, ids)
+            if winner is not None:
+                return winner
+        return None
+
+
+    def __play_turn(self, board, snapshots, checker, player, ids):
+        """
+        Have a player move and then build.
+
+        :param board: GameBoard, board of the game
+        :param snapshots: SnapshotTracker, hands out the snapshots of the board players get
+        :param checker: RuleChecker, rule checker of the game
+        :param player: Player, player to take the turn
+        :param ids: [string, string], ids of the players
+        :return: (string, GameOverCondition) | None, winner and condition if the game is over
+        """
+        pid = player.get_id()
+        move = player.get_move(snapshots.snapshot(), checker)
+        if not self.__is_action(move, 'move') or not checker.check_move(pid, *(move['xy1'] + move['xy2'])):
+            return self.__opponent(pid, ids), GameOverCondition.InvalidAction
+        snapshots.detach_all()
+        board.move_worker(*(move['xy1'] + move['xy2']))
+        checker.notify_of_action(move)
+        winner = self.__game_over(checker, ids)
+        if winner is not None:
+            return winner
+
+        wid = board.get_worker_id(*move['xy2'])
+        build = player.get_build(snapshots.snapshot(), wid, checker)
+        if not self.__is_action(build, 'build') or not checker.check_build(pid, wid, *(build['xy1'] + build['xy2'])):
+            return self.__opponent(pid, ids), GameOverCondition.InvalidAction
+        snapshots.detach_all()
+        board.build_floor(*build['xy2'])
+        checker.notify_of_action(build)
+        return self.__game_over(checker, ids)
+
+
+    @staticmethod
+    def __on_bit_masks(board, checker, players):
+        """
+        Check if the moves and builds of a game can be played on bit masks.
+
+        :param board: GameBoard, board of the game
+        :param checker: RuleChecker, rule checker of the game
+        :param players: [Player, Player], players of the game
+        :return: bool, True if the game follows the standard rules on a board keeping its
+                 workers in order, between players that pick their actions on bit masks
+        """
+        checker_cls = type(checker)
+        return isinstance(board, CompactGameBoard) and getattr(checker, 'bitboard_rules', False) \
+            and getattr(checker_cls, 'check_game_over', None) in STANDARD_GAME_OVER \
+            and getattr(checker_cls, 'check_worker_game_over', None) is RuleChecker.check_worker_game_over \
+            and all(picks_on_bit_masks(player) for player in players)
+
+
+    def __play_bit_turns(self, board, players, ids):
+        """
+        Have the players move and then build on bit masks until the game is over, the
+        same way __play_turn does.
+
+        :param board: CompactGameBoard, board of the game once the workers are placed
+        :param players: [Player, Player], players in the order they go
+        :param ids: [string, string], ids of the players
+        :return: ((string, GameOverCondition), N), winner and condition, and number of moves made
+        """
+        bits = from_board(board)
+        workers = board.find_workers()
+        # Bit index and player id of every worker, in the order the board keeps them
+        positions = [CELL_INDEX[xy] for xy in workers]
+        owners = [board.get_player_id(*xy) for xy in workers]
+
+        turns = 0
+        current = 0
+        while True:
+            player, pid = players[current], ids[current]
+            turns += 1
+
+            moves = []
+            for index, owner in zip(positions, owners):
+                if owner == pid:
+                    targets = bits.move_targets(index)
+                    moves.extend((index, neighbor) for neighbor, _ in NEIGHBORS[index] if targets & BIT[neighbor])
+            move = player.pick_move(moves) if moves else None
+            if move not in moves:
+                return (self.__opponent(pid, ids), GameOverCondition.InvalidAction), turns
+            origin, destination = move
+            bits.move_worker(origin, destination)
+            positions[positions.index(origin)] = destination
+            winner = self.__bit_game_over(bits, positions, owners, ids)
+            if winner is not None:
+                return winner, turns
+
+            targets = bits.build_targets(destination)
+            builds = [neighbor for neighbor, _ in NEIGHBORS[destination] if targets & BIT[neighbor]]
+            build = player.pick_build(builds) if builds else None
+            if build not in builds:
+                return (self.__opponent(pid, ids), GameOverCondition.InvalidAction), turns
+            bits.build_floor(build)
+            winner = self.__bit_game_over(bits, positions, owners, ids)
+            if winner is not None:
+                return winner, turns
+            current = 1 - current
+
+
+    @staticmethod
+    def __bit_game_over(bits, positions, owners, ids):
+        """
+        Check if the game is over on bit masks, going through the workers in order like
+        RuleChecker.check_game_over.
+
+        :param bits: BitBoard, heights and occupancy of the board
+        :param positions: [N, ...], bit index of every worker
+        :param owners: [string, ...], id of the player of every worker
+        :param ids: [string, string], ids of the players
+        :return: (string, GameOverCondition) | None, winner and condition if the game is over
+        """
+        heights = bits.heights
+        # Cells a worker could build on, the ones it could move to are also at most one floor up
+        free = ~bits.occupied & bits.at_most(MAX_HEIGHT - 1)
+        for index, owner in zip(positions, owners):
+            height = heights[index]
+            if height == WINNING_HEIGHT:
+                return owner, GameOverCondition.FairGame
+            builds = NEIGHBOR_MASK[index] & free
+            if not (builds and builds & bits.at_most(min(height + 1, MAX_HEIGHT - 1))):
+                return (ids[1] if owner == ids[0] else ids[0]), GameOverCondition.FairGame
+        return None
+
+
+    @staticmethod
+    def __is_action(action, action_type):
+        """
+        Check that an action is a JSON action of the given type.
+
+        :param action: Action, action made by a player
+        :param action_type: string, expected type of the action
+        :return: bool, True if the action has the given type
+        """
+        return isinstance(action, dict) and action.get('type') == action_type
+
+
+    @staticmethod
+    def __game_over(checker, ids):
+        """
+        Check if the game is over.
+
+        :param checker: RuleChecker, rule checker of the game
+        :param ids: [string, string], ids of the players
+        :return: (string, GameOverCondition) | None, winner and condition if the game is over
+        """
+        winner_id = checker.check_game_over(*ids)
+        if winner_id is None:
+            return None
+        return winner_id, GameOverCondition.FairGame
+
+
+    @staticmethod
+    def __opponent(pid, ids):
+        """
+        Get the id of the opponent of a player.
+
+        :param pid: string, id of the player
+        :param ids: [string, string], ids of the players
+        :return: string, id of the opponent
+        """
+        return ids[1] if pid == ids[0] else ids[0]
+
+
+def picks_on_bit_masks(player):
+    """
+    Check if a player picks its moves and builds on bit masks the same way it makes them,
+    that is if pick_move and pick_build come from the same class as get_move and get_build,
+    so a subclass that changes how it moves is not played on bit masks.
+
+    :param player: Player, player to check
+    :return: bool, True if the player's actions can be picked on bit masks
+    """
+    def owner(name):
+        return next((cls for cls in type(player).__mro__ if name in vars(cls)), None)
+
+    return all(owner(pick) is not None and owner(pick) is owner(action)
+               for pick, action in [('pick_move', 'get_move'), ('pick_build', 'get_build')])
+
+
+def simulate_chunk(task):
+    """
+    Play a chunk of games in a worker process.
+
+    :param task: (Simulator, N, N), simulator, index of the first game and number of games
+    :return: [SimulatedGame, ...], outcome of every game of the chunk
+    """
+    simulator, start, games = task
+    return list(simulator.run(games, start))
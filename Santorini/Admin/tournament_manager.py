@@ -1,7 +1,10 @@
 import names, sys
 import copy
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
 
 from Admin.game_over import GameOver, GameOverCondition
+from Admin.guarded_player import GuardedPlayer
 from Admin.referee import Referee
 from Admin.configurations.stdin_configuration import STDINConfiguration
 
@@ -26,16 +29,44 @@ class TournamentManager:
     - The first is a list of names of players that misbehaved in any way. They are listed in the order of failure.
 
     - The second lists all completed games where each piece of game information lists the winner’s and the loser’s name. The games are listed in the order of "first plays against rest, second plays against rest, etc."
+
+    Parallel Tournaments
+    With more than one process, every series is played up front on a process pool, each
+    with its own copy of the players, and the policy above is then applied to the results
+    in the usual order. Series that the sequential run would have skipped because a player
+    already misbehaved are played but ignored, so the result is the same as a sequential
+    run as long as each series does not depend on the ones before it. Players that carry
+    state from one series to the next, or can't be pickled (such as remote players), have
+    to be run sequentially. Observers watch games as they happen, so tournaments with
+    observers always run sequentially.
+
+    Concurrent Series
+    With more than one thread, series are played in rounds where no player is in two
+    series (see round_robin_rounds), and the series of a round are played at the same time
+    on a thread pool. This suits players that spend their turns waiting on the network,
+    such as remote players, which can't be sent to other processes. Once a player
+    misbehaves, its series that come after that series in the usual order are left out of
+    later rounds, while the ones before it are still played, since a sequential run plays
+    them. The policy above is then applied to the results in the usual order, so the
+    result, including the order of misbehaved players, is the same as a sequential run as
+    long as each series does not depend on the ones before it. Series played in an earlier
+    round than a failure that comes before them in the usual order are ignored.
     """
 
-    def __init__(self, configuration=STDINConfiguration()):
+    def __init__(self, configuration=STDINConfiguration(), processes=1, threads=1):
         """
         Initialize a tournament manager with configuration.
 
         :param configuration: Configuration, game configuration containing players
+        :param processes: N, number of processes to play series on, 1 to play them one
+                          at a time in this process
+        :param threads: N, number of series of a round to play at the same time on threads,
+                        1 to play them one at a time, used when processes is 1
         """
         self.__players = configuration.players()
         self.__observers = configuration.observers()
+        self.__processes = processes
+        self.__threads = threads
 
         self.__change_duplicate_ids(self.__players)
         self.__misbehaved_players = []
@@ -68,9 +99,17 @@ class TournamentManager:
 
         :return: TournamentResult, result of tournament
         """
+        play = self.__play_series
+        if self.__processes > 1 and not self.__observers:
+            results = self.__play_all_series()
+            play = lambda player, opponent: results[(player.get_id(), opponent.get_id())]
+        elif self.__threads > 1 and not self.__observers:
+            results = self.__play_rounds()
+            play = lambda player, opponent: results[(player.get_id(), opponent.get_id())]
+
         # Run round robin game
         for i, player in enumerate(self.__players):
-            self.__match_against_rest(player, self.__players[i + 1:])
+            self.__match_against_rest(player, self.__players[i + 1:], play)
 
         # Reformat all meet ups
         meet_ups = list(map(lambda x: [x.winner.get_id(), x.loser.get_id()], self.__meet_ups))
@@ -141,12 +180,13 @@ class TournamentManager:
         return new_id
 
 
-    def __match_against_rest(self, player, opponents):
+    def __match_against_rest(self, player, opponents, play):
         """
         Match given player to the given opponents, updating the meet ups.
 
         :param player: Player, player 
         :param opponents: [Player, ...], opponents of player 
+        :param play: function, gets the GameOver of a series between player and opponent
         """
         for opponent in opponents:
 
@@ -156,9 +196,7 @@ class TournamentManager:
             if opponent.get_id() in self.__misbehaved_players:
                 continue
             
-            referee = Referee(player, opponent, time_limit=5, observers=self.__observers)
-            self.__notify_of_opponents(player, opponent)
-            series_result = referee.run_games(3)
+            series_result = play(player, opponent)
 
             # Penalize loser if game ended unfairly
             if series_result.condition is not GameOverCondition.FairGame:
@@ -167,14 +205,113 @@ class TournamentManager:
             self.__meet_ups.append(series_result)
                 
     
-    def __notify_of_opponents(self, player_one, player_two):
+    def __play_series(self, player, opponent):
+        """
+        Play a series between the given players in this process.
+
+        :param player: Player, player
+        :param opponent: Player, opponent of player
+        :return: GameOver, result of the series
+        """
+        return play_series(player, opponent, self.__observers)
+
+
+    def __play_all_series(self):
+        """
+        Play a series between every pair of players on a process pool.
+
+        :return: {(string, string): GameOver}, result of the series of every pairing by player ids
+        """
+        pairings = [(player, opponent) for i, player in enumerate(self.__players)
+                    for opponent in self.__players[i + 1:]]
+
+        with multiprocessing.Pool(self.__processes) as pool:
+            outcomes = pool.starmap(play_series_outcome, pairings)
+
+        results = {}
+        for (player, opponent), (winner_id, condition) in zip(pairings, outcomes):
+            # Wrap the players like a Referee does, so results look the same as sequential ones
+            winner, loser = (player, opponent) if winner_id == player.get_id() else (opponent, player)
+            results[(player.get_id(), opponent.get_id())] = GameOver(GuardedPlayer(winner), GuardedPlayer(loser), condition)
+        return results
+
+
+    def __play_rounds(self):
         """
-        Notify the given matched up players of each other's ids.
+        Play the series of every round at the same time on a thread pool, leaving out the
+        series that come after a series one of their players misbehaved in, in the usual
+        order of "first plays against rest, second plays against rest, etc."
 
-        :param player_one: Player, player one
-        :param player_two: Player, player two
+        :return: {(string, string): GameOver}, result of the series of every played pairing by player ids
         """
-        player_one.notify_of_opponent(player_two.get_id())
-        player_two.notify_of_opponent(player_one.get_id())
+        count = len(self.__players)
+        # Position of every pairing in the usual order
+        order = {(i, j): n for n, (i, j) in enumerate((i, j) for i in range(count) for j in range(i + 1, count))}
+        # Position of the first series in the usual order each player misbehaved in so far
+        failed_at = [len(order)] * count
+
+        results = {}
+        with ThreadPoolExecutor(self.__threads) as executor:
+            for pairings in round_robin_rounds(count):
+                pairings = [(i, j) for i, j in pairings if order[(i, j)] < min(failed_at[i], failed_at[j])]
+
+                outcomes = executor.map(lambda pairing: play_series(self.__players[pairing[0]],
+                                                                    self.__players[pairing[1]], []), pairings)
+                for (i, j), series_result in zip(pairings, outcomes):
+                    player, opponent = self.__players[i], self.__players[j]
+                    results[(player.get_id(), opponent.get_id())] = series_result
+                    if series_result.condition is not GameOverCondition.FairGame:
+                        loser = i if series_result.loser.get_id() == player.get_id() else j
+                        failed_at[loser] = min(failed_at[loser], order[(i, j)])
+        return results
+
+
+def round_robin_rounds(count):
+    """
+    Split the pairings of a round robin among the given number of players into rounds in
+    which no player plays twice, with the circle method: one player stays in place while
+    the others rotate around it, and players facing each other are paired. With an odd
+    number of players, one player sits out every round.
+
+    :param count: N, number of players
+    :return: [[(N, N), ...], ...], pairings of every round, each as the indexes of the
+             player and its opponent, the player coming first in the list of players
+    """
+    circle = list(range(count)) + ([None] if count % 2 else [])
+    rounds = []
+    for _ in range(len(circle) - 1):
+        pairings = [(circle[k], circle[-1 - k]) for k in range(len(circle) // 2)]
+        rounds.append([(min(i, j), max(i, j)) for i, j in pairings if i is not None and j is not None])
+        # Keep the first player in place and rotate the others
+        circle = circle[:1] + circle[-1:] + circle[1:-1]
+    return rounds
+
+
+def play_series(player, opponent, observers):
+    """
+    Play a best of 3 series between the given players after telling them who they play.
+
+    :param player: Player, player
+    :param opponent: Player, opponent of player
+    :param observers: [Observer, ...], observers of the series
+    :return: GameOver, result of the series
+    """
+    referee = Referee(player, opponent, time_limit=5, observers=observers)
+    player.notify_of_opponent(opponent.get_id())
+    opponent.notify_of_opponent(player.get_id())
+    return referee.run_games(3)
+
+
+def play_series_outcome(player, opponent):
+    """
+    Play a series in a worker process and report its outcome in a form that can be
+    sent back to the tournament manager.
+
+    :param player: Player, player
+    :param opponent: Player, opponent of player
+    :return: (string, GameOverCondition), id of the winner and condition of the series
+    """
+    series_result = play_series(player, opponent, [])
+    return series_result.winner.get_id(), series_result.condition
 
 
@@ -13,3 +13,11 @@ class IllegalMoveException(IllegalActionException):
 class IllegalBuildException(IllegalActionException):
     """Raised when attempting to build onto a building illegally."""
 
+
+
+class DeadlineExceeded(Exception):
+    """Raised in code that is still running when its deadline passes."""
+
+
+class OutOfTime(Exception):
+    """Raised inside a look-ahead search once its time budget is spent."""
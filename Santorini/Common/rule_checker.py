@@ -85,6 +85,15 @@ class RuleChecker(ABC):
         pass
     
 
+    def notify_of_action(self, action):
+        """
+        Notify the rule checker of an action that was just applied to its board.
+        Rule checkers that read the board afresh on every check ignore it.
+
+        :param action: PLACE | MOVE | BUILD, action applied to the board
+        """
+        pass
+
     @abstractmethod
     def check_game_over(self, player1, player2):
         """
@@ -0,0 +1,132 @@
+# Standard move and build rules applied to whole batches of boards at once with NumPy
+#
+# Boards are given as an (N, 6, 6) array of heights, indexed [board, y, x] like the rows
+# of get_heights, and an (N, W, 2) array of the (x, y) position of every worker. Boards
+# with fewer than W workers pad their positions with cells off the board, such as
+# (-1, -1), which hold no worker and can neither move nor build.
+#
+# Masks are (N, W, 6, 6) boolean arrays, where mask[n, w, y, x] tells whether worker w
+# of board n can move (or build) to x, y. They match RuleChecker.check_move and
+# RuleChecker.check_build for the owner of the worker: ownership is not part of the
+# masks, callers select the workers of the player they are interested in.
+#
+# NumPy is only needed by this module, the rest of the game runs without it.
+import numpy as np
+
+from Lib.bitboard import BOARD_SIZE, CELLS, COORDINATES
+
+# Height of a capped tower, which no worker can move to or build on
+CAPPED = 4
+
+# Number of workers on a board during a game
+WORKERS = 4
+
+# ADJACENT[y1, x1, y2, x2] tells whether x2, y2 is within one cell of x1, y1, like Lib.util.check_distance
+_COORDINATE = np.arange(BOARD_SIZE)
+_NEAR = np.abs(_COORDINATE[:, None] - _COORDINATE[None, :]) <= 1
+ADJACENT = _NEAR[:, None, :, None] & _NEAR[None, :, None, :]
+
+
+def from_boards(boards, workers=WORKERS):
+    """
+    Arrays of the heights and worker positions of the given boards
+
+    :param boards: Sequence[GameBoard], boards to read
+    :param workers: int, number of worker positions per board, missing workers are padded
+    :return: (np.ndarray, np.ndarray), (N, 6, 6) heights and (N, W, 2) worker positions
+    """
+    heights = np.zeros((len(boards), BOARD_SIZE, BOARD_SIZE), dtype=np.int16)
+    positions = np.full((len(boards), workers, 2), -1, dtype=np.int16)
+    for n, board in enumerate(boards):
+        get_heights = getattr(board, 'get_heights', None)
+        if get_heights is not None:
+            cells = get_heights()
+        else:
+            cells = [board.get_height(x, y) for x, y in COORDINATES]
+        heights[n] = np.fromiter(cells, dtype=np.int16, count=CELLS).reshape(BOARD_SIZE, BOARD_SIZE)
+
+        found = board.find_workers()[:workers]
+        if found:
+            positions[n, :len(found)] = found
+    return heights, positions
+
+
+def occupancy(positions):
+    """
+    Cells holding a worker on every board
+
+    :param positions: np.ndarray, (N, W, 2) worker positions
+    :return: np.ndarray, (N, 6, 6) boolean mask of occupied cells
+    """
+    on_board = _on_board(positions)
+    boards, slots = np.nonzero(on_board)
+    occupied = np.zeros((positions.shape[0], BOARD_SIZE, BOARD_SIZE), dtype=bool)
+    occupied[boards, positions[boards, slots, 1], positions[boards, slots, 0]] = True
+    return occupied
+
+
+def build_masks(heights, positions):
+    """
+    Cells every worker can build on: free neighboring cells that are not capped
+
+    :param heights: np.ndarray, (N, 6, 6) heights
+    :param positions: np.ndarray, (N, W, 2) worker positions
+    :return: np.ndarray, (N, W, 6, 6) boolean build masks
+    """
+    heights = np.asarray(heights)
+    positions = np.asarray(positions)
+    open_cells = ~occupancy(positions) & (heights < CAPPED)
+    return _neighbors(positions) & open_cells[:, None]
+
+
+def move_masks(heights, positions):
+    """
+    Cells every worker can move to: free neighboring cells that are not capped and
+    at most one floor higher than the worker's cell
+
+    :param heights: np.ndarray, (N, 6, 6) heights
+    :param positions: np.ndarray, (N, W, 2) worker positions
+    :return: np.ndarray, (N, W, 6, 6) boolean move masks
+    """
+    heights = np.asarray(heights)
+    positions = np.asarray(positions)
+    reachable = heights[:, None] <= _worker_heights(heights, positions)[..., None, None] + 1
+    return build_masks(heights, positions) & reachable
+
+
+def _on_board(positions):
+    """
+    Which worker positions are cells of the board
+
+    :param positions: np.ndarray, (N, W, 2) worker positions
+    :return: np.ndarray, (N, W) boolean mask
+    """
+    return np.all((positions >= 0) & (positions < BOARD_SIZE), axis=-1)
+
+
+def _neighbors(positions):
+    """
+    Cells next to every worker, no cells for workers off the board
+
+    :param positions: np.ndarray, (N, W, 2) worker positions
+    :return: np.ndarray, (N, W, 6, 6) boolean mask
+    """
+    on_board = _on_board(positions)
+    xs = np.where(on_board, positions[..., 0], 0)
+    ys = np.where(on_board, positions[..., 1], 0)
+    return ADJACENT[ys, xs] & on_board[..., None, None]
+
+
+def _worker_heights(heights, positions):
+    """
+    Height of the cell of every worker, 0 for workers off the board
+
+    :param heights: np.ndarray, (N, 6, 6) heights
+    :param positions: np.ndarray, (N, W, 2) worker positions
+    :return: np.ndarray, (N, W) heights
+    """
+    on_board = _on_board(positions)
+    xs = np.where(on_board, positions[..., 0], 0)
+    ys = np.where(on_board, positions[..., 1], 0)
+    boards = np.arange(positions.shape[0])[:, None]
+    return np.where(on_board, heights[boards, ys, xs], 0)
@@ -0,0 +1,299 @@
+# Bitboard representation of the standard 6x6 board for fast move and build generation
+#
+# Every cell is one bit of a 36 bit integer, laid out row by row so that the cell
+# at x,y is bit y * 6 + x. Occupancy is a single mask and heights are kept as one
+# mask per level, so the legal destinations of a worker are a few integer operations.
+
+# Number of cells along each side of the board
+BOARD_SIZE = 6
+
+# Number of cells on the board
+CELLS = BOARD_SIZE * BOARD_SIZE
+
+# Height of a capped tower, no worker can move or build onto it
+MAX_HEIGHT = 4
+
+# Maps every on-board coordinate pair to its bit index
+CELL_INDEX = {(x, y): y * BOARD_SIZE + x for y in range(BOARD_SIZE) for x in range(BOARD_SIZE)}
+
+# Maps every bit index back to its coordinate pair
+COORDINATES = [(x, y) for y in range(BOARD_SIZE) for x in range(BOARD_SIZE)]
+
+# Single bit mask of every cell
+BIT = [1 << i for i in range(CELLS)]
+
+# Maps every on-board coordinate pair to its single bit mask
+CELL_BIT = {xy: BIT[i] for i, xy in enumerate(COORDINATES)}
+
+# Offsets to the adjacent cells, in the same order as Lib.util.get_adjacent
+DIRECTIONS = [(1, 0), (1, 1), (1, -1), (0, -1), (0, 1), (-1, 0), (-1, 1), (-1, -1)]
+
+# On-board neighbors of every cell as (bit index, [x, y]) in DIRECTIONS order
+NEIGHBORS = [[(CELL_INDEX[(x + dx, y + dy)], [x + dx, y + dy])
+              for dx, dy in DIRECTIONS if (x + dx, y + dy) in CELL_INDEX]
+             for x, y in COORDINATES]
+
+# Mask of the on-board neighbors of every cell
+NEIGHBOR_MASK = [sum(BIT[i] for i, _ in neighbors) for neighbors in NEIGHBORS]
+
+# Translation tables turning a height byte string into a '0'/'1' string of the cells at or below a level
+LEVEL_TABLES = [bytes(ord('1') if h <= level else ord('0') for h in range(256)) for level in range(MAX_HEIGHT)]
+
+
+class BitBoard:
+    """
+    Heights and occupancy of a standard board as bit masks.
+
+    Worker identities are not tracked, only which cells hold a worker. Moves and
+    builds can be applied and reverted in place, so searches can reuse one BitBoard,
+    and boards can keep one up to date as they change.
+    """
+
+    def __init__(self, heights=bytes(CELLS), occupied=0):
+        """
+        Initializes a BitBoard from the height of every cell and an occupancy mask
+
+        :param heights: Height of every cell, row by row, heights are never negative
+        :type heights:  Sequence[int]
+        :param occupied: Mask of the cells holding a worker
+        :type occupied:  int
+        """
+        try:
+            self.heights = bytearray(heights)  # type: MutableSequence[int]
+        except (TypeError, ValueError):
+            # Heights that do not fit in a byte are kept as they are
+            self.heights = list(heights)
+        # Mask of the cells holding a worker
+        self.occupied = occupied  # type: int
+        # Mask of the cells whose height is at most each level below MAX_HEIGHT, computed when first needed
+        self.__at_most = [None] * MAX_HEIGHT  # type: List[Optional[int]]
+
+    def copy(self):
+        """
+        Copies this BitBoard, including the level masks computed so far
+
+        :return: BitBoard, an independent copy
+        """
+        bits = BitBoard.__new__(BitBoard)
+        bits.heights = self.heights[:]
+        bits.occupied = self.occupied
+        bits.__at_most = list(self.__at_most)
+        return bits
+
+    def at_most(self, level):
+        """
+        Mask of the cells whose height is at most the given level
+
+        :param level: int, level below MAX_HEIGHT
+        :return: int, mask of cells at or below the level
+        """
+        mask = self.__at_most[level]
+        if mask is None:
+            mask = self.__at_most[level] = self.__level_mask(level)
+        return mask
+
+    def __level_mask(self, level):
+        """
+        Computes the mask of the cells whose height is at most the given level
+
+        :param level: int, level below MAX_HEIGHT
+        :return: int, mask of cells at or below the level
+        """
+        if isinstance(self.heights, bytearray):
+            # Bit i is the i-th byte, so read the '0'/'1' string back to front as a binary number
+            return int(self.heights[::-1].translate(LEVEL_TABLES[level]), 2)
+
+        mask = 0
+        for i, height in enumerate(self.heights):
+            if height <= level:
+                mask |= BIT[i]
+        return mask
+
+    def move_targets(self, index):
+        """
+        Mask of the cells the worker at the given cell can move to
+
+        :param index: int, bit index of the worker's cell
+        :return: int, mask of legal destinations
+        """
+        # Free neighbors that are not capped and at most one floor up
+        level = min(self.heights[index] + 1, MAX_HEIGHT - 1)
+        return NEIGHBOR_MASK[index] & ~self.occupied & self.at_most(level)
+
+    def build_targets(self, index):
+        """
+        Mask of the cells the worker at the given cell can build on
+
+        :param index: int, bit index of the worker's cell
+        :return: int, mask of legal builds
+        """
+        # Free neighbors that are not capped
+        return NEIGHBOR_MASK[index] & ~self.occupied & self.at_most(MAX_HEIGHT - 1)
+
+    def move_worker(self, origin, destination):
+        """
+        Moves the worker at origin to destination, call it again swapped to undo it
+
+        :param origin: int, bit index of the worker's cell
+        :param destination: int, bit index of the cell to move to
+        """
+        self.occupied ^= BIT[origin] | BIT[destination]
+
+    def build_floor(self, index):
+        """
+        Adds one floor to the given cell
+
+        :param index: int, bit index of the cell to build on
+        """
+        height = self.heights[index]
+        # The cell is no longer at or below its old height
+        if height < MAX_HEIGHT and self.__at_most[height] is not None:
+            self.__at_most[height] &= ~BIT[index]
+        self.heights[index] = height + 1
+
+    def remove_floor(self, index):
+        """
+        Removes one floor from the given cell, undoing build_floor
+
+        :param index: int, bit index of the cell to remove from
+        """
+        height = self.heights[index] - 1
+        # The cell is at or below its new height again
+        if height < MAX_HEIGHT and self.__at_most[height] is not None:
+            self.__at_most[height] |= BIT[index]
+        self.heights[index] = height
+
+
+    def set_height(self, index, height):
+        """
+        Sets the height of the given cell, keeping the level masks computed so far in sync
+
+        :param index: int, bit index of the cell
+        :param height: int, new height of the cell
+        """
+        try:
+            self.heights[index] = height
+        except ValueError:
+            # Heights that do not fit in a byte are kept as they are
+            self.heights = list(self.heights)
+            self.heights[index] = height
+
+        bit = BIT[index]
+        at_most = self.__at_most
+        for level in range(MAX_HEIGHT):
+            if at_most[level] is not None:
+                at_most[level] = at_most[level] | bit if height <= level else at_most[level] & ~bit
+
+    def set_occupied(self, index, occupied):
+        """
+        Marks the given cell as holding a worker or not
+
+        :param index: int, bit index of the cell
+        :param occupied: bool, whether a worker stands on the cell
+        """
+        if occupied:
+            self.occupied |= BIT[index]
+        else:
+            self.occupied &= ~BIT[index]
+
+
+def from_board(board):
+    """
+    Builds a BitBoard with the heights and workers of a GameBoard.
+
+    Boards that keep a BitBoard up to date with get_bitboard are copied, boards that can
+    report all of their heights at once with get_heights are read in one call, any other
+    GameBoard is read one cell at a time.
+
+    :param board: GameBoard, board to read
+    :return: BitBoard, heights and occupancy of the board, free to change
+    """
+    get_bitboard = getattr(board, 'get_bitboard', None)
+    if get_bitboard is not None:
+        return get_bitboard().copy()
+    return read_board(board)
+
+
+def read_board(board):
+    """
+    Builds a BitBoard by reading the heights and workers of a GameBoard.
+
+    :param board: GameBoard, board to read
+    :return: BitBoard, heights and occupancy of the board
+    """
+    get_heights = getattr(board, 'get_heights', None)
+    if get_heights is not None:
+        heights = get_heights()
+    else:
+        heights = [board.get_height(x, y) for x, y in COORDINATES]
+    return BitBoard(heights, occupancy(board.find_workers()))
+
+
+def board_bits(board):
+    """
+    BitBoard to generate actions on a GameBoard from, without copying it when the board
+    keeps one up to date
+
+    :param board: GameBoard, board to read
+    :return: BitBoard, heights and occupancy of the board, not to be changed
+    """
+    get_bitboard = getattr(board, 'get_bitboard', None)
+    if get_bitboard is not None:
+        return get_bitboard()
+    return read_board(board)
+
+
+def occupancy(workers):
+    """
+    Mask of the cells holding the given workers, workers off the board are ignored
+
+    :param workers: List[Tuple[int, int]], positions of workers
+    :return: int, occupancy mask
+    """
+    occupied = 0
+    for xy in workers:
+        occupied |= CELL_BIT.get(tuple(xy), 0)
+    return occupied
+
+
+def gen_moves(player, board):
+    """
+    Generate all valid moves for a player's workers under the standard rules, in the
+    same order as Lib.util.gen_moves
+
+    :param player: Player ID
+    :param board: a GameBoard
+    :yield: a move action
+    """
+    workers = board.find_workers()
+    bits = board_bits(board)
+
+    for x, y in workers:
+        index = CELL_INDEX.get((x, y))
+        if index is None or board.get_player_id(x, y) != player:
+            continue
+        targets = bits.move_targets(index)
+        for neighbor, xy in NEIGHBORS[index]:
+            if targets & BIT[neighbor]:
+                yield {'type': 'move', 'xy1': [x, y], 'xy2': list(xy), 'p': player}
+
+
+def gen_builds(player, w, board):
+    """
+    Generate all valid builds for a worker under the standard rules, in the same order
+    as Lib.util.gen_builds
+
+    :param player: Player ID
+    :param w: worker as (x, y)
+    :param board: a GameBoard
+    :yield: a build action
+    """
+    index = CELL_INDEX.get(tuple(w))
+    if index is None or board.get_player_id(w[0], w[1]) != player:
+        return
+
+    bits = board_bits(board)
+    targets = bits.build_targets(index)
+    for neighbor, xy in NEIGHBORS[index]:
+        if targets & BIT[neighbor]:
+            yield {'type': 'build', 'xy1': [w[0], w[1]], 'xy2': list(xy), 'p': player}
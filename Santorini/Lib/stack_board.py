@@ -34,6 +34,28 @@ class StackBoard:
         """ Check to see if our 'stack' is empty"""
         return len(self._action_storage) == 0
 
+    def hash_key(self):
+        """
+        Zobrist key of the board's current position, which the board keeps up to date
+        as actions are pushed and popped
+
+        :return: 64 bit key of the position
+        """
+        return self.board.hash_key()
+
+    def size(self):
+        """ Number of actions on the 'stack'"""
+        return len(self._action_storage)
+
+    def unwind(self, size):
+        """
+        Pop actions until only the given number of actions are left
+
+        :param size: number of actions to keep
+        """
+        while len(self._action_storage) > size:
+            self.pop()
+
     def push(self, action):
         """
         Push a action onto the stack and mutate board
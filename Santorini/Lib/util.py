@@ -5,6 +5,17 @@ import importlib.util
 import fileinput
 import pprint
 
+from Lib import bitboard
+from Lib.bitboard import BOARD_SIZE, CELL_INDEX, COORDINATES, DIRECTIONS
+
+# Valid values of either coordinate of a cell, built once instead of on every check
+BOARD_RANGE = range(BOARD_SIZE)
+
+# On-board neighbors of every cell on the board, in the same order as get_adjacent
+NEIGHBORS = {(x, y): tuple((x + dx, y + dy) for dx, dy in DIRECTIONS if (x + dx, y + dy) in CELL_INDEX)
+             for x, y in COORDINATES}
+
+
 def stdin():
     """
     Read all lines from fileinput, either from a file if given or
@@ -267,18 +278,47 @@ def gen_builds(player, w, board, checker):
     :param w: worker as (x, y)
     :param board: a GameBoard
     :param checker: a RuleChecker
+    :return: generator of build actions
+    """
+    # Checkers applying the standard rules can skip asking about every neighbor
+    if getattr(checker, 'bitboard_rules', False):
+        return bitboard.gen_builds(player, w, board)
+    return gen_checked_builds(player, w, board, checker)
+
+
+def gen_moves(player, board, checker):
+    """
+    Generate all valid moves for a worker
+    :param player: Player ID
+    :param board: a GameBoard
+    :param checker: a RuleChecker
+    :return: generator of move actions
+    """
+    # Checkers applying the standard rules can skip asking about every neighbor
+    if getattr(checker, 'bitboard_rules', False):
+        return bitboard.gen_moves(player, board)
+    return gen_checked_moves(player, board, checker)
+
+
+def gen_checked_builds(player, w, board, checker):
+    """
+    Generate all valid builds for a worker by asking the checker about every neighbor
+    :param player: Player ID
+    :param w: worker as (x, y)
+    :param board: a GameBoard
+    :param checker: a RuleChecker
     :yield: a build action
     """
-    for cell in get_adjacent(w[0], w[1]):
-        wid = board.get_worker_id(*w)
+    wid = board.get_worker_id(*w)
+    for cell in get_neighbors(w[0], w[1]):
         if checker.check_build(player, wid, w[0], w[1], cell[0], cell[1]):
             action = {'type': 'build', 'xy1': [w[0], w[1]], 'xy2': [cell[0], cell[1]], 'p': player}
             yield action
 
 
-def gen_moves(player, board, checker):
+def gen_checked_moves(player, board, checker):
     """
-    Generate all valid moves for a worker
+    Generate all valid moves for a worker by asking the checker about every neighbor
     :param player: Player ID
     :param board: a GameBoard
     :param checker: a RuleChecker
@@ -291,7 +331,7 @@ def gen_moves(player, board, checker):
             workers.append(cell)
 
     for w in workers:
-        for cell in get_adjacent(w[0], w[1]):
+        for cell in get_neighbors(w[0], w[1]):
             if checker.check_move(player, w[0], w[1], cell[0], cell[1]):
                 action = {'type': 'move', 'xy1': [w[0], w[1]], 'xy2': [cell[0], cell[1]], 'p': player}
                 yield action
@@ -311,3 +351,32 @@ def get_adjacent(x, y):
     return [(x + 1, y), (x + 1, y + 1), (x + 1, y - 1),
             (x, y - 1), (x, y + 1), (x - 1, y),
             (x - 1, y + 1), (x - 1, y - 1)]
+
+
+def get_neighbors(x, y):
+    """
+    Gets the coordinate tuples adjacent to the given coordinates that are on the board,
+    from a precomputed table so nothing is allocated
+
+    :param x: Represents the x coordinate of the target board cell
+    :type x:  int
+    :param y: Represents the y coordinate of the target board cell
+    :type y:  int
+    :return:  The on-board coordinate tuples adjacent to the given coordinates, in get_adjacent order
+    :rtype:   Tuple[Tuple[int, int], ...]
+    """
+    return NEIGHBORS.get((x, y), ())
+
+
+def is_on_board(x, y):
+    """
+    Determines whether the given coordinates are a cell of the standard board
+
+    :param x: Represents the x coordinate of the target board cell
+    :type x:  int
+    :param y: Represents the y coordinate of the target board cell
+    :type y:  int
+    :return:  True if the coordinates are between 0 and 5, else False
+    :rtype:   bool
+    """
+    return x in BOARD_RANGE and y in BOARD_RANGE
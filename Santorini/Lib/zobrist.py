@@ -0,0 +1,65 @@
+# Zobrist keys of the standard 6x6 board
+#
+# A position is identified by XOR-ing one random 64 bit key per cell height and per
+# worker, so a move or a build updates the key with one or two XORs instead of
+# hashing the whole board again. Keys come from a fixed seed, so a position has the
+# same key in every process and every run.
+import random
+
+from Lib.bitboard import CELLS, MAX_HEIGHT
+
+# Seed of every key, changing it changes the key of every position
+SEED = 0x5A7012111
+
+# Random source of the cell and side keys
+_RANDOM = random.Random(SEED)
+
+# Key of every height of every cell, a cell at height 0 adds nothing to the key
+HEIGHT_KEYS = [[0] + [_RANDOM.getrandbits(64) for _ in range(MAX_HEIGHT)] for _ in range(CELLS)]
+
+# Key XOR-ed in when the second player is the one to act
+SIDE_KEY = _RANDOM.getrandbits(64)
+
+# Worker keys already made for each player ID
+_PLAYER_KEYS = {}
+
+
+def player_keys(pid):
+    """
+    Key of a worker of the given player on every cell. Both workers of a player
+    share their keys, swapping them does not change the position.
+
+    :param pid: string, player ID
+    :return: List[int], key of a worker of the player by bit index
+    """
+    keys = _PLAYER_KEYS.get(pid)
+    if keys is None:
+        # Seeded by the ID itself so the keys do not depend on which players were seen first
+        rng = random.Random("{}:{}".format(SEED, pid))
+        keys = _PLAYER_KEYS[pid] = [rng.getrandbits(64) for _ in range(CELLS)]
+    return keys
+
+
+def height_key(index, height):
+    """
+    Key of a cell at the given height, heights outside of 0 to MAX_HEIGHT count as the nearest one
+
+    :param index: int, bit index of the cell
+    :param height: int, height of the cell
+    :return: int, key of the cell at that height
+    """
+    return HEIGHT_KEYS[index][max(0, min(height, MAX_HEIGHT))]
+
+
+def heights_key(heights):
+    """
+    Key of the heights of every cell
+
+    :param heights: Sequence[int], height of every cell, row by row
+    :return: int, key of the heights
+    """
+    key = 0
+    for index, height in enumerate(heights):
+        if height:
+            key ^= height_key(index, height)
+    return key
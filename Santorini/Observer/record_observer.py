@@ -0,0 +1,154 @@
+"""
+RecordObserver writes every game it observes to a binary game record file, see
+Admin.game_record for the format.
+"""
+
+from Admin.compact_board import CompactGameBoard
+from Admin.constants import WORKER_ONE_ID, WORKER_TWO_ID
+from Admin.game_over import GameOverCondition
+from Admin.game_record import GameRecord, GameRecordWriter
+from Observer.observer import Observer
+
+
+class RecordObserver(Observer):
+    """
+    Observer that records the actions of every game and appends the record to a file
+    when the game is over.
+
+    Observers see the board once all workers are placed, so placements are recorded in
+    the order the Referee asks for them: the first worker of each player, then the
+    second, starting with the player that moves first. Games that break before all
+    workers are placed are never shown to observers and are not recorded.
+
+    Games are kept in memory until they are over, a game is never partly written.
+    """
+
+    def __init__(self, output):
+        """
+        Initialize observer with output.
+
+        :param output: writable binary file to append records to
+        """
+        self.__writer = GameRecordWriter(output)
+        # Private copy of the board of the game being recorded, None between games
+        self.__board = None  # type: Optional[CompactGameBoard]
+        # Place actions of the game, ordered once the first player is known
+        self.__places = []  # type: List[dict]
+        # Move and build actions of the game
+        self.__actions = []  # type: List[dict]
+
+
+    def update_state_of_game(self, board):
+        """
+        Start recording a game when shown its board for the first time, later states
+        follow from the recorded actions.
+
+        :param board: Board, current board state
+        """
+        if self.__board is not None:
+            return
+
+        self.__board = CompactGameBoard()
+        self.__places = []
+        self.__actions = []
+        for x in range(6):
+            for y in range(6):
+                height = board.get_height(x, y)
+                if height:
+                    self.__board.build_floor(x, y, height)
+        for x, y in board.find_workers():
+            pid, wid = board.get_player_id(x, y), board.get_worker_id(x, y)
+            self.__board.place_worker(pid, wid, x, y)
+            self.__places.append({'type': 'place', 'p': pid, 'wid': wid, 'xy': [x, y]})
+
+
+    def update_action(self, wid, move_action, build_action):
+        """
+        Record a turn.
+
+        :param wid: string, id of worker
+        :param move_action: Action, move taken by worker
+        :param build_action: Action, build taken by worker
+        """
+        if self.__board is None:
+            return
+        pid = self.__board.get_player_id(*move_action['xy1'])
+        self.__record_move(pid, wid, move_action)
+        self.__actions.append({'type': 'build', 'p': pid, 'wid': wid,
+                               'xy1': list(build_action['xy1']), 'xy2': list(build_action['xy2'])})
+        self.__board.build_floor(*build_action['xy2'])
+
+
+    def error(self, pid, message):
+        """
+        Record the end of a game lost by a broken player.
+
+        :param pid: string, id of player
+        :param message: GameOverCondition, how the player broke
+        """
+        if self.__board is None:
+            return
+        condition = message if isinstance(message, GameOverCondition) else GameOverCondition.Crash
+        players = self.__players()
+        loser = players.index(pid) if pid in players else 0
+        self.__finish(players, 1 - loser, condition)
+
+
+    def game_over(self, pid, wid, move_action):
+        """
+        Record the end of a game won by the rules.
+
+        :param pid: string, id of winning player
+        :param wid: string, id of winning worker
+        :param move_action: Action, last move of the winning player
+        """
+        if self.__board is None:
+            return
+        # A game won by a move ends before the turn is reported, a game won by a build was already recorded
+        x2, y2 = move_action['xy2']
+        if self.__board.get_player_id(*move_action['xy1']) == pid and self.__board.get_player_id(x2, y2) is None:
+            self.__record_move(pid, wid, move_action)
+        players = self.__players()
+        self.__finish(players, players.index(pid) if pid in players else 0, GameOverCondition.FairGame)
+
+
+    def __record_move(self, pid, wid, move_action):
+        """
+        Record a move and apply it to the private board.
+
+        :param pid: string, id of the moving player
+        :param wid: string, id of the moving worker
+        :param move_action: Action, the move
+        """
+        self.__actions.append({'type': 'move', 'p': pid, 'wid': wid,
+                               'xy1': list(move_action['xy1']), 'xy2': list(move_action['xy2'])})
+        self.__board.move_worker(*(move_action['xy1'] + move_action['xy2']))
+
+
+    def __players(self):
+        """
+        Ids of the players of the game, the one that moved first first.
+
+        :return: [string, string], ids of the players
+        """
+        players = []
+        for action in self.__actions + self.__places:
+            if action['p'] not in players:
+                players.append(action['p'])
+        return (players + ["", ""])[:2]
+
+
+    def __finish(self, players, winner, condition):
+        """
+        Write the record of the game and wait for the next one.
+
+        :param players: [string, string], ids of the players, the one that moved first first
+        :param winner: N, index of the winner in players
+        :param condition: GameOverCondition, how the game ended
+        """
+        worker_order = [WORKER_ONE_ID, WORKER_TWO_ID]
+        places = sorted(self.__places, key=lambda a: (worker_order.index(a['wid']) if a['wid'] in worker_order else 2,
+                                                      players.index(a['p'])))
+        self.__writer.write(GameRecord(players, winner, condition, places + self.__actions))
+        self.__writer.flush()
+        self.__board = None
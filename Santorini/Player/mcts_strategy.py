@@ -0,0 +1,454 @@
+# This file implements a Monte Carlo Tree Search strategy that scores whole turns, a move and then
+# a build, by playing random games from them with the Lib.util move and build generators
+import copy
+import math
+import random
+import time
+
+from Admin.compact_board import CompactGameBoard
+from Admin.incremental_rule_checker import IncrementalRuleChecker
+from Admin.rule_checker import RuleChecker
+from Lib.bitboard import BIT, CELL_INDEX, COORDINATES, NEIGHBOR_MASK, NEIGHBORS, from_board
+from Lib.util import gen_builds, gen_moves
+
+# Seconds a decision may take by default, well inside the Referee's time limit
+DEFAULT_TIME_BUDGET = 1.0
+
+# Most playouts a decision runs by default
+DEFAULT_ITERATIONS = 5000
+
+# Weight of exploring turns that have few playouts against playing the ones that win most
+EXPLORATION = 1.4
+
+# Turns a playout plays before it is scored as a draw
+MAX_PLAYOUT_TURNS = 80
+
+# Height a worker wins on by the standard rules, playouts try moves up to it before any random move
+WINNING_HEIGHT = 3
+
+
+class Node:
+    """
+    Position of a search tree reached by a turn, with the playouts that went through it.
+
+    Attributes:
+        turn:       (MOVE, BUILD) turn that reached this position, the build is None if the move ended the game
+        mover:      Player ID of the player that took the turn
+        player:     Player ID of the player to act in this position
+        key:        Zobrist key of the position
+        winner:     Player ID of the winner if the turn ended the game, else None
+        children:   Nodes of the turns tried from this position
+        untried:    Turns not tried yet from this position, None until they are generated
+        visits:     Number of playouts through this position
+        wins:       Playouts through this position the mover won, a draw counts half
+    """
+
+    def __init__(self, turn, mover, player, key, winner=None):
+        """
+        Initializes a Node without any playouts
+
+        :param turn:    (MOVE, BUILD) turn that reached this position, None for the root
+        :param mover:   Player ID of the player that took the turn
+        :param player:  Player ID of the player to act in this position
+        :param key:     Zobrist key of the position
+        :param winner:  Player ID of the winner if the turn ended the game
+        """
+        self.turn = turn
+        self.mover = mover
+        self.player = player
+        self.key = key
+        self.winner = winner
+        self.children = []  # type: List[Node]
+        self.untried = None  # type: Optional[List[Tuple[dict, Optional[dict]]]]
+        self.visits = 0  # type: int
+        self.wins = 0.0  # type: float
+
+    def select_child(self):
+        """
+        Child to follow down the tree, by upper confidence bound
+
+        :return: Node, child with the best balance of winning and being little explored
+        """
+        log_visits = math.log(self.visits)
+        return max(self.children,
+                   key=lambda c: c.wins / c.visits + EXPLORATION * math.sqrt(log_visits / c.visits))
+
+    def find(self, key):
+        """
+        Child reached by a turn to the position with the given key
+
+        :param key: Zobrist key of the position
+        :return:    Node of the position, or None if it was not tried
+        """
+        for child in self.children:
+            if child.key == key:
+                return child
+        return None
+
+
+class Strategy:
+    """
+    Class representing a Santorini Strategy that picks the turn that won the most
+    random playouts, growing a search tree towards the turns that win most.
+
+    Playouts are not quite uniform: a player that can win right away does, moves
+    that climb are preferred and builds avoid handing the opponent a winning floor.
+
+    Within a game the tree is kept from one decision to the next: the opponent's
+    turn is looked up among the positions already tried below the turn this
+    player took last, and the search goes on from there.
+
+    Attributes:
+        __pid:          Player ID string
+        __root:         Node of the position after this player's last turn, None at the start of a game
+        playouts:       Number of playouts the last decision ran
+    """
+
+    def __init__(self, pid, time_budget=DEFAULT_TIME_BUDGET, iterations=DEFAULT_ITERATIONS, seed=None):
+        """
+        Initializes a strategy object for use
+
+        :param pid:         String identifing a player
+        :param time_budget: Seconds a decision may take
+        :param iterations:  Most playouts a decision runs
+        :param seed:        Seed of the random playouts, for repeatable games
+        """
+        self.__pid = pid
+        self.time_budget = time_budget
+        self.iterations = iterations
+
+        self.__random = random.Random(seed)
+        self.__root = None  # type: Optional[Node]
+        self.playouts = 0  # type: int
+
+    def reset(self):
+        """
+        Forget the search tree, at the end of a game
+        """
+        self.__root = None
+
+    def decide_turn(self, board, checker_cls=RuleChecker):
+        """
+        Decide the move and build of this player's next turn
+
+        :param board:       GameBoard, current state of the game
+        :param checker_cls: class of the RuleChecker the game is played with
+        :return:            (MOVE, BUILD) actions of the most played turn, the build is None when the
+                            move ends the game, None if this player can not move
+        """
+        deadline = time.monotonic() + self.time_budget
+        # Playouts check for the end of the game after every action, which the standard rules can do incrementally
+        if checker_cls is RuleChecker:
+            checker_cls = IncrementalRuleChecker
+        start = self.__copy(board)
+        players = self.__players(start)
+        root = self.__reuse_root(start) or Node(None, players[1], self.__pid, start.hash_key())
+
+        self.playouts = 0
+        while self.playouts < self.iterations and (self.playouts == 0 or time.monotonic() < deadline):
+            self.__iterate(root, copy.deepcopy(start), checker_cls, players)
+            self.playouts += 1
+
+        if not root.children:
+            self.__root = None
+            return None
+        # A turn that wins right away is taken, otherwise the most played one, the one winning most on a tie
+        best = max(root.children, key=lambda c: (c.winner == self.__pid, c.visits, c.wins / c.visits))
+        # Keep what was searched below the chosen turn for the next decision
+        self.__root = best
+        return best.turn
+
+    def __reuse_root(self, board):
+        """
+        Node of the current position among the opponent's turns tried after this player's last turn
+
+        :param board:   CompactGameBoard, current state of the game
+        :return:        Node of the current position, or None if it was not tried
+        """
+        if self.__root is None:
+            return None
+        node = self.__root.find(board.hash_key())
+        if node is not None and node.player == self.__pid:
+            return node
+        return None
+
+    def __iterate(self, root, board, checker_cls, players):
+        """
+        Run one playout: follow the tree down, try a new turn, play randomly until the game
+        is over and count the result in every node on the way
+
+        :param root:        Node of the current position
+        :param board:       CompactGameBoard, private copy of the current position
+        :param checker_cls: class of the RuleChecker the game is played with
+        :param players:     [Player ID, Player ID], this player then the opponent
+        """
+        checker = checker_cls(board)
+        node = root
+        path = [node]
+
+        # Selection: follow the most promising turns while every turn of a position has been tried
+        while node.winner is None and node.untried is not None and not node.untried and node.children:
+            node = node.select_child()
+            self.__take_turn(board, checker, node.turn, players)
+            path.append(node)
+
+        # Expansion: try one new turn
+        if node.winner is None:
+            if node.untried is None:
+                node.untried = self.__turns(board, checker, node.player, players)
+                self.__random.shuffle(node.untried)
+            if node.untried:
+                turn = node.untried.pop()
+                winner = self.__take_turn(board, checker, turn, players)
+                child = Node(turn, node.player, self.__other(node.player, players), board.hash_key(), winner)
+                node.children.append(child)
+                node = child
+                path.append(node)
+
+        # Simulation: play random turns to the end of the game, on bit masks when the rules are the standard ones
+        winner = node.winner
+        if winner is None and getattr(checker, 'bitboard_rules', False):
+            winner = self.__bit_playout(board, node.player, players)
+        elif winner is None:
+            winner = self.__playout(board, checker, node.player, players)
+
+        # Backpropagation
+        for visited in path:
+            visited.visits += 1
+            if winner is None:
+                visited.wins += 0.5
+            elif winner == visited.mover:
+                visited.wins += 1
+
+    def __playout(self, board, checker, player, players):
+        """
+        Play random turns from a position until the game is over
+
+        :param board:   CompactGameBoard, position to play from, changed by the playout
+        :param checker: RuleChecker of the board
+        :param player:  Player ID of the player to act
+        :param players: [Player ID, Player ID], this player then the opponent
+        :return:        Player ID of the winner, None if the playout was too long
+        """
+        choice = self.__random.choice
+        for _ in range(MAX_PLAYOUT_TURNS):
+            moves = list(gen_moves(player, board, checker))
+            if not moves:
+                return self.__other(player, players)
+            # A player that can win right away does, random playouts otherwise miss most wins and losses
+            move = next((m for m in moves if board.get_height(*m['xy2']) == WINNING_HEIGHT), None)
+            if move is None:
+                # Of two random moves the one that ends higher, so playouts climb like real players do
+                move, other = choice(moves), choice(moves)
+                if board.get_height(*other['xy2']) > board.get_height(*move['xy2']):
+                    move = other
+            board.move_worker(*(move['xy1'] + move['xy2']))
+            checker.notify_of_action(move)
+            # A build never frees a worker, so short of climbing to win the end of the game waits for the build
+            if board.get_height(*move['xy2']) == WINNING_HEIGHT:
+                winner = checker.check_game_over(*players)
+                if winner is not None:
+                    return winner
+
+            build = self.__playout_build(board, checker, player, move['xy2'], players)
+            board.build_floor(*build['xy2'])
+            checker.notify_of_action(build)
+            winner = checker.check_game_over(*players)
+            if winner is not None:
+                return winner
+            player = self.__other(player, players)
+        return None
+
+    def __bit_playout(self, board, player, players):
+        """
+        Play random turns from a position until the game is over, under the standard rules
+        and on bit masks, with the same choices as __playout
+
+        :param board:   CompactGameBoard, position to play from
+        :param player:  Player ID of the player to act
+        :param players: [Player ID, Player ID], this player then the opponent
+        :return:        Player ID of the winner, None if the playout was too long
+        """
+        bits = from_board(board)
+        heights = bits.heights
+        workers = board.find_workers()
+        positions = [CELL_INDEX[(x, y)] for x, y in workers]
+        owners = [board.get_player_id(x, y) for x, y in workers]
+        choice = self.__random.choice
+        for _ in range(MAX_PLAYOUT_TURNS):
+            moves = []
+            for slot, index in enumerate(positions):
+                if owners[slot] == player:
+                    targets = bits.move_targets(index)
+                    moves.extend((slot, neighbor) for neighbor, _ in NEIGHBORS[index] if targets & BIT[neighbor])
+            if not moves:
+                return self.__other(player, players)
+            move = next((m for m in moves if heights[m[1]] == WINNING_HEIGHT), None)
+            if move is None:
+                move, other = choice(moves), choice(moves)
+                if heights[other[1]] > heights[move[1]]:
+                    move = other
+            slot, destination = move
+            bits.move_worker(positions[slot], destination)
+            positions[slot] = destination
+            if heights[destination] == WINNING_HEIGHT:
+                winner = self.__bit_winner(bits, positions, owners, players)
+                if winner is not None:
+                    return winner
+
+            threatened = 0
+            for index, owner in zip(positions, owners):
+                if owner != player and heights[index] == WINNING_HEIGHT - 1:
+                    threatened |= NEIGHBOR_MASK[index]
+            targets = bits.build_targets(destination)
+            builds = [neighbor for neighbor, _ in NEIGHBORS[destination] if targets & BIT[neighbor]]
+            build = next((b for b in builds if threatened & BIT[b] and heights[b] == WINNING_HEIGHT), None)
+            if build is None:
+                safe = [b for b in builds if not threatened & BIT[b] or heights[b] != WINNING_HEIGHT - 1]
+                build = choice(safe or builds)
+            bits.build_floor(build)
+            winner = self.__bit_winner(bits, positions, owners, players)
+            if winner is not None:
+                return winner
+            player = self.__other(player, players)
+        return None
+
+    def __bit_winner(self, bits, positions, owners, players):
+        """
+        Winner of a playout on bit masks, checking workers in board order like RuleChecker.check_game_over
+
+        :param bits:        BitBoard of the playout
+        :param positions:   List of int, bit index of every worker
+        :param owners:      List of Player ID, owner of every worker
+        :param players:     [Player ID, Player ID], this player then the opponent
+        :return:            Player ID of the winner, None if the game goes on
+        """
+        heights = bits.heights
+        for index, owner in zip(positions, owners):
+            if heights[index] == WINNING_HEIGHT:
+                return owner
+            if not bits.move_targets(index):
+                return self.__other(owner, players)
+        return None
+
+    def __playout_build(self, board, checker, player, worker, players):
+        """
+        Build of a playout: capping a floor the opponent could climb to win, else any build
+        that does not hand the opponent such a floor, else any build
+
+        :param board:   CompactGameBoard, position of the playout
+        :param checker: RuleChecker of the board
+        :param player:  Player ID of the player to build
+        :param worker:  (N, N), position of the worker that moved
+        :param players: [Player ID, Player ID], this player then the opponent
+        :return:        BUILD action
+        """
+        builds = list(gen_builds(player, worker, board, checker))
+        # Floors next to an opponent's worker that stands one floor below the winning height
+        threatened = set()
+        for x, y in board.find_player_workers(self.__other(player, players)):
+            if board.get_height(x, y) == WINNING_HEIGHT - 1:
+                threatened.update((x + dx, y + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+        if threatened:
+            safe = []
+            for build in builds:
+                xy = tuple(build['xy2'])
+                height = board.get_height(*xy)
+                if xy in threatened and height == WINNING_HEIGHT:
+                    return build
+                if xy not in threatened or height != WINNING_HEIGHT - 1:
+                    safe.append(build)
+            builds = safe or builds
+        return self.__random.choice(builds)
+
+    def __turns(self, board, checker, player, players):
+        """
+        Every turn of a player, a move and then a build. When a move wins the game
+        only the winning moves are given, no other turn is worth trying.
+
+        :param board:   CompactGameBoard, position to take the turns from
+        :param checker: RuleChecker of the board
+        :param player:  Player ID of the player to act
+        :param players: [Player ID, Player ID], this player then the opponent
+        :return:        List of (MOVE, BUILD), the build is None if the move ends the game
+        """
+        turns = []
+        wins = []
+        for move in list(gen_moves(player, board, checker)):
+            board.move_worker(*(move['xy1'] + move['xy2']))
+            checker.notify_of_action(move)
+            winner = checker.check_game_over(*players)
+            if winner == player:
+                wins.append((move, None))
+            elif winner is not None:
+                turns.append((move, None))
+            elif not wins:
+                turns.extend((move, build) for build in gen_builds(player, move['xy2'], board, checker))
+            board.move_worker(*(move['xy2'] + move['xy1']))
+            checker.notify_of_action({'type': 'move', 'xy1': move['xy2'], 'xy2': move['xy1']})
+        return wins or turns
+
+    def __take_turn(self, board, checker, turn, players):
+        """
+        Take a turn on the board
+
+        :param board:   CompactGameBoard, position to take the turn on
+        :param checker: RuleChecker of the board
+        :param turn:    (MOVE, BUILD) turn to take
+        :param players: [Player ID, Player ID], this player then the opponent
+        :return:        Player ID of the winner if the turn ended the game, else None
+        """
+        move, build = turn
+        board.move_worker(*(move['xy1'] + move['xy2']))
+        checker.notify_of_action(move)
+        if build is None:
+            return checker.check_game_over(*players)
+        board.build_floor(*build['xy2'])
+        checker.notify_of_action(build)
+        return checker.check_game_over(*players)
+
+    def __players(self, board):
+        """
+        This player and the opponent
+
+        :param board:   GameBoard, current state of the game
+        :return:        [Player ID, Player ID], this player then the opponent
+        """
+        for x, y in board.find_workers():
+            pid = board.get_player_id(x, y)
+            if pid != self.__pid:
+                return [self.__pid, pid]
+        return [self.__pid, None]
+
+    @staticmethod
+    def __other(player, players):
+        """
+        The other player
+
+        :param player:  Player ID
+        :param players: [Player ID, Player ID]
+        :return:        Player ID of the other player
+        """
+        return players[1] if player == players[0] else players[0]
+
+    @staticmethod
+    def __copy(board):
+        """
+        Private CompactGameBoard copy of a board, workers placed in the board's order
+
+        :param board:   GameBoard, board to copy
+        :return:        CompactGameBoard, copy of the board
+        """
+        board_copy = CompactGameBoard()
+        # Boards that can not report all of their heights at once are read one cell at a time
+        get_heights = getattr(board, 'get_heights', None)
+        if get_heights is not None:
+            heights = get_heights()
+        else:
+            heights = [board.get_height(x, y) for x, y in COORDINATES]
+        for index, height in enumerate(heights):
+            if height:
+                board_copy.build_floor(index % 6, index // 6, height)
+        for x, y in board.find_workers():
+            board_copy.place_worker(board.get_player_id(x, y), board.get_worker_id(x, y), x, y)
+        return board_copy
@@ -96,6 +96,27 @@ class Player(IPlayer):
             return i
         
 
+    def pick_move(self, moves):
+        """
+        Picks the move get_move would make among the legal ones, for simulators that
+        generate moves on bit masks
+
+        :param moves: [(N, N), ...], legal moves as the bit index of the worker and of its
+                      destination, in the order gen_moves gives them
+        :return: (N, N), the picked move
+        """
+        return moves[0]
+
+    def pick_build(self, builds):
+        """
+        Picks the build get_build would make among the legal ones, for simulators that
+        generate builds on bit masks
+
+        :param builds: [N, ...], bit indexes of the legal builds, in the order gen_builds gives them
+        :return: N, the picked build
+        """
+        return builds[0]
+
     def game_over(self, status):
         """
         Alerts the player that the game is over with status
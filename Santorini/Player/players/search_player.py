@@ -0,0 +1,122 @@
+from Player.test_strategy_place1 import Strategy as PlaceDiagonalStrategy
+from Player.search_strategy import Strategy as SearchStrategy, DEFAULT_MAX_DEPTH, DEFAULT_TIME_BUDGET
+from Lib.util import gen_moves, gen_builds
+
+from Common.player import Player as IPlayer
+
+class SearchPlayer(IPlayer):
+    """
+    Class representing a Player that decides every turn with an alpha-beta search,
+    deciding the move and the build together when asked for the move.
+    """
+
+    def __init__(self, player_id, time_budget=DEFAULT_TIME_BUDGET, max_depth=DEFAULT_MAX_DEPTH, processes=1):
+        """
+        Initialize the Player object
+
+        :param player_id: Unique ID for the Player
+        :param time_budget: Seconds a turn's search may take
+        :param max_depth: Deepest search in whole turns
+        :param processes: Number of processes to search with
+        """
+        self.__player_id = player_id
+        self.__strategy = SearchStrategy(player_id, time_budget, max_depth, processes)
+        self.__build = None
+
+    def __eq__(self, other):
+        return isinstance(other, type(self)) and self.get_id() is other.get_id()
+
+
+    def get_id(self):
+        """
+        Getter for the Player's ID
+
+        :return: String Player ID
+        """
+        return self.__player_id
+
+
+    def set_id(self, new_id):
+        """
+        Set the given id as the new id
+        """
+        self.__player_id = new_id
+        strategy = self.__strategy
+        strategy.close()
+        self.__strategy = SearchStrategy(new_id, strategy.time_budget, strategy.max_depth, strategy.processes)
+
+    def notify_of_opponent(self, opponent_id):
+        """
+        Notify the player of who they are playing for the next game.
+
+        :param opponent_id: string, id of opponent
+        """
+        pass
+
+    def get_placement(self, board, wid, rule_checker):
+        """
+        Asks the player to place a worker on the board
+
+        :param board: GameBoard, copy of the current state of the game
+        :param wid: The ID of the worker the player is to place
+
+        :return: JSON that represents a place_worker action
+        """
+        place_diagonal_strategy = PlaceDiagonalStrategy(self.__player_id, rule_checker, board)
+
+        to_xy = place_diagonal_strategy.decide_place(wid)
+        return { 'type': 'place', 'wid': wid, 'xy': list(to_xy) }
+
+
+    def get_move(self, board, rule_checker):
+        """
+        Asks the player to make a move, searching for the best turn and keeping its build
+
+        :param board: GameBoard, copy of the current state of the game
+        :return: JSON that represents a move action
+        """
+        turn = None
+        if rule_checker.bitboard_rules:
+            turn = self.__strategy.decide_turn(board)
+
+        # The search only knows the standard rules, any other rules get their first valid move
+        if turn is None:
+            self.__build = None
+            for move in gen_moves(self.__player_id, board, rule_checker):
+                return move
+            return None
+
+        move, self.__build = turn
+        return move
+
+
+    def get_build(self, board, wid, rule_checker):
+        """
+        Asks the player to build a floor, with the build of the searched turn if it was for this worker
+
+        :param board: GameBoard, copy of the current state of the game
+        :param wid: Worker ID of the worker that the player needs to build with
+
+        :return: Json that represents a build action
+        """
+        worker_position = board.find_worker(self.__player_id, wid)
+        build, self.__build = self.__build, None
+        if build is not None and tuple(build['xy1']) == tuple(worker_position):
+            return build
+
+        builds = gen_builds(self.__player_id, worker_position, board, rule_checker)
+        for i in builds:
+            return i
+
+
+    def game_over(self, status):
+        """
+        Alerts the player that the game is over with status
+
+        :param status: one of "WIN" | "LOSE" depending on the outcome of the board
+        """
+        # Stop the search processes between games, the next decision starts them again
+        self.__strategy.close()
+
+
+Player = SearchPlayer
@@ -0,0 +1,144 @@
+import copy
+import time
+
+from Player.test_strategy_place1 import Strategy as PlaceDiagonalStrategy
+from Player.test_strategy_alive import Strategy as StayAliveStrategy, DEFAULT_MAX_LOOK_AHEAD, DEFAULT_TIME_BUDGET
+from Lib.util import gen_moves, gen_builds
+
+from Common.player import Player as IPlayer
+
+# Height a worker wins the game by moving onto
+WINNING_HEIGHT = 3
+
+class StayAlivePlayer(IPlayer):
+    """
+    Class representing a Player that takes the first turn after which the opponent can
+    not make it lose, looking ahead as far as the time budget allows, and deciding the
+    move and the build together when asked for the move.
+    """
+
+    def __init__(self, player_id, time_budget=DEFAULT_TIME_BUDGET, max_look_ahead=DEFAULT_MAX_LOOK_AHEAD):
+        """
+        Initialize the Player object
+
+        :param player_id: Unique ID for the Player
+        :param time_budget: Seconds a turn's decision may take, keep it below the Referee's time limit
+        :param max_look_ahead: Deepest look ahead to try for every turn
+        """
+        self.__player_id = player_id
+        self.time_budget = time_budget
+        self.max_look_ahead = max_look_ahead
+        self.__build = None
+
+    def __eq__(self, other):
+        return isinstance(other, type(self)) and self.get_id() is other.get_id()
+
+
+    def get_id(self):
+        """
+        Getter for the Player's ID
+
+        :return: String Player ID
+        """
+        return self.__player_id
+
+
+    def set_id(self, new_id):
+        """
+        Set the given id as the new id
+        """
+        self.__player_id = new_id
+
+    def notify_of_opponent(self, opponent_id):
+        """
+        Notify the player of who they are playing for the next game.
+
+        :param opponent_id: string, id of opponent
+        """
+        pass
+
+    def get_placement(self, board, wid, rule_checker):
+        """
+        Asks the player to place a worker on the board
+
+        :param board: GameBoard, copy of the current state of the game
+        :param wid: The ID of the worker the player is to place
+
+        :return: JSON that represents a place_worker action
+        """
+        place_diagonal_strategy = PlaceDiagonalStrategy(self.__player_id, rule_checker, board)
+
+        to_xy = place_diagonal_strategy.decide_place(wid)
+        return { 'type': 'place', 'wid': wid, 'xy': list(to_xy) }
+
+
+    def get_move(self, board, rule_checker):
+        """
+        Asks the player to make a move, keeping the build of the chosen turn. Every turn
+        gets an equal share of what is left of the time budget, and the first one that is
+        not found to lose is taken.
+
+        :param board: GameBoard, copy of the current state of the game
+        :return: JSON that represents a move action
+        """
+        deadline = time.monotonic() + self.time_budget
+        board = copy.deepcopy(board)
+        checker = type(rule_checker)(board)
+        self.__build = None
+
+        turns = []
+        for move in list(gen_moves(self.__player_id, board, checker)):
+            # A move onto the third floor wins right away, no build follows
+            if board.get_height(*move['xy2']) == WINNING_HEIGHT:
+                return move
+            board.move_worker(*(move['xy1'] + move['xy2']))
+            turns.extend((move, build) for build in gen_builds(self.__player_id, move['xy2'], board, checker))
+            board.move_worker(*(move['xy2'] + move['xy1']))
+        if not turns:
+            return None
+
+        strategy = StayAliveStrategy(self.__player_id, init=board)
+        chosen = turns[0]
+        for i, turn in enumerate(turns):
+            remaining = deadline - time.monotonic()
+            # Out of time, so take the first turn not found to lose
+            if remaining <= 0:
+                chosen = turn
+                break
+            if strategy.decide_turn_within(turn[0], turn[1], remaining / (len(turns) - i), self.max_look_ahead):
+                chosen = turn
+                break
+
+        move, self.__build = chosen
+        return move
+
+
+    def get_build(self, board, wid, rule_checker):
+        """
+        Asks the player to build a floor, with the build of the chosen turn if it was for this worker
+
+        :param board: GameBoard, copy of the current state of the game
+        :param wid: Worker ID of the worker that the player needs to build with
+
+        :return: Json that represents a build action
+        """
+        worker_position = board.find_worker(self.__player_id, wid)
+        build, self.__build = self.__build, None
+        if build is not None and tuple(build['xy1']) == tuple(worker_position):
+            return build
+
+        builds = gen_builds(self.__player_id, worker_position, board, rule_checker)
+        for i in builds:
+            return i
+
+
+    def game_over(self, status):
+        """
+        Alerts the player that the game is over with status
+
+        :param status: one of "WIN" | "LOSE" depending on the outcome of the board
+        """
+        pass
+
+
+Player = StayAlivePlayer
@@ -0,0 +1,659 @@
+# This file implements a look-ahead strategy that searches whole turns, a move and then a build,
+# with negamax and alpha-beta pruning over a BitBoard, remembering searched positions by Zobrist key
+import multiprocessing
+import time
+
+from Common.exception import OutOfTime
+from Lib.bitboard import BIT, CELL_INDEX, COORDINATES, BitBoard, from_board
+from Lib.util import make_build, make_move
+from Lib.zobrist import HEIGHT_KEYS, SIDE_KEY, heights_key, player_keys
+
+# Score of winning right away, a win found deeper scores one less for every turn it takes
+WIN = 1000000
+
+# Scores beyond this bound are forced wins or losses
+WIN_BOUND = WIN - 1000
+
+# Larger than any score
+INFINITY = WIN + 1
+
+# Key XOR-ed into the position key for each side to act, the searching player is side 0
+SIDE_KEYS = (0, SIDE_KEY)
+
+# Score of a worker standing on each height below the third floor
+HEIGHT_SCORE = [0, 40, 120]
+
+# Score of every cell a worker can move to
+MOBILITY_SCORE = 3
+
+# Score of every cell a worker can move to that is higher than where it stands
+CLIMB_SCORE = 12
+
+# Score of a worker on the second floor next to a free third floor, a win on its next turn
+THREAT_SCORE = 300
+
+# Bounds a transposition table score can be
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# Nodes searched between two looks at the clock
+CLOCK_INTERVAL = 256
+
+# Positions remembered before the transposition table is cleared
+TABLE_SIZE = 1 << 20
+
+# Seconds a decision may take by default, well inside the Referee's time limit
+DEFAULT_TIME_BUDGET = 1.0
+
+# Deepest search in whole turns by default
+DEFAULT_MAX_DEPTH = 12
+
+# Strategy of a search process, set up by _init_worker
+_WORKER_STRATEGY = None
+
+# Best root score found so far, the index of its turn and the generation of the root search
+# it belongs to, shared by the search processes
+_WORKER_BEST = None
+
+
+class Strategy:
+    """
+    Class representing a Santorini Strategy that picks the turn with the best
+    negamax score, deepening the search one turn at a time until its time
+    budget is spent.
+
+    The search follows the rules of Admin.rule_checker: a worker on the third
+    floor wins, and a worker that can not move loses for its player, checked
+    after every move and every build.
+
+    Attributes:
+        __pid:          Player ID string
+        __table:        Transposition table, score bound and best turn of every searched position
+                        by Zobrist key, kept from one decision to the next
+        nodes:          Number of positions the last decision searched
+        depth:          Deepest search the last decision completed, in whole turns
+
+    Parallel Search:
+        With more than one process, the turns at the root of every depth are
+        split over a pool of search processes, each with its own transposition
+        table. The processes share the best root score found so far and search
+        every other turn with it as their cut-off bound. On a fresh strategy this
+        picks the same turn as the serial search, but scores reused from the
+        transposition tables depend on what each table already holds, so after
+        earlier decisions the serial and parallel searches can pick different
+        turns. The pool is started by the first decision and stays up until close
+        is called. Where processes can not be started, for
+        example inside a daemonic process, the search runs serially.
+    """
+
+    def __init__(self, pid, time_budget=DEFAULT_TIME_BUDGET, max_depth=DEFAULT_MAX_DEPTH, processes=1):
+        """
+        Initializes a strategy object for use
+
+        :param pid:         String identifing a player
+        :param time_budget: Seconds a decision may take
+        :param max_depth:   Deepest search in whole turns
+        :param processes:   Number of processes to search with
+        """
+        self.__pid = pid
+        self.time_budget = time_budget
+        self.max_depth = max_depth
+        self.processes = processes
+
+        # Pool of search processes and the best root score they share, None until started
+        self.__pool = None  # type: Optional[multiprocessing.pool.Pool]
+        self.__best = None  # type: Optional[multiprocessing.Array]
+
+        self.__table = {}  # type: Dict[int, Tuple[int, int, int, Optional[Tuple[int, int, int]]]]
+        self.nodes = 0  # type: int
+        self.depth = 0  # type: int
+
+        # Search state, loaded from the board of every decision
+        self.__bits = None  # type: BitBoard
+        self.__positions = []  # type: List[int]
+        self.__owners = []  # type: List[int]
+        self.__opponent = None  # type: Optional[str]
+        self.__worker_keys = []  # type: List[List[int]]
+        self.__key = 0  # type: int
+        self.__deadline = 0.0  # type: float
+
+    def __getstate__(self):
+        """
+        State to pickle, without the pool of search processes
+
+        :return: dict, attributes of this strategy
+        """
+        state = self.__dict__.copy()
+        state['_Strategy__pool'] = None
+        state['_Strategy__best'] = None
+        return state
+
+    def close(self):
+        """
+        Stop the pool of search processes if it was started
+        """
+        if self.__pool is not None:
+            self.__pool.terminate()
+            self.__pool.join()
+            self.__pool = None
+            self.__best = None
+
+    def decide_turn(self, board):
+        """
+        Decide the move and build of this player's next turn
+
+        :param board:   GameBoard, current state of the game
+        :return:        (MOVE, BUILD) actions of the best turn found, the build is None when the
+                        move ends the game, None if this player can not move
+        """
+        self.__load(board)
+        start = time.monotonic()
+        self.nodes = 0
+        self.depth = 0
+
+        if self.processes > 1 and self.__start_pool():
+            best = self.__deepen_in_parallel(start)
+        else:
+            best = self.__deepen(start)
+
+        if best is None:
+            return None
+        origin, destination, build = best
+        move = make_move(*COORDINATES[origin], *COORDINATES[destination])
+        if build is None:
+            return move, None
+        return move, make_build(*COORDINATES[destination], *COORDINATES[build])
+
+    def __deepen(self, start):
+        """
+        Search one turn deeper at a time until the time budget is spent
+
+        :param start:   Clock time the decision started at
+        :return:        (origin, destination, build) best turn of the deepest completed search, or None
+        """
+        root = self.__key
+        # The first depth always completes, so there is a turn to answer with
+        self.__deadline = float('inf')
+        best = None
+        try:
+            for depth in range(1, self.max_depth + 1):
+                value = self.__negamax(depth, -INFINITY, INFINITY, 0, 0)
+                best = self.__table[root][3]
+                self.depth = depth
+                self.__deadline = start + self.time_budget
+                # Nothing deeper changes a forced result
+                if abs(value) >= WIN_BOUND:
+                    break
+        except OutOfTime:
+            pass
+        return best
+
+    def __deepen_in_parallel(self, start):
+        """
+        Search one turn deeper at a time until the time budget is spent, splitting the
+        turns at the root of every depth over the pool of search processes
+
+        :param start:   Clock time the decision started at
+        :return:        (origin, destination, build) best turn of the deepest completed search, or None
+        """
+        state = self.__state()
+        deadline = float('inf')
+        best = None
+        for depth in range(1, self.max_depth + 1):
+            result = self.__split_root(state, self.__root_turns(best), depth, deadline)
+            if result is None:
+                break
+            value, best = result
+            self.depth = depth
+            deadline = start + self.time_budget
+            if best is None or abs(value) >= WIN_BOUND:
+                break
+        return best
+
+    def __split_root(self, state, turns, depth, deadline):
+        """
+        Score every root turn over the pool of search processes
+
+        :param state:       Search state of the root, see __state
+        :param turns:       List of (origin, destination, build) root turns in search order
+        :param depth:       Turns to search, the root turn included
+        :param deadline:    Clock time the search has to be done by
+        :return:            (score, best turn), (score, None) if there are no turns, or None if
+                            the search ran out of time
+        """
+        best = self.__best
+        # A new generation keeps turns of an earlier root search from updating this one
+        with best.get_lock():
+            best[0], best[1], best[2] = -INFINITY, len(turns), best[2] + 1
+            generation = best[2]
+
+        tasks = []
+        for index, turn in enumerate(turns):
+            # A turn whose move ends the game is scored here, without a search
+            if turn[2] is None:
+                _update_best(best, index, self.__score_move(turn), -INFINITY, generation)
+            else:
+                tasks.append((state, turn, depth, index, deadline, generation))
+
+        # Wait for every task, even once one ran out of time, so none is left running in the pool
+        out_of_time = False
+        for score, nodes in self.__pool.imap_unordered(_search_root_turn, tasks):
+            out_of_time = out_of_time or score is None
+            self.nodes += nodes
+        if out_of_time:
+            return None
+
+        # A player without any turn loses
+        if not turns:
+            return -WIN, None
+        return best[0], turns[best[1]]
+
+    def __root_turns(self, hint):
+        """
+        Turns of the searching player in the order the serial search tries them
+
+        :param hint:    (origin, destination, build) best turn of the last depth, or None
+        :return:        List of (origin, destination, build), the build is None when the move ends the game
+        """
+        turns = []
+        positions = self.__positions
+        for slot, destination in self.__ordered_moves(0, hint):
+            origin = positions[slot]
+            self.__move(slot, origin, destination)
+            if self.__winner() is not None:
+                turns.append((origin, destination, None))
+            else:
+                turns.extend((origin, destination, build)
+                             for build in self.__ordered_builds(origin, destination, hint))
+            self.__move(slot, destination, origin)
+        return turns
+
+    def __score_move(self, turn):
+        """
+        Score of a root turn whose move ends the game
+
+        :param turn:    (origin, destination, None) root turn
+        :return:        Score of the turn for the searching player
+        """
+        origin, destination, _ = turn
+        slot = self.__positions.index(origin)
+        self.__move(slot, origin, destination)
+        winner = self.__winner()
+        self.__move(slot, destination, origin)
+        return WIN if winner == 0 else -WIN
+
+    def search_root_turn(self, state, turn, depth, alpha, deadline):
+        """
+        Score a root turn for the searching player, within a search process
+
+        :param state:       Search state of the root, see __state
+        :param turn:        (origin, destination, build) root turn, its move does not end the game
+        :param depth:       Turns to search, the root turn included
+        :param alpha:       Score the searching player is already sure of
+        :param deadline:    Clock time the search has to be done by
+        :return:            Score of the turn if it is above alpha, else a score at most alpha
+        :raise OutOfTime:   if the search is not done by the deadline
+        """
+        self.__restore(state)
+        self.__deadline = deadline
+        origin, destination, build = turn
+        self.__move(self.__positions.index(origin), origin, destination)
+        self.__build(build)
+
+        winner = self.__winner()
+        if winner is not None:
+            return WIN if winner == 0 else -WIN
+        return -self.__negamax(depth - 1, -INFINITY, -alpha, 1, 1)
+
+    def __start_pool(self):
+        """
+        Start the pool of search processes if it is not up yet
+
+        :return:    bool, True if the pool is up
+        """
+        if self.__pool is not None:
+            return True
+        try:
+            self.__best = multiprocessing.Array('q', 3)
+            self.__pool = multiprocessing.Pool(self.processes, _init_worker, (self.__pid, self.__best))
+        except (AssertionError, OSError):
+            # Daemonic processes can not have children
+            self.__best = None
+            return False
+        return True
+
+    def __load(self, board):
+        """
+        Load the search state from a board
+
+        :param board:   GameBoard, current state of the game
+        """
+        bits = from_board(board)
+        workers = board.find_workers()
+        players = [board.get_player_id(x, y) for x, y in workers]
+        opponent = next((p for p in players if p != self.__pid), None)
+        positions = [CELL_INDEX[(x, y)] for x, y in workers]
+        owners = [0 if p == self.__pid else 1 for p in players]
+        keys = [player_keys(self.__pid), player_keys(opponent)]
+
+        # Boards that keep their own Zobrist key computed it the same way
+        hash_key = getattr(board, 'hash_key', None)
+        if hash_key is not None:
+            key = hash_key()
+        else:
+            key = heights_key(bits.heights)
+            for index, owner in zip(positions, owners):
+                key ^= keys[owner][index]
+
+        self.__restore((bits.heights, positions, owners, opponent, key))
+
+    def __state(self):
+        """
+        Search state to hand to a search process
+
+        :return:    (heights, worker positions, worker owners, opponent ID, Zobrist key)
+        """
+        return self.__bits.heights, list(self.__positions), list(self.__owners), self.__opponent, self.__key
+
+    def __restore(self, state):
+        """
+        Restore the search state
+
+        :param state:   (heights, worker positions, worker owners, opponent ID, Zobrist key)
+        """
+        heights, positions, owners, opponent, key = state
+        self.__bits = BitBoard(heights, sum(BIT[index] for index in positions))
+        self.__positions = list(positions)
+        self.__owners = list(owners)
+        self.__opponent = opponent
+        self.__worker_keys = [player_keys(self.__pid), player_keys(opponent)]
+        self.__key = key
+
+    def __negamax(self, depth, alpha, beta, side, ply):
+        """
+        Score the position for the side to act, searching depth more turns
+
+        :param depth:   Turns left to search
+        :param alpha:   Score the side to act is already sure of
+        :param beta:    Score the other side is already sure of
+        :param side:    Side to act, 0 for this player and 1 for the opponent
+        :param ply:     Turns searched so far
+        :return:        Score of the position for the side to act
+        """
+        self.nodes += 1
+        if not self.nodes % CLOCK_INTERVAL and time.monotonic() > self.__deadline:
+            raise OutOfTime()
+
+        key = self.__key ^ SIDE_KEYS[side]
+        entry = self.__table.get(key)
+        hint = None
+        if entry is not None:
+            entry_depth, entry_value, bound, hint = entry
+            if entry_depth >= depth:
+                value = from_table(entry_value, ply)
+                if bound == EXACT or (bound == LOWER and value >= beta) or (bound == UPPER and value <= alpha):
+                    return value
+
+        if depth == 0:
+            return self.__evaluate(side, ply)
+
+        original_alpha = alpha
+        best_value = -INFINITY
+        best_turn = None
+        positions = self.__positions
+
+        for slot, destination in self.__ordered_moves(side, hint):
+            origin = positions[slot]
+            self.__move(slot, origin, destination)
+
+            winner = self.__winner()
+            if winner is not None:
+                value = WIN - ply if winner == side else ply - WIN
+                if value > best_value:
+                    best_value, best_turn = value, (origin, destination, None)
+                alpha = max(alpha, value)
+            else:
+                for build in self.__ordered_builds(origin, destination, hint):
+                    self.__build(build)
+                    winner = self.__winner()
+                    if winner is not None:
+                        value = WIN - ply if winner == side else ply - WIN
+                    else:
+                        value = -self.__negamax(depth - 1, -beta, -alpha, 1 - side, ply + 1)
+                    self.__unbuild(build)
+
+                    if value > best_value:
+                        best_value, best_turn = value, (origin, destination, build)
+                    if value > alpha:
+                        alpha = value
+                    if alpha >= beta:
+                        break
+
+            self.__move(slot, destination, origin)
+            if alpha >= beta:
+                break
+
+        # A player without any move loses
+        if best_turn is None:
+            best_value = ply - WIN
+
+        if best_value <= original_alpha:
+            bound = UPPER
+        elif best_value >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        if len(self.__table) >= TABLE_SIZE:
+            self.__table.clear()
+        self.__table[key] = (depth, to_table(best_value, ply), bound, best_turn)
+        return best_value
+
+    def __ordered_moves(self, side, hint):
+        """
+        Moves of the side's workers, the remembered best turn's move first and then the highest
+        destinations first, since climbing is what wins games
+
+        :param side:    Side to act
+        :param hint:    (origin, destination, build) best turn of an earlier search of the position, or None
+        :return:        List of (worker slot, destination bit index)
+        """
+        bits = self.__bits
+        heights = bits.heights
+        moves = []
+        for slot, origin in enumerate(self.__positions):
+            if self.__owners[slot] != side:
+                continue
+            targets = bits.move_targets(origin)
+            while targets:
+                low = targets & -targets
+                destination = low.bit_length() - 1
+                targets ^= low
+                first = hint is not None and hint[0] == origin and hint[1] == destination
+                moves.append((not first, -heights[destination], slot, destination))
+        moves.sort()
+        return [(slot, destination) for _, _, slot, destination in moves]
+
+    def __ordered_builds(self, origin, destination, hint):
+        """
+        Builds of the worker that just moved, the remembered best turn's build first
+
+        :param origin:      Bit index the worker moved from
+        :param destination: Bit index the worker moved to
+        :param hint:        (origin, destination, build) best turn of an earlier search of the position, or None
+        :return:            List of bit indices to build on
+        """
+        targets = self.__bits.build_targets(destination)
+        builds = []
+        while targets:
+            low = targets & -targets
+            builds.append(low.bit_length() - 1)
+            targets ^= low
+        if hint is not None and hint[0] == origin and hint[1] == destination and hint[2] in builds:
+            builds.remove(hint[2])
+            builds.insert(0, hint[2])
+        return builds
+
+    def __move(self, slot, origin, destination):
+        """
+        Move a worker, keeping the position key up to date, move it back to undo
+
+        :param slot:        Slot of the worker
+        :param origin:      Bit index of the worker's cell
+        :param destination: Bit index of the cell to move to
+        """
+        keys = self.__worker_keys[self.__owners[slot]]
+        self.__key ^= keys[origin] ^ keys[destination]
+        self.__positions[slot] = destination
+        self.__bits.move_worker(origin, destination)
+
+    def __build(self, index):
+        """
+        Build a floor, keeping the position key up to date
+
+        :param index:   Bit index of the cell to build on
+        """
+        height = self.__bits.heights[index]
+        self.__key ^= HEIGHT_KEYS[index][height] ^ HEIGHT_KEYS[index][height + 1]
+        self.__bits.build_floor(index)
+
+    def __unbuild(self, index):
+        """
+        Remove a floor, undoing __build
+
+        :param index:   Bit index of the cell to remove from
+        """
+        self.__bits.remove_floor(index)
+        height = self.__bits.heights[index]
+        self.__key ^= HEIGHT_KEYS[index][height] ^ HEIGHT_KEYS[index][height + 1]
+
+    def __winner(self):
+        """
+        Side that won the game, checking workers in board order like RuleChecker.check_game_over
+
+        :return:    Side of the winner, None if the game goes on
+        """
+        bits = self.__bits
+        heights = bits.heights
+        for slot, index in enumerate(self.__positions):
+            if heights[index] == 3:
+                return self.__owners[slot]
+            if not bits.move_targets(index):
+                return 1 - self.__owners[slot]
+        return None
+
+    def __evaluate(self, side, ply):
+        """
+        Score a position the search stops at for the side to act
+
+        :param side:    Side to act
+        :param ply:     Turns searched so far
+        :return:        Score of the position for the side to act
+        """
+        bits = self.__bits
+        heights = bits.heights
+        third_floors = bits.at_most(3) & ~bits.at_most(2)
+        score = 0
+        for slot, index in enumerate(self.__positions):
+            height = heights[index]
+            targets = bits.move_targets(index)
+            # The side to act can step onto a free third floor right away
+            if height == 2 and targets & third_floors:
+                if self.__owners[slot] == side:
+                    return WIN - ply
+                worker_score = THREAT_SCORE
+            else:
+                worker_score = 0
+
+            worker_score += HEIGHT_SCORE[height] + MOBILITY_SCORE * bin(targets).count("1") \
+                + CLIMB_SCORE * bin(targets & ~bits.at_most(height)).count("1")
+            score += worker_score if self.__owners[slot] == side else -worker_score
+        return score
+
+
+def _init_worker(pid, best):
+    """
+    Set up a search process
+
+    :param pid:     String identifing the searching player
+    :param best:    Shared [score, index, generation] of the best root turn
+    """
+    global _WORKER_STRATEGY, _WORKER_BEST
+    _WORKER_STRATEGY = Strategy(pid)
+    _WORKER_BEST = best
+
+
+def _search_root_turn(task):
+    """
+    Score a root turn in a search process, with the best score shared so far as its bound
+
+    :param task:    (state, turn, depth, index, deadline, generation), search state of the root,
+                    (origin, destination, build) root turn, turns to search with the root turn
+                    included, index of the turn in search order, clock time the search has to be
+                    done by and generation of the root search
+    :return:        (score, nodes searched), the score is None if the search ran out of time
+    """
+    state, turn, depth, index, deadline, generation = task
+    strategy = _WORKER_STRATEGY
+    best = _WORKER_BEST
+    with best.get_lock():
+        score, best_index = best[0], best[1]
+    # A turn tried before the best one takes its place on a tie, so it has to tell a tie from worse
+    alpha = score - 1 if index < best_index else score
+
+    strategy.nodes = 0
+    try:
+        score = strategy.search_root_turn(state, turn, depth, alpha, deadline)
+    except OutOfTime:
+        return None, strategy.nodes
+    _update_best(best, index, score, alpha, generation)
+    return score, strategy.nodes
+
+
+def _update_best(best, index, score, alpha, generation):
+    """
+    Share a root turn's score if it beats the best one so far, ties going to the turn tried first
+
+    :param best:        Shared [score, index, generation] of the best root turn
+    :param index:       Index of the turn in search order
+    :param score:       Score of the turn
+    :param alpha:       Bound the turn was searched with, scores at or below it are not exact
+    :param generation:  Generation of the root search the turn belongs to
+    """
+    if score <= alpha:
+        return
+    with best.get_lock():
+        # The turn belongs to an earlier root search, whose turn indexes no longer apply
+        if best[2] != generation:
+            return
+        if score > best[0] or (score == best[0] and index < best[1]):
+            best[0], best[1] = score, index
+
+
+def to_table(value, ply):
+    """
+    Score to remember in the transposition table, wins and losses counted from the position
+    instead of from the root so they stay right wherever the position is found again
+
+    :param value:   Score found at ply
+    :param ply:     Turns from the root to the position
+    :return:        Score to remember
+    """
+    if value >= WIN_BOUND:
+        return value + ply
+    if value <= -WIN_BOUND:
+        return value - ply
+    return value
+
+
+def from_table(value, ply):
+    """
+    Score remembered in the transposition table, as seen from the root, undoing to_table
+
+    :param value:   Remembered score
+    :param ply:     Turns from the root to the position
+    :return:        Score at ply
+    """
+    if value >= WIN_BOUND:
+        return value - ply
+    if value <= -WIN_BOUND:
+        return value + ply
+    return value
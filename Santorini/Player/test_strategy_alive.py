@@ -1,9 +1,21 @@
 # This file implements the strategy spec'd out for assignment 8
+import time
+
 from Common.command_handler import Cmd_Handler
+from Common.exception import OutOfTime
 from Lib.stack_board import StackBoard
 from Admin.rule_checker import RuleChecker
 from Lib.util import gen_builds, gen_moves
 
+# States searched between two looks at the clock
+CLOCK_INTERVAL = 64
+
+# Deepest look ahead decide_build_within tries by default
+DEFAULT_MAX_LOOK_AHEAD = 8
+
+# Seconds a turn's decision may take by default, well inside the Referee's time limit
+DEFAULT_TIME_BUDGET = 1.0
+
 
 class Strategy:
     """
@@ -33,6 +45,13 @@ class Strategy:
         self.__opponent = None
         self.look_ahead = 0
 
+        # Number of states searched at every look ahead decide_build_within completed
+        self.nodes_per_look_ahead = {}  # type: Dict[int, int]
+        # States searched by the current look ahead
+        self.__nodes = 0  # type: int
+        # Clock time the current search has to be done by
+        self.__deadline = float('inf')  # type: float
+
         self.__state = None
 
         if init:
@@ -103,6 +122,7 @@ class Strategy:
             return True
 
         for move in gen_moves(player, self.__state.board, self.checker):
+            self.__tick()
             self.__state.push(move)
             winner = self.checker.check_game_over(self.__pid, self.__opponent)
             if winner == self.__opponent:
@@ -125,6 +145,7 @@ class Strategy:
             return True
 
         for build in gen_builds(player, worker, self.__state.board, self.checker):
+            self.__tick()
             self.__state.push(build)
             winner = self.checker.check_game_over(self.__pid, self.__opponent)
             if winner == self.__opponent:
@@ -134,6 +155,14 @@ class Strategy:
             self.__state.pop()
         return True
 
+    def __tick(self):
+        """
+        Count a searched state, giving up the search if its deadline has passed
+        """
+        self.__nodes += 1
+        if not self.__nodes % CLOCK_INTERVAL and time.monotonic() > self.__deadline:
+            raise OutOfTime()
+
     def get_opponent(self):
         """ Gets the player that does not belong to this strategy"""
         for cell in self.__state.board.find_workers():
@@ -161,4 +190,63 @@ class Strategy:
         if winner == self.__opponent:
                 return False
         alive = self.check_move_states(current_player, 1)
-        return alive
\ No newline at end of file
+        return alive
+
+    def decide_build_within(self, action, time_budget, max_look_ahead=DEFAULT_MAX_LOOK_AHEAD):
+        """
+        Decide whether the player stays alive after the build like decide_build, looking
+        ahead one more turn at a time until the time budget is spent, and answer with the
+        deepest look ahead that completed. The number of states searched at every
+        completed look ahead is kept in nodes_per_look_ahead.
+
+        :param action:          JSON that represents a build action
+        :param time_budget:     Seconds the decision may take
+        :param max_look_ahead:  Deepest look ahead to try
+        :return:                Whether the player stays alive at the deepest completed look ahead
+        """
+        start = time.monotonic()
+        look_ahead = self.look_ahead
+        mark = self.__state.size()
+        self.nodes_per_look_ahead = {}
+
+        # The first look ahead only checks the build itself and always completes
+        self.__deadline = float('inf')
+        alive = None
+        try:
+            for depth in range(1, max_look_ahead + 1):
+                self.look_ahead = depth
+                self.__nodes = 0
+                try:
+                    alive = self.decide_build(action)
+                finally:
+                    # decide_build leaves its actions on the stack
+                    self.__state.unwind(mark)
+                self.nodes_per_look_ahead[depth] = self.__nodes
+                self.__deadline = start + time_budget
+                # A way to lose is still there when looking further ahead
+                if not alive:
+                    break
+        except OutOfTime:
+            pass
+        finally:
+            self.look_ahead = look_ahead
+            self.__deadline = float('inf')
+        return alive
+
+    def decide_turn_within(self, move, build, time_budget, max_look_ahead=DEFAULT_MAX_LOOK_AHEAD):
+        """
+        Decide whether the player stays alive after the given move and build like
+        decide_build_within, leaving the board as it was before the move.
+
+        :param move:            JSON that represents a move action
+        :param build:           JSON that represents a build action of the moved worker
+        :param time_budget:     Seconds the decision may take
+        :param max_look_ahead:  Deepest look ahead to try
+        :return:                Whether the player stays alive at the deepest completed look ahead
+        """
+        mark = self.__state.size()
+        self.__state.push(move)
+        try:
+            return self.decide_build_within(build, time_budget, max_look_ahead)
+        finally:
+            self.__state.unwind(mark)
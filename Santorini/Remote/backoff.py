@@ -0,0 +1,56 @@
+"""
+Delays between attempts to reach a server that is not up yet. Delays grow
+exponentially up to a maximum, and each one is drawn at random below its bound
+("full jitter") so that many clients started together do not retry in lockstep.
+"""
+import random
+
+
+# Bound of the first delay in seconds
+DEFAULT_INITIAL_DELAY = 0.05
+
+# Largest bound of a delay in seconds
+DEFAULT_MAX_DELAY = 2.0
+
+# Factor the bound grows by after every attempt
+DEFAULT_FACTOR = 2.0
+
+
+class Backoff:
+    """
+    Exponential backoff with full jitter. Iterating over it gives the delay to wait
+    before every retry, without end.
+    """
+
+    def __init__(self, initial_delay=DEFAULT_INITIAL_DELAY, max_delay=DEFAULT_MAX_DELAY,
+                 factor=DEFAULT_FACTOR, jitter=True, rng=None):
+        """
+        Initialize Backoff.
+
+        :param initial_delay: float, bound of the first delay in seconds
+        :param max_delay: float, largest bound of a delay in seconds
+        :param factor: float, factor the bound grows by after every attempt
+        :param jitter: bool, draw every delay at random below its bound, wait the bound itself otherwise
+        :param rng: random.Random, source of the jitter, the random module if None
+        :raise ValueError: if a delay is negative or the factor is below 1
+        """
+        if initial_delay < 0 or max_delay < 0 or factor < 1:
+            raise ValueError("Delays must not be negative and the factor must be at least 1")
+
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.factor = factor
+        self.jitter = jitter
+        self.__rng = rng if rng is not None else random
+
+
+    def __iter__(self):
+        """
+        Delays to wait before every retry.
+
+        :return: generator of float, delays in seconds
+        """
+        bound = min(self.initial_delay, self.max_delay)
+        while True:
+            yield self.__rng.uniform(0, bound) if self.jitter else bound
+            bound = min(bound * self.factor, self.max_delay)
@@ -0,0 +1,180 @@
+"""
+Binary encoding of the Remote protocol's board and turn messages, for connections
+that negotiated Remote.framing.BINARY at sign-up. Binary messages are sent in
+length-prefixed frames and start with a tag byte below any byte JSON text starts
+with, so they can be told apart from the JSON messages sent next to them:
+
+    board:  TAG_BOARD, then one cell byte per cell, row by row
+    delta:  TAG_DELTA, the CRC32 checksum as a 4-byte big-endian integer, then the
+            index (y * 6 + x) and cell byte of every changed cell
+    turn:   TAG_TURN, the worker's index in WORKER_IDS, then one direction byte for
+            the move and one for the build
+
+A cell byte holds the height in its lowest three bits, OCCUPIED if a worker stands on
+the cell, OPPONENT if the worker is not the receiving player's and SECOND_WORKER if it
+is the player's second worker. Players are told apart relative to the player the board
+is sent to, so no names have to be sent. A direction byte is the index of the
+east-west direction in EAST_WEST times 3 plus the index of the north-south direction
+in NORTH_SOUTH.
+
+Every decoded message is the JSON message it stands for, so handlers work the same
+whatever the encoding.
+"""
+import struct
+
+from Admin.constants import WORKER_ONE_ID, WORKER_TWO_ID
+from Remote.board_delta import BOARD_DELTA_MESSAGE
+
+# Tag bytes of binary messages
+TAG_BOARD = 1
+TAG_DELTA = 2
+TAG_TURN = 3
+
+# Height bits and worker flags of a cell byte
+HEIGHT_MASK = 0b111
+OCCUPIED = 0b1000
+OPPONENT = 0b10000
+SECOND_WORKER = 0b100000
+
+# Worker ids, by their index
+WORKER_IDS = (WORKER_ONE_ID, WORKER_TWO_ID)
+
+# Directions, by their index
+EAST_WEST = ("WEST", "PUT", "EAST")
+NORTH_SOUTH = ("NORTH", "PUT", "SOUTH")
+
+# Checksum of a board delta
+CHECKSUM = struct.Struct(">I")
+
+# Cells on a board
+CELLS = 36
+
+
+def is_binary(payload):
+    """
+    Check if a received payload is a binary message rather than JSON text.
+
+    :param payload: bytes, payload of a length-prefixed frame
+    :return: bool, True if it is a binary message
+    """
+    return len(payload) > 0 and payload[0] in (TAG_BOARD, TAG_DELTA, TAG_TURN)
+
+
+def encode_cell(el, player_id):
+    """
+    Encode a Cell specification.
+
+    :param el: Cell, height, or height followed by player id and worker id
+    :param player_id: string, id of the player the cell is sent to
+    :return: int, cell byte
+    :raise ValueError: if the height or worker id can not be encoded
+    """
+    if isinstance(el, int):
+        height, worker = el, 0
+    else:
+        height, pid, wid = int(el[0]), el[1:-1], el[-1]
+        if wid not in WORKER_IDS:
+            raise ValueError("Unknown worker id: {}".format(wid))
+        worker = OCCUPIED | (0 if pid == player_id else OPPONENT) | (SECOND_WORKER if wid == WORKER_TWO_ID else 0)
+
+    if not 0 <= height <= HEIGHT_MASK:
+        raise ValueError("Height out of range: {}".format(height))
+    return height | worker
+
+
+def decode_cell(byte, player_id, opponent_id):
+    """
+    Decode a cell byte into a Cell specification.
+
+    :param byte: int, cell byte
+    :param player_id: string, id of the player the cell was sent to
+    :param opponent_id: string, id of its opponent
+    :return: Cell, height, or height followed by player id and worker id
+    """
+    height = byte & HEIGHT_MASK
+    if not byte & OCCUPIED:
+        return height
+    pid = opponent_id if byte & OPPONENT else player_id
+    wid = WORKER_TWO_ID if byte & SECOND_WORKER else WORKER_ONE_ID
+    return "{}{}{}".format(height, pid, wid)
+
+
+def encode_board(board, player_id):
+    """
+    Encode a Board specification.
+
+    :param board: Board, board specification, as made by Lib.util.xboard
+    :param player_id: string, id of the player the board is sent to
+    :return: bytes, board message
+    """
+    return bytes([TAG_BOARD] + [encode_cell(el, player_id) for row in board for el in row])
+
+
+def encode_delta(message, player_id):
+    """
+    Encode a board delta message.
+
+    :param message: ["board-delta", [[x, y, Cell], ...], int], board delta message
+    :param player_id: string, id of the player the delta is sent to
+    :return: bytes, delta message
+    """
+    changes = bytearray()
+    for x, y, el in message[1]:
+        changes += bytes([y * 6 + x, encode_cell(el, player_id)])
+    return bytes([TAG_DELTA]) + CHECKSUM.pack(message[2]) + bytes(changes)
+
+
+def encode_turn(turn):
+    """
+    Encode a turn action.
+
+    :param turn: [string, EastWest, NorthSouth, EastWest, NorthSouth], worker and directions
+    :return: bytes, turn message
+    :raise ValueError: if the worker id or a direction is unknown
+    """
+    wid, move_ew, move_ns, build_ew, build_ns = turn
+    return bytes([TAG_TURN, WORKER_IDS.index(wid),
+                  _direction_byte(move_ew, move_ns), _direction_byte(build_ew, build_ns)])
+
+
+def decode(payload, player_id=None, opponent_id=None):
+    """
+    Decode a binary message into the JSON message it stands for.
+
+    :param payload: bytes, binary message
+    :param player_id: string, id of the player boards were sent to
+    :param opponent_id: string, id of its opponent
+    :return: Board | ["board-delta", [[x, y, Cell], ...], int] | [string, EastWest, NorthSouth, EastWest, NorthSouth]
+    :raise ValueError: if the payload is not a valid binary message
+    """
+    tag = payload[0] if payload else None
+    if tag == TAG_BOARD and len(payload) == CELLS + 1:
+        cells = [decode_cell(byte, player_id, opponent_id) for byte in payload[1:]]
+        return [cells[y * 6:y * 6 + 6] for y in range(6)]
+
+    if tag == TAG_DELTA and len(payload) >= CHECKSUM.size + 1 and (len(payload) - CHECKSUM.size - 1) % 2 == 0:
+        checksum, = CHECKSUM.unpack_from(payload, 1)
+        changes = payload[CHECKSUM.size + 1:]
+        if any(index >= CELLS for index in changes[::2]):
+            raise ValueError("Cell out of range in binary board delta")
+        return [BOARD_DELTA_MESSAGE, [[index % 6, index // 6, decode_cell(byte, player_id, opponent_id)]
+                                      for index, byte in zip(changes[::2], changes[1::2])], checksum]
+
+    if tag == TAG_TURN and len(payload) == 4 and payload[1] < len(WORKER_IDS) \
+            and payload[2] < 9 and payload[3] < 9:
+        return [WORKER_IDS[payload[1]], EAST_WEST[payload[2] // 3], NORTH_SOUTH[payload[2] % 3],
+                EAST_WEST[payload[3] // 3], NORTH_SOUTH[payload[3] % 3]]
+
+    raise ValueError("Invalid binary message")
+
+
+def _direction_byte(east_west, north_south):
+    """
+    Encode the directions of a move or build.
+
+    :param east_west: EastWest, east or west
+    :param north_south: NorthSouth, north or south
+    :return: int, direction byte
+    :raise ValueError: if a direction is unknown
+    """
+    return EAST_WEST.index(east_west) * 3 + NORTH_SOUTH.index(north_south)
@@ -0,0 +1,77 @@
+"""
+Board deltas for the Remote protocol. A connection that negotiated BOARD_DELTA at
+sign-up is sent the full Board specification on the first turn of every game and
+["board-delta", [[x, y, Cell], ...], checksum] on the turns after it: the cells that
+changed since the last board the player was sent, and the CRC32 checksum of the
+board they lead to.
+
+A player that has no board to apply the delta to, or whose board does not match the
+checksum after applying it, answers RESEND_BOARD instead of its turn. The server then
+sends the full board and waits for the turn again.
+"""
+import json
+import zlib
+
+
+# Qualifier of a board delta message
+BOARD_DELTA_MESSAGE = "board-delta"
+
+# Answer of a player that could not apply a board delta
+RESEND_BOARD = ["resend-board"]
+
+
+def checksum(board):
+    """
+    Checksum of a Board specification, the CRC32 of its compact JSON text.
+
+    :param board: Board, board specification
+    :return: int, checksum
+    """
+    return zlib.crc32(json.dumps(board, separators=(",", ":")).encode())
+
+
+def delta_message(previous, board):
+    """
+    Board delta message leading from one Board specification to another.
+
+    :param previous: Board, board specification the player has
+    :param board: Board, board specification to send
+    :return: ["board-delta", [[x, y, Cell], ...], int], board delta message
+    """
+    changes = [[x, y, el] for y, row in enumerate(board) for x, el in enumerate(row) if el != previous[y][x]]
+    return [BOARD_DELTA_MESSAGE, changes, checksum(board)]
+
+
+def is_delta_message(value):
+    """
+    Check if given value is a board delta message.
+
+    :param value: Any, value to check
+    :return: bool, True if value is a board delta message, False otherwise
+    """
+    return (isinstance(value, list) and len(value) == 3 and value[0] == BOARD_DELTA_MESSAGE
+            and isinstance(value[1], list) and isinstance(value[2], int))
+
+
+def apply_delta(previous, message):
+    """
+    Apply a board delta message to a Board specification.
+
+    :param previous: Board | None, board specification the player has, None if it has none
+    :param message: ["board-delta", [[x, y, Cell], ...], int], board delta message
+    :return: Board | None, the new board specification, None if it can not be applied or
+             does not match the checksum
+    """
+    if previous is None:
+        return None
+
+    board = [list(row) for row in previous]
+    for change in message[1]:
+        if not (isinstance(change, list) and len(change) == 3):
+            return None
+        x, y, el = change
+        if not (isinstance(x, int) and isinstance(y, int) and 0 <= x < 6 and 0 <= y < 6):
+            return None
+        board[y][x] = el
+
+    return board if checksum(board) == message[2] else None
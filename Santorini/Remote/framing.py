@@ -0,0 +1,289 @@
+"""
+Message framing for the Remote protocol. Messages are JSON values written back
+to back on a TCP stream, so a single recv can hold part of a message or several
+of them. MessageDecoder buffers what it is fed and hands out every complete
+message, whatever the segment boundaries were.
+
+A client may ask for features at sign-up, length-prefixed framing, board deltas
+(see Remote.board_delta) or binary boards and turns (see Remote.binary_codec), by signing up with ["sign-up", name, [feature, ...]]
+instead of its bare name. The server answers with ["features", [feature, ...]],
+the requested features it supports, and both sides switch to them right after.
+Clients signing up with their bare name keep the plain JSON stream and full boards.
+"""
+import codecs
+import json
+import re
+import struct
+from collections import deque
+
+from Remote.binary_codec import is_binary
+
+
+# Back to back JSON values, the framing every connection starts with
+JSON_STREAM = "json-stream"
+
+# Every message is preceded by its byte length as a 4-byte big-endian integer
+LENGTH_PREFIX = "length-prefix"
+
+# Turns after the first of a game send the cells that changed instead of the full board
+BOARD_DELTA = "board-delta"
+
+# Boards and turns are sent as binary messages, in length-prefixed frames
+BINARY = "binary"
+
+# Features a connection can negotiate at sign-up
+SUPPORTED_FEATURES = [LENGTH_PREFIX, BOARD_DELTA, BINARY]
+
+# Bytes to read from a socket at a time
+BUFFER_SIZE = 65536
+
+# Header of a length-prefixed message
+LENGTH_HEADER = struct.Struct(">I")
+
+# Decodes one JSON value from a position in a string
+JSON_DECODER = json.JSONDecoder()
+
+# Whitespace between JSON values
+WHITESPACE = re.compile(r"\s*")
+
+# Characters a JSON number is made of
+NUMBER = re.compile(r"[-+0-9.eE]*")
+
+# Literals the JSON decoder accepts, a message can end part way through one
+LITERALS = ["true", "false", "null", "NaN", "Infinity", "-Infinity"]
+
+
+class MessageDecoder:
+    """
+    Streaming decoder turning the bytes received on a connection into messages.
+    """
+
+    def __init__(self, framing=JSON_STREAM):
+        """
+        Initializes an empty MessageDecoder
+
+        :param framing: string, framing of the received bytes, JSON_STREAM or LENGTH_PREFIX
+        """
+        # Framing of the received bytes
+        self.__framing = framing  # type: str
+        # Decoded text not yet parsed into a message, in JSON_STREAM framing
+        self.__text = ""  # type: str
+        # Bytes not yet parsed into a message, in LENGTH_PREFIX framing
+        self.__bytes = bytearray()  # type: bytearray
+        # Decodes UTF-8 across reads that split a character
+        self.__utf8 = codecs.getincrementaldecoder("utf-8")()
+        # Complete messages in the order they were received
+        self.__messages = deque()  # type: Deque[Any]
+
+
+    @property
+    def framing(self):
+        """
+        Framing of the bytes this decoder is fed.
+
+        :return: string, JSON_STREAM or LENGTH_PREFIX
+        """
+        return self.__framing
+
+
+    @framing.setter
+    def framing(self, framing):
+        """
+        Switch framing, bytes already fed and not yet parsed are read in the new framing.
+
+        :param framing: string, JSON_STREAM or LENGTH_PREFIX
+        """
+        if framing == self.__framing:
+            return
+
+        pending = bytes(self.__bytes) + self.__text.encode() + self.__utf8.getstate()[0]
+        self.__bytes = bytearray()
+        self.__text = ""
+        self.__utf8.reset()
+        self.__framing = framing
+        self.feed(pending)
+
+
+    def __len__(self):
+        """
+        Number of complete messages waiting to be popped. Messages are parsed one
+        at a time as they are asked for, so bytes received after a message can
+        still be read in another framing once it is popped.
+
+        :return: int, number of messages
+        :raise ValueError: if the received bytes are not valid JSON
+        """
+        if not self.__messages:
+            self.__parse_next()
+        return len(self.__messages)
+
+
+    def feed(self, data):
+        """
+        Add received bytes.
+
+        :param data: bytes, bytes received from the connection
+        """
+        if self.__framing == LENGTH_PREFIX:
+            self.__bytes += data
+        else:
+            self.__text += self.__utf8.decode(data)
+
+
+    def pop(self):
+        """
+        Remove and return the oldest complete message.
+
+        :return: Any, JSON loaded message, or bytes of a binary message
+        :raise IndexError: if no message is complete
+        :raise ValueError: if the received bytes are not valid JSON
+        """
+        if not self.__messages:
+            self.__parse_next()
+        return self.__messages.popleft()
+
+
+    def __parse_next(self):
+        """
+        Parse the next message from the buffer if it is complete.
+        """
+        if self.__framing == LENGTH_PREFIX:
+            self.__parse_length_prefixed()
+        else:
+            self.__parse_stream()
+
+
+    def __parse_length_prefixed(self):
+        """
+        Parse the next length-prefixed message from the buffered bytes.
+        """
+        if len(self.__bytes) < LENGTH_HEADER.size:
+            return
+        length, = LENGTH_HEADER.unpack_from(self.__bytes)
+        end = LENGTH_HEADER.size + length
+        if len(self.__bytes) < end:
+            return
+
+        payload = bytes(self.__bytes[LENGTH_HEADER.size:end])
+        del self.__bytes[:end]
+        # Binary messages are handed out undecoded
+        self.__messages.append(payload if is_binary(payload) else json.loads(payload.decode()))
+
+
+    def __parse_stream(self):
+        """
+        Parse the next JSON value from the buffered text. A number at the end of
+        the text is kept, more digits of it may still arrive.
+        """
+        text = self.__text
+        position = WHITESPACE.match(text).end()
+        if position == len(text) or NUMBER.match(text, position).end() == len(text):
+            self.__text = text[position:]
+            return
+
+        try:
+            message, end = JSON_DECODER.raw_decode(text, position)
+        except json.JSONDecodeError as e:
+            if self.__is_incomplete(e):
+                self.__text = text[position:]
+                return
+            self.__text = ""
+            raise ValueError("Invalid JSON message: {}".format(e)) from e
+
+        self.__messages.append(message)
+        self.__text = text[end:]
+
+
+    def __is_incomplete(self, error):
+        """
+        Does the decoding error come from the text ending part way through a value?
+
+        :param error: JSONDecodeError, error decoding the buffered text
+        :return: bool, True if more text may complete the value, False if it is invalid
+        """
+        rest = error.doc[error.pos:]
+        return (error.msg.startswith("Unterminated string")
+                or (error.msg.startswith("Invalid \\uXXXX escape") and len(rest) < 6)
+                or NUMBER.fullmatch(rest) is not None
+                or any(literal.startswith(rest) for literal in LITERALS))
+
+
+def encode(message, framing=JSON_STREAM):
+    """
+    Encode a message to send in the given framing.
+
+    :param message: Any, value that can be JSONified, or bytes of a binary message
+    :param framing: string, JSON_STREAM or LENGTH_PREFIX
+    :return: bytes, framed message
+    """
+    if isinstance(message, bytes):
+        return frame(message, framing)
+    return frame(json.dumps(message).encode(), framing)
+
+
+def frame(payload, framing=JSON_STREAM):
+    """
+    Frame an encoded JSON message.
+
+    :param payload: bytes, UTF-8 encoded JSON text
+    :param framing: string, JSON_STREAM or LENGTH_PREFIX
+    :return: bytes, framed message
+    """
+    if framing == LENGTH_PREFIX:
+        return LENGTH_HEADER.pack(len(payload)) + payload
+    return payload
+
+
+def receive(connection, decoder, buffer_size=BUFFER_SIZE):
+    """
+    Receive the next message on a connection, reading until one is complete.
+
+    :param connection: socket, connection to read from
+    :param decoder: MessageDecoder, decoder of the connection
+    :param buffer_size: int, bytes to read at a time
+    :return: Any, JSON loaded message, or bytes of a binary message
+    :raise EOFError: if the connection closes before a message is complete
+    :raise ValueError: if the connection sends invalid JSON
+    """
+    while not decoder:
+        data = connection.recv(buffer_size)
+        if not data:
+            raise EOFError("Connection closed")
+        decoder.feed(data)
+    return decoder.pop()
+
+
+def framing_of(features):
+    """
+    Framing to use once the given features are negotiated.
+
+    :param features: [string, ...], negotiated features
+    :return: string, JSON_STREAM or LENGTH_PREFIX
+    """
+    return LENGTH_PREFIX if LENGTH_PREFIX in features or BINARY in features else JSON_STREAM
+
+
+def sign_up_message(name, features):
+    """
+    Sign-up message of a client, its bare name unless it asks for features.
+
+    :param name: string, name of the player
+    :param features: [string, ...], features to ask for
+    :return: Any, sign-up message
+    """
+    if not features:
+        return name
+    return ["sign-up", name, list(features)]
+
+
+def read_sign_up(message):
+    """
+    Read the name and requested features of a client's sign-up message.
+
+    :param message: Any, first message of the client
+    :return: (Any, [string, ...] or None), name and the features to accept, None for a bare name
+    """
+    if (isinstance(message, list) and len(message) == 3 and message[0] == "sign-up"
+            and isinstance(message[2], list)):
+        return message[1], [f for f in message[2] if f in SUPPORTED_FEATURES]
+    return message, None
@@ -9,23 +9,41 @@ import json
 import sys
 from threading import Thread
 
+from Remote.backoff import Backoff
+from Remote.framing import BUFFER_SIZE, JSON_STREAM, MessageDecoder, frame, framing_of, receive, sign_up_message
+
 class Relay:
     """ Proxy to connect to a remote server through TCP. """
 
-    def __init__(self, ip, port, buffer_size = 1024):
+    def __init__(self, ip, port, buffer_size = BUFFER_SIZE, features = (), backoff = None, connect_deadline = None):
         """
         Initialize Proxy and connect to IP address at given port automatically.
 
         :param ip: string, IP address to connect to
         :param port: int, port number
         :param buffer_size: int, byte size for data transfer
+        :param features: [string, ...], features to ask the server for at sign-up
+        :param backoff: Backoff, delays between attempts to connect, a default Backoff if None
+        :param connect_deadline: float, seconds to keep trying to connect for, None to try forever
         """
         self.ip = ip
         self.port = port
         self.buffer_size = buffer_size
+        self.features = list(features)
+        self.backoff = backoff if backoff is not None else Backoff()
+        self.connect_deadline = connect_deadline
+
+        # Attempts and seconds the last connection took, None before the first one
+        self.connect_attempts = None  # type: Optional[int]
+        self.connect_time = None  # type: Optional[float]
 
         self.__live = False
 
+        # Framing of the messages in both directions
+        self.__framing = JSON_STREAM  # type: str
+        # Parses messages out of the received bytes
+        self.__decoder = MessageDecoder()  # type: MessageDecoder
+
 
     @property
     def live(self):
@@ -38,21 +56,75 @@ class Relay:
 
     
     def connect(self):
-        """ Connect to IP address at port if connection isn't live already. """
+        """
+        Connect to IP address at port if connection isn't live already, waiting
+        longer and longer between attempts while the server is not up yet.
+
+        :raise TimeoutError: if no attempt succeeds before the connect deadline
+        """
         if self.__live:
             return
 
-        self.__socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        start = time.monotonic()
+        deadline = None if self.connect_deadline is None else start + self.connect_deadline
+        attempts = 0
+        delays = iter(self.backoff)
+
+        while True:
+            remaining = self.__remaining(deadline)
+            if remaining == 0:
+                raise TimeoutError("Could not connect to {}:{} in {} attempts".format(self.ip, self.port, attempts))
+
+            attempts += 1
+            try:
+                self.__socket = socket.create_connection((self.ip, self.port), timeout=remaining)
+                break
+            # If server is not live yet, wait and try again
+            except (ConnectionRefusedError, socket.timeout):
+                delay = next(delays)
+                remaining = self.__remaining(deadline)
+                time.sleep(delay if remaining is None else min(delay, remaining))
+
+        # Connected sockets block without a timeout
+        self.__socket.settimeout(None)
+        # A new connection starts over with the plain JSON stream
+        self.__framing = JSON_STREAM
+        self.__decoder = MessageDecoder()
+
+        self.connect_attempts = attempts
+        self.connect_time = time.monotonic() - start
+        self.__live = True
 
-        try:
-            self.__socket.connect((self.ip, self.port))
-            
-        # If server is not live yet, wait for one second and try again
-        except ConnectionRefusedError:
-            time.sleep(1)
-            return self.connect()
 
-        self.__live = True
+    @staticmethod
+    def __remaining(deadline):
+        """
+        Seconds left until the deadline.
+
+        :param deadline: float, time.monotonic() of the deadline, None for no deadline
+        :return: float, seconds left, at least 0, None for no deadline
+        """
+        if deadline is None:
+            return None
+        return max(deadline - time.monotonic(), 0)
+
+
+    def sign_up(self, name):
+        """
+        Sign up with the server under the given name, negotiating features if any are asked for.
+
+        :param name: string, name of the player
+        :return: [string, ...], features the server accepted
+        """
+        self.send(json.dumps(sign_up_message(name, self.features)))
+        if not self.features:
+            return []
+
+        # The server answers ["features", [feature, ...]] before switching to them
+        _, accepted = self.receive()
+        self.__framing = framing_of(accepted)
+        self.__decoder.framing = self.__framing
+        return accepted
 
 
     def subscribe(self, message_handler, connection_loss_handler):
@@ -84,11 +156,11 @@ class Relay:
         """
         Send message to the socket.
 
-        :param message: string, message to send 
+        :param message: string | bytes, JSON text or binary message to send
         :return: string, message from socket
         """
         self.connect()
-        message = message.encode()
+        message = frame(message if isinstance(message, bytes) else message.encode(), self.__framing)
 
         try:
             self.__socket.sendall(message)
@@ -100,15 +172,14 @@ class Relay:
         """
         Receive message from the socket.
 
-        :return: string, message from socket
+        :return: Any, JSON loaded message, or bytes of a binary message
         """
         self.connect()
 
         try:
-            response = self.__socket.recv(self.buffer_size).decode()
-            if response == "":
-                sys.exit()
-            return json.loads(response)
+            return receive(self.__socket, self.__decoder, self.buffer_size)
+        except EOFError:
+            sys.exit()
         except ConnectionError:
             self.__live = False
 
@@ -1,15 +1,33 @@
 import json
-import copy
 from Admin.board import GameBoard
 from Admin.rule_checker import RuleChecker
+from Lib.stack_board import StackBoard
+from Remote.binary_codec import decode, encode_turn
+from Remote.board_delta import RESEND_BOARD, apply_delta, is_delta_message
+from Remote.framing import BINARY
 import sys
 import threading
 
 from pprint import pprint
 
+# Board specification of an empty board, the one a new GameBoard matches
+EMPTY_BOARD = [[0] * 6 for _ in range(6)]
+
+
 class RelayPlayer:
     """
     Proxy player decorator for a Player component.
+
+    The player keeps one GameBoard for the whole game. Every Board specification from
+    the server is compared to the previous one and only the cells that changed are
+    updated, and the move is tried out on a StackBoard before asking for the build.
+
+    Board delta messages, sent to relays that negotiated Remote.framing.BOARD_DELTA,
+    are applied to the last Board specification from the server. The full board is
+    asked for when they do not match their checksum.
+
+    Relays that negotiated Remote.framing.BINARY receive boards as binary messages,
+    which are decoded to the JSON messages they stand for, and send binary turns.
     """
 
     def __init__(self, player, relay):
@@ -23,11 +41,12 @@ class RelayPlayer:
         self.player = player
         self.relay = relay
 
-        self.board = GameBoard()
-        self.rule_checker = RuleChecker(self.board)
+        self.__reset_board()
 
         self.opponent = None
         self.workers = []
+        # Are boards and turns sent as binary messages?
+        self.binary = False
 
 
     @property
@@ -42,7 +61,7 @@ class RelayPlayer:
 
     def run(self):
         """ Run RelayPlayer, sending player id and subscribing to Relay. """
-        self.__send(self.player.get_id())
+        self.binary = BINARY in self.relay.sign_up(self.player.get_id())
         self.relay.subscribe(self.__handle_message, self.__handle_connection_loss)
 
 
@@ -73,11 +92,15 @@ class RelayPlayer:
 
         :param response: Any, message from server.
         """
+        if isinstance(response, bytes):
+            response = self.__decode(response)
+
         qualifier_to_handlers = {
             self.__playing_as_qualifier: self.__playing_as_handler,
             self.__opponent_qualifier: self.__opponent_handler,
             self.__placement_qualifier: self.__placement_handler,
             self.__turn_qualifier: self.__turn_handler,
+            self.__board_delta_qualifier: self.__board_delta_handler,
             self.__results_qualifier: self.__results_handler,
         }
 
@@ -90,6 +113,19 @@ class RelayPlayer:
         self.__send(self.player_id)
 
 
+    def __decode(self, response):
+        """
+        Decode a binary message from server, None if it is not valid.
+
+        :param response: bytes, binary message
+        :return: Any, JSON message it stands for
+        """
+        try:
+            return decode(response, self.player_id, self.opponent)
+        except ValueError:
+            return None
+
+
     def __results_qualifier(self, value):
         """
         Check if given value is a Results message.
@@ -194,12 +230,13 @@ class RelayPlayer:
         else:
             self.workers = []
 
+        # Nothing is built before all workers are placed, so the board is just the placed workers
+        self.__reset_board()
         for worker_place in value:
             wid, x, y = worker_place
-            if wid in self.workers:
-                self.board.place_worker(self.player_id, wid, x, y)
-            else:
-                self.board.place_worker(self.opponent, wid, x, y)
+            pid = self.player_id if wid in self.workers else self.opponent
+            self.board.place_worker(pid, wid, x, y)
+            self.__cells[y][x] = "0{}{}".format(pid, wid)
 
         spec = self.player.get_placement(self.board, "id", self.rule_checker)
         self.__send(spec['xy'])
@@ -231,51 +268,107 @@ class RelayPlayer:
         """
         Handle turn message.
 
-        Remake board according to Board specification from server.
+        Update board according to Board specification from server.
 
         :param value: Board, board
         """
-        self.board = self.__make_game_board(value)
-        self.rule_checker = RuleChecker(self.board)
+        self.__update_board(value)
+        self.__server_board = value
 
         move = self.player.get_move(self.board, self.rule_checker)
 
-        copy_board = copy.deepcopy(self.board)
-        copy_rule_checker = RuleChecker(copy_board)
-        wid = copy_board.get_worker_id(*move['xy1'])
-        copy_board.move_worker(*move['xy1'], *move['xy2'])
-
-        build = self.player.get_build(copy_board, wid, copy_rule_checker)
+        # Try the move out on the board and take it back once the build is known
+        wid = self.board.get_worker_id(*move['xy1'])
+        self.stack_board.push(move)
+        try:
+            build = self.player.get_build(self.board, wid, self.rule_checker)
+        finally:
+            self.stack_board.pop()
 
         move_EW, move_NS = self.__get_direction(move['xy1'], move['xy2'])
         build_EW, build_NS = self.__get_direction(build['xy1'], build['xy2'])
         request = [wid, move_EW, move_NS, build_EW, build_NS]
-        self.__send(request)
+        if self.binary:
+            self.relay.send(encode_turn(request))
+        else:
+            self.__send(request)
+
+
+    def __board_delta_qualifier(self, value):
+        """
+        Check if value is a board delta message.
+
+        :param value: Any, value to check
+        :return: bool, True if value is a board delta message, False otherwise
+        """
+        return is_delta_message(value)
 
 
-    def __make_game_board(self, board):
+    def __board_delta_handler(self, value):
         """
-        Make a GameBoard from the Board specification.
+        Handle board delta message, taking the turn on the board it leads to, or
+        asking for the full board if it can not be applied.
+
+        :param value: ["board-delta", [[x, y, Cell], ...], int], board delta message
+        """
+        board = apply_delta(self.__server_board, value)
+        if board is None:
+            self.__send(RESEND_BOARD)
+            return
+        self.__turn_handler(board)
+
+
+    def __reset_board(self):
+        """
+        Start over with an empty board.
+        """
+        self.board = GameBoard()
+        self.rule_checker = RuleChecker(self.board)
+        self.stack_board = StackBoard(self.board)
+        # Board specification the board was last updated to
+        self.__cells = [list(row) for row in EMPTY_BOARD]
+        # Last Board specification from the server in this game, None before the first turn
+        self.__server_board = None
+
+
+    def __update_board(self, board):
+        """
+        Update the board to the Board specification from the server, changing only
+        the cells that differ from the last specification.
 
         :param board: Board, board state specification from server.
-        :return: GameBoard, the GameBoard from the Board specification
-        """
-        gb = GameBoard()
-        for y, row in enumerate(board):
-            for x, el in enumerate(row):
-
-                # if there's no worker
-                if isinstance(el, int):
-                    gb.build_floor(x, y, el)
-
-                # if there's a worker
-                elif isinstance(el, str):
-                    height = int(el[0])
-                    pid = el[1:-1]
-                    wid = el[-1]
-                    gb.build_floor(x, y, height)
-                    gb.place_worker(pid, wid, x, y)
-        return gb
+        """
+        changed = [(x, y, el) for y, row in enumerate(board) for x, el in enumerate(row)
+                   if el != self.__cells[y][x]]
+
+        # Take every worker that moved off its old cell first, so none is in two places at once
+        for x, y, _ in changed:
+            if self.board.get_player_id(x, y) is not None:
+                self.board.place_worker(None, None, x, y)
+
+        for x, y, el in changed:
+            height, worker = self.__parse_cell(el)
+            if height != self.board.get_height(x, y):
+                self.board.build_floor(x, y, height - self.board.get_height(x, y))
+            if worker is not None:
+                self.board.place_worker(*worker, x, y)
+
+        self.__cells = [list(row) for row in board]
+
+
+    def __parse_cell(self, el):
+        """
+        Parse a Cell specification from the server.
+
+        :param el: Cell, height, or height followed by player id and worker id
+        :return: (N, (string, string) | None), height and (player id, worker id) of the worker if any
+        """
+        # if there's no worker
+        if isinstance(el, int):
+            return el, None
+
+        # if there's a worker
+        return int(el[0]), (el[1:-1], el[-1])
 
 
     def __natural_under_five(self, value):
@@ -1,21 +1,42 @@
-import json
-
 from Common.player import Player as IPlayer
 from Lib.util import xboard
+from Remote.binary_codec import decode, encode_board, encode_delta
+from Remote.board_delta import RESEND_BOARD, delta_message
+from Remote.framing import BINARY, BOARD_DELTA, BUFFER_SIZE, MessageDecoder, encode, framing_of, receive
 
 class RemotePlayer(IPlayer):
     """ Remote player over TCP connection """
 
-    def __init__(self, player_id, connection, buffer_size = 1024):
+    def __init__(self, player_id, connection, buffer_size = BUFFER_SIZE, decoder = None, features = (), timeout = None):
         """
         Initialize RemotePlayer with live TCP connection.
 
         :param connection: conn, live TCP connection from socket
+        :param buffer_size: int, bytes to read from the connection at a time
+        :param decoder: MessageDecoder, decoder holding bytes received at sign-up, a new one if None
+        :param features: [string, ...], features negotiated at sign-up
+        :param timeout: float, seconds a read or write on the connection may block before it
+                        fails, None to block until it is done
         """
         self.__id = player_id
         self.__connection = connection
+        # A read blocked in a thread other than the main one outlives the Referee's deadline until it returns
+        if timeout is not None:
+            self.__connection.settimeout(timeout)
         self.buffer_size = buffer_size
 
+        # Framing of the messages in both directions
+        self.__framing = framing_of(features)  # type: str
+        # Parses messages out of the received bytes
+        self.__decoder = decoder if decoder is not None else MessageDecoder()  # type: MessageDecoder
+        self.__decoder.framing = self.__framing
+        # Does the player take board deltas instead of full boards after the first turn of a game?
+        self.__board_delta = BOARD_DELTA in features  # type: bool
+        # Are boards and turns sent as binary messages?
+        self.__binary = BINARY in features  # type: bool
+        # Last board sent to the player in this game, None before its first turn
+        self.__last_board = None  # type: Optional[List[list]]
+
 
     def get_id(self):
         return self.__id
@@ -31,6 +52,8 @@ class RemotePlayer(IPlayer):
             
 
     def get_placement(self, board, wid, rule_checker):
+        # Placements start a new game, whose first turn sends the full board
+        self.__last_board = None
         workers = board.find_workers()
         worker_places = list(map(lambda w: self.__get_worker_place(board, *w), workers))
 
@@ -75,8 +98,7 @@ class RemotePlayer(IPlayer):
 
         :param message: string, message to send
         """
-        message = json.dumps(message)
-        self.__connection.sendall(message.encode())
+        self.__connection.sendall(encode(message, self.__framing))
 
 
     def __receive(self):
@@ -85,8 +107,7 @@ class RemotePlayer(IPlayer):
 
         :return: string, message received from TCP.
         """
-        response = json.loads(self.__connection.recv(self.buffer_size).decode())
-        return response
+        return receive(self.__connection, self.__decoder, self.buffer_size)
 
 
     def __get_worker_place(self, board, x, y):
@@ -112,8 +133,7 @@ class RemotePlayer(IPlayer):
         :return: MoveAction, BuildAction
         """
         json_board = xboard(board)
-        self.__send(json_board)
-        move_and_build = self.__receive()
+        move_and_build = self.__send_board(json_board)
 
         wid = move_and_build[0]
         move_east_west = move_and_build[1]
@@ -130,6 +150,40 @@ class RemotePlayer(IPlayer):
         return move, build
 
 
+    def __send_board(self, json_board):
+        """
+        Send the board, as a delta from the last board if the player takes deltas,
+        and receive the turn action. The full board is sent if the player asks for it.
+        Boards are sent as binary messages if the player takes them.
+
+        :param json_board: Board, board specification
+        :return: Any, turn action received
+        """
+        previous = self.__last_board
+        if self.__board_delta:
+            self.__last_board = json_board
+
+        if previous is not None:
+            delta = delta_message(previous, json_board)
+            self.__send(encode_delta(delta, self.__id) if self.__binary else delta)
+            response = self.__receive_turn()
+            if response != RESEND_BOARD:
+                return response
+
+        self.__send(encode_board(json_board, self.__id) if self.__binary else json_board)
+        return self.__receive_turn()
+
+
+    def __receive_turn(self):
+        """
+        Receive the answer to a board, decoding binary turn actions.
+
+        :return: Any, turn action or other message received
+        """
+        response = self.__receive()
+        return decode(response) if isinstance(response, bytes) else response
+
+
     def __get_origin_and_next_position(self, board, wid, eastwest, northsouth):
         """
         Get the current position of worker and the next in the given directions. 
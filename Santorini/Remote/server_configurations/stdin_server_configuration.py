@@ -2,6 +2,7 @@ import fileinput, json, sys
 import math
 
 from Lib.util import stdin
+from Admin.server_configuration import DEFAULT_BACKLOG
 
 class ServerConfiguration:
     """
@@ -54,6 +55,17 @@ class ServerConfiguration:
         return value is 1
 
 
+    def backlog(self):
+        """
+        How many connections can queue up while the server signs up players?
+        The "backlog" key is optional.
+
+        :return: N > 0, size of the listen backlog
+        """
+        return self.__extract_from_configuration('backlog', lambda v: self.__natural(v) and v > 0,
+                                                 default=DEFAULT_BACKLOG)
+
+
     def __set_configuration(self):
         """
         Set the configuration to stdin JSON values if
@@ -87,19 +99,22 @@ class ServerConfiguration:
             sys.exit()
 
 
-    def __extract_from_configuration(self, key, qualifier):
+    def __extract_from_configuration(self, key, qualifier, default=None):
         """
         Extract value from configuration from given key. 
         If no valid configuration is found, use fallback function
 
         :param key: string, key in configuration
         :param qualifier: (Any) -> bool, qualifier to determine if value is valid
+        :param default: Any, value of an optional key when it is left out, None if the key is required
         :return: Any, value from configuration
         """
         value = None
 
         try:
             self.__set_configuration()
+            if default is not None and key not in self.configuration:
+                return default
             value = self.configuration[key]
 
             if not qualifier(value):
@@ -0,0 +1,69 @@
+import pytest
+import random
+
+np = pytest.importorskip("numpy")
+
+from Admin.board import GameBoard
+from Admin.compact_board import CompactGameBoard
+from Admin.rule_checker import RuleChecker
+from Lib import batch_rules
+
+
+def random_board(board_cls, seed):
+    """ Board with random towers and two workers for each of two players """
+    rand = random.Random(seed)
+    board = board_cls()
+    cells = [(x, y) for x in range(6) for y in range(6)]
+    for x, y in rand.sample(cells, 20):
+        board.build_floor(x, y, rand.randint(1, 4))
+    for i, (x, y) in enumerate(rand.sample(cells, 4)):
+        board.place_worker(["one", "two"][i % 2], i // 2, x, y)
+    return board
+
+
+@pytest.fixture(params=[GameBoard, CompactGameBoard])
+def boards(request):
+    return [random_board(request.param, seed) for seed in range(40)]
+
+
+""" Test masks match the rule checker """
+def test_move_masks_match_check_move(boards):
+    masks = batch_rules.move_masks(*batch_rules.from_boards(boards))
+    for board, board_masks in zip(boards, masks):
+        checker = RuleChecker(board)
+        for (x1, y1), mask in zip(board.find_workers(), board_masks):
+            pid = board.get_player_id(x1, y1)
+            for y2 in range(6):
+                for x2 in range(6):
+                    assert mask[y2, x2] == checker.check_move(pid, x1, y1, x2, y2)
+
+def test_build_masks_match_check_build(boards):
+    masks = batch_rules.build_masks(*batch_rules.from_boards(boards))
+    for board, board_masks in zip(boards, masks):
+        checker = RuleChecker(board)
+        for (x1, y1), mask in zip(board.find_workers(), board_masks):
+            pid = board.get_player_id(x1, y1)
+            wid = board.get_worker_id(x1, y1)
+            for y2 in range(6):
+                for x2 in range(6):
+                    assert mask[y2, x2] == checker.check_build(pid, wid, x1, y1, x2, y2)
+
+
+""" Test padding """
+def test_missing_workers_have_empty_masks():
+    board = CompactGameBoard()
+    board.place_worker("one", "1", 0, 0)
+    heights, positions = batch_rules.from_boards([board])
+    assert positions.shape == (1, 4, 2)
+    assert positions[0, 1:].tolist() == [[-1, -1]] * 3
+    moves = batch_rules.move_masks(heights, positions)
+    assert moves[0, 0].sum() == 3
+    assert not moves[0, 1:].any()
+    assert not batch_rules.build_masks(heights, positions)[0, 1:].any()
+
+def test_occupancy_marks_workers():
+    board = GameBoard()
+    board.place_worker("one", "1", 2, 3)
+    occupied = batch_rules.occupancy(batch_rules.from_boards([board])[1])
+    assert occupied[0, 3, 2]
+    assert occupied.sum() == 1
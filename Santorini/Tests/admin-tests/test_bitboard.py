@@ -0,0 +1,136 @@
+import pytest
+import copy
+import random
+
+from Admin.board import GameBoard
+from Admin.compact_board import CompactGameBoard
+from Admin.rule_checker import RuleChecker
+from Lib import bitboard
+from Lib.util import gen_moves, gen_builds, gen_checked_moves, gen_checked_builds
+
+
+def random_board(board_cls, seed):
+    """ Board with random towers and two workers for each of two players """
+    rand = random.Random(seed)
+    board = board_cls()
+    cells = [(x, y) for x in range(6) for y in range(6)]
+    for x, y in rand.sample(cells, 20):
+        board.build_floor(x, y, rand.randint(1, 4))
+    for i, (x, y) in enumerate(rand.sample(cells, 4)):
+        board.place_worker(["one", "two"][i % 2], i // 2, x, y)
+    return board
+
+
+@pytest.fixture(params=[GameBoard, CompactGameBoard])
+def board_cls(request):
+    return request.param
+
+
+""" Test generators match the rule checker """
+def test_same_moves_as_rule_checker(board_cls):
+    for seed in range(50):
+        board = random_board(board_cls, seed)
+        checker = RuleChecker(board)
+        for player in ["one", "two"]:
+            assert list(bitboard.gen_moves(player, board)) == list(gen_checked_moves(player, board, checker))
+
+def test_same_builds_as_rule_checker(board_cls):
+    for seed in range(50):
+        board = random_board(board_cls, seed)
+        checker = RuleChecker(board)
+        for x, y in board.find_workers():
+            for player in ["one", "two"]:
+                assert list(bitboard.gen_builds(player, [x, y], board)) == \
+                       list(gen_checked_builds(player, [x, y], board, checker))
+
+def test_no_builds_for_missing_worker():
+    board = GameBoard()
+    assert list(bitboard.gen_builds("one", (2, 2), board)) == []
+    assert list(bitboard.gen_builds("one", (6, 6), board)) == []
+
+
+""" Test BitBoard updates """
+def test_move_and_build_can_be_undone():
+    board = random_board(CompactGameBoard, 0)
+    bits = bitboard.from_board(board)
+    before = (bytes(bits.heights), bits.occupied, [bits.at_most(level) for level in range(4)])
+    origin = bitboard.CELL_INDEX[board.find_workers()[0]]
+    destination = bitboard.NEIGHBORS[origin][0][0]
+
+    bits.move_worker(origin, destination)
+    bits.build_floor(origin)
+    assert bits.occupied & bitboard.BIT[destination]
+    bits.remove_floor(origin)
+    bits.move_worker(destination, origin)
+    assert (bytes(bits.heights), bits.occupied, [bits.at_most(level) for level in range(4)]) == before
+
+def test_build_updates_level_masks():
+    bits = bitboard.BitBoard()
+    bits.build_floor(0)
+    assert bits.move_targets(1) & bitboard.BIT[0]
+    bits.build_floor(0)
+    assert not bits.move_targets(1) & bitboard.BIT[0]
+    bits.build_floor(0)
+    bits.build_floor(0)
+    assert not bits.build_targets(1) & bitboard.BIT[0]
+
+
+""" Test boards keep their BitBoard up to date """
+def state(bits):
+    return list(bits.heights), bits.occupied, [bits.at_most(level) for level in range(4)]
+
+def test_board_bitboard_follows_changes(board_cls):
+    rand = random.Random(3)
+    board = random_board(board_cls, 3)
+    bits = board.get_bitboard()
+    for _ in range(30):
+        x, y = rand.choice(board.find_workers())
+        x2, y2 = rand.randrange(6), rand.randrange(6)
+        if board.get_player_id(x2, y2) is None:
+            board.move_worker(x, y, x2, y2)
+        x, y, n = rand.randrange(6), rand.randrange(6), rand.choice([1, 2, -1])
+        if board.get_height(x, y) + n >= 0:
+            board.build_floor(x, y, n)
+        assert board.get_bitboard() is bits
+        assert state(bits) == state(bitboard.read_board(board))
+
+def test_copies_keep_their_own_bitboard(board_cls):
+    board = random_board(board_cls, 4)
+    board.get_bitboard()
+    board_copy = copy.deepcopy(board)
+    x, y = board.find_workers()[0]
+    board.build_floor(x, y)
+    assert state(board_copy.get_bitboard()) == state(bitboard.read_board(board_copy))
+    assert state(board_copy.get_bitboard()) != state(board.get_bitboard())
+
+def test_from_board_is_free_to_change(board_cls):
+    board = random_board(board_cls, 5)
+    bits = bitboard.from_board(board)
+    bits.build_floor(0)
+    assert state(board.get_bitboard()) == state(bitboard.read_board(board))
+
+
+""" Test util adapter """
+def test_rule_checker_uses_bitboard():
+    assert RuleChecker(GameBoard()).bitboard_rules
+
+def test_custom_rules_skip_bitboard():
+    class NoClimbing(RuleChecker):
+        def check_move(self, pid, x1, y1, x2, y2):
+            return super().check_move(pid, x1, y1, x2, y2) and board.get_height(x2, y2) == 0
+
+    board = GameBoard()
+    board.place_worker("one", 1, 0, 0)
+    board.build_floor(1, 0)
+    checker = NoClimbing(board)
+    assert not checker.bitboard_rules
+    assert [m['xy2'] for m in gen_moves("one", board, checker)] == [[1, 1], [0, 1]]
+
+def test_util_generators_use_board_state(board_cls):
+    board = random_board(board_cls, 7)
+    checker = RuleChecker(board)
+    x, y = board.find_workers()[0]
+    player = board.get_player_id(x, y)
+    assert list(gen_moves(player, board, checker)) == list(gen_checked_moves(player, board, checker))
+    assert list(gen_builds(player, (x, y), board, checker)) == \
+           list(gen_checked_builds(player, (x, y), board, checker))
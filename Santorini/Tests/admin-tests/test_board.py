@@ -0,0 +1,57 @@
+import pytest
+
+from Admin.board import GameBoard
+from Admin.compact_board import CompactGameBoard
+
+
+@pytest.fixture(params=[GameBoard, CompactGameBoard])
+def any_board(request):
+    return request.param()
+
+
+""" Test worker index """
+def test_find_placed_worker(any_board):
+    any_board.place_worker("pid", "1", 2, 2)
+    assert any_board.find_worker("pid", "1") == (2, 2)
+    assert any_board.find_worker("pid", "2") is None
+
+def test_find_moved_worker(any_board):
+    any_board.place_worker("pid", "1", 2, 2)
+    any_board.move_worker(2, 2, 3, 3)
+    assert any_board.find_worker("pid", "1") == (3, 3)
+    assert any_board.find_workers() == [(3, 3)]
+
+def test_removed_worker_is_not_found(any_board):
+    any_board.place_worker("pid", "1", 2, 2)
+    any_board.place_worker(None, None, 2, 2)
+    assert any_board.find_worker("pid", "1") is None
+    assert any_board.find_workers() == []
+
+def test_overwritten_worker_is_not_found(any_board):
+    any_board.place_worker("pid", "1", 2, 2)
+    any_board.place_worker("other", "1", 3, 3)
+    any_board.move_worker(3, 3, 2, 2)
+    assert any_board.find_worker("pid", "1") is None
+    assert any_board.find_worker("other", "1") == (2, 2)
+
+def test_move_onto_itself_clears_worker(any_board):
+    any_board.place_worker("pid", "1", 2, 2)
+    any_board.move_worker(2, 2, 2, 2)
+    assert any_board.find_worker("pid", "1") is None
+
+def test_find_player_workers(any_board):
+    any_board.place_worker("one", "1", 0, 0)
+    any_board.place_worker("two", "1", 1, 1)
+    any_board.place_worker("one", "2", 2, 2)
+    assert sorted(any_board.find_player_workers("one")) == [(0, 0), (2, 2)]
+    assert any_board.find_player_workers("three") == []
+
+
+""" Test worker order """
+def test_workers_in_order_cells_were_first_looked_up():
+    board = GameBoard()
+    board.get_height(4, 4)
+    board.place_worker("one", "1", 0, 0)
+    board.place_worker("two", "1", 1, 1)
+    board.move_worker(0, 0, 4, 4)
+    assert board.find_workers() == [(4, 4), (1, 1)]
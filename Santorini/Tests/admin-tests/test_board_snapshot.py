@@ -0,0 +1,73 @@
+import pytest
+import copy
+
+from Admin.board import GameBoard
+from Admin.board_snapshot import BoardSnapshot, SnapshotTracker
+from Admin.compact_board import CompactGameBoard
+
+
+@pytest.fixture(params=[GameBoard, CompactGameBoard])
+def board(request):
+    board = request.param()
+    board.place_worker("one", "1", 0, 0)
+    board.build_floor(1, 1, 2)
+    return board
+
+@pytest.fixture
+def tracker(board):
+    return SnapshotTracker(board)
+
+
+""" Test reads """
+def test_snapshot_reads_board(board):
+    snapshot = BoardSnapshot(board)
+    assert snapshot.get_player_id(0, 0) == "one"
+    assert snapshot.get_worker_id(0, 0) == "1"
+    assert snapshot.get_height(1, 1) == 2
+    assert snapshot.find_workers() == [(0, 0)]
+    assert snapshot.find_worker("one", "1") == (0, 0)
+    assert list(snapshot.get_heights()) == list(board.get_heights())
+    assert not snapshot.detached
+
+def test_reads_do_not_create_cells():
+    board = GameBoard()
+    board.place_worker("one", "1", 0, 0)
+    board.place_worker("two", "1", 1, 1)
+    BoardSnapshot(board).get_height(4, 4)
+    board.move_worker(0, 0, 4, 4)
+    assert board.find_workers() == [(1, 1), (4, 4)]
+
+
+""" Test copy on write """
+def test_write_does_not_change_board(board):
+    snapshot = BoardSnapshot(board)
+    snapshot.move_worker(0, 0, 0, 1)
+    snapshot.build_floor(1, 1)
+    assert snapshot.detached
+    assert snapshot.get_player_id(0, 1) == "one"
+    assert snapshot.get_height(1, 1) == 3
+    assert board.get_player_id(0, 0) == "one"
+    assert board.get_height(1, 1) == 2
+
+def test_deepcopy_is_independent_board(board):
+    board_copy = copy.deepcopy(BoardSnapshot(board))
+    assert type(board_copy) is type(board)
+    board_copy.build_floor(1, 1)
+    assert board.get_height(1, 1) == 2
+
+
+""" Test SnapshotTracker """
+def test_snapshot_keeps_state_after_board_changes(board, tracker):
+    snapshot = tracker.snapshot()
+    tracker.detach_all()
+    board.move_worker(0, 0, 0, 1)
+    assert snapshot.get_player_id(0, 0) == "one"
+    assert snapshot.get_player_id(0, 1) is None
+
+def test_dropped_snapshots_are_not_copied(tracker):
+    snapshot = tracker.snapshot()
+    kept = tracker.snapshot()
+    del snapshot
+    tracker.detach_all()
+    assert kept.detached
+    assert not tracker.snapshot().detached
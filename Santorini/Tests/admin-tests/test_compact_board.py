@@ -0,0 +1,110 @@
+import pytest
+import copy
+
+from Admin.board import GameBoard
+from Admin.compact_board import CompactGameBoard
+from Admin.referee import Referee
+from Admin.game_over import GameOverCondition
+
+
+@pytest.fixture
+def compact_board():
+    return CompactGameBoard()
+
+@pytest.fixture
+def populated_boards():
+    boards = [GameBoard(), CompactGameBoard()]
+    for b in boards:
+        b.place_worker("one", "1", 0, 0)
+        b.place_worker("two", "1", 5, 5)
+        b.place_worker("one", "2", 2, 3)
+        b.build_floor(1, 1, 2)
+        b.build_floor(4, 0)
+        b.move_worker(0, 0, 1, 0)
+    return boards
+
+
+""" Test place_worker """
+def test_empty_cell(compact_board):
+    assert compact_board.get_height(0, 0) == 0
+    assert compact_board.get_player_id(0, 0) is None
+    assert compact_board.get_worker_id(0, 0) is None
+
+def test_place_worker(compact_board):
+    compact_board.place_worker("pid", "wid", 3, 4)
+    assert compact_board.get_player_id(3, 4) == "pid"
+    assert compact_board.get_worker_id(3, 4) == "wid"
+
+def test_place_none_clears_cell(compact_board):
+    compact_board.place_worker("pid", "wid", 3, 4)
+    compact_board.place_worker(None, None, 3, 4)
+    assert compact_board.get_player_id(3, 4) is None
+    assert compact_board.find_workers() == []
+
+def test_place_off_board_raises(compact_board):
+    with pytest.raises(IndexError):
+        compact_board.place_worker("pid", "wid", 6, 0)
+
+
+""" Test move_worker """
+def test_move_worker(compact_board):
+    compact_board.place_worker("pid", "wid", 0, 0)
+    compact_board.move_worker(0, 0, 1, 1)
+    assert compact_board.get_player_id(0, 0) is None
+    assert compact_board.get_player_id(1, 1) == "pid"
+    assert compact_board.find_worker("pid", "wid") == (1, 1)
+
+
+""" Test build_floor """
+def test_build_floor(compact_board):
+    compact_board.build_floor(2, 2)
+    compact_board.build_floor(2, 2, 2)
+    assert compact_board.get_height(2, 2) == 3
+
+def test_remove_floor(compact_board):
+    compact_board.build_floor(2, 2, 2)
+    compact_board.build_floor(2, 2, -1)
+    assert compact_board.get_height(2, 2) == 1
+
+
+""" Test lookups off the board """
+def test_off_board_reads_are_empty(compact_board):
+    for x, y in [(-1, 0), (0, -1), (6, 0), (0, 6)]:
+        assert compact_board.get_height(x, y) == 0
+        assert compact_board.get_player_id(x, y) is None
+        assert compact_board.get_worker_id(x, y) is None
+
+
+""" Test parity with GameBoard """
+def test_same_cells_as_game_board(populated_boards):
+    game_board, compact_board = populated_boards
+    for x in range(-1, 7):
+        for y in range(-1, 7):
+            assert game_board.get_height(x, y) == compact_board.get_height(x, y)
+            assert game_board.get_player_id(x, y) == compact_board.get_player_id(x, y)
+            assert game_board.get_worker_id(x, y) == compact_board.get_worker_id(x, y)
+
+def test_same_workers_as_game_board(populated_boards):
+    game_board, compact_board = populated_boards
+    assert sorted(game_board.find_workers()) == sorted(compact_board.find_workers())
+    assert sorted(game_board.find_player_workers("one")) == sorted(compact_board.find_player_workers("one"))
+    assert game_board.find_worker("two", "1") == compact_board.find_worker("two", "1")
+    assert compact_board.find_worker("two", "2") is None
+
+
+""" Test deepcopy """
+def test_deepcopy_is_independent(populated_boards):
+    compact_board = populated_boards[1]
+    board_copy = copy.deepcopy(compact_board)
+    board_copy.build_floor(1, 1)
+    board_copy.move_worker(1, 0, 0, 0)
+    assert compact_board.get_height(1, 1) == 2
+    assert compact_board.get_player_id(1, 0) == "one"
+    assert board_copy.get_player_id(0, 0) == "one"
+
+
+""" Test running games """
+def test_referee_runs_on_compact_board(random_player_one, random_player_two):
+    referee = Referee(random_player_one, random_player_two, time_limit=1, board_cls=CompactGameBoard)
+    game_over = referee.run_games(3)
+    assert game_over.condition is GameOverCondition.FairGame
@@ -0,0 +1,71 @@
+import pytest
+import threading
+import time
+
+from Admin.deadline import run_with_deadline
+from Admin.game_over import GameOverCondition
+from Common.exception import DeadlineExceeded
+
+
+def spin():
+    """ Loop forever in Python code """
+    while True:
+        pass
+
+
+def in_thread(fn, *args):
+    """ Run fn in a worker thread and return what it returned or raised """
+    outcome = []
+
+    def go():
+        try:
+            outcome.append(fn(*args))
+        except Exception as e:
+            outcome.append(e)
+
+    thread = threading.Thread(target=go)
+    thread.start()
+    thread.join(5)
+    assert not thread.is_alive()
+    return outcome[0]
+
+
+""" Test main thread """
+def test_returns_result():
+    assert run_with_deadline(1, lambda x: x + 1, 1) == 2
+
+def test_raises_when_late():
+    with pytest.raises(DeadlineExceeded):
+        run_with_deadline(0.05, spin)
+
+def test_no_alarm_after_return():
+    run_with_deadline(0.05, lambda: None)
+    time.sleep(0.1)
+
+def test_no_limit():
+    assert run_with_deadline(None, lambda: "done") == "done"
+
+
+""" Test worker threads """
+def test_returns_result_in_thread():
+    assert in_thread(run_with_deadline, 1, lambda x: x * 2, 4) == 8
+
+def test_raises_when_late_in_thread():
+    assert isinstance(in_thread(run_with_deadline, 0.05, spin), DeadlineExceeded)
+
+def test_threads_have_separate_deadlines():
+    outcomes = []
+    threads = [threading.Thread(target=lambda: outcomes.append(in_thread(run_with_deadline, 0.05, spin))),
+               threading.Thread(target=lambda: outcomes.append(in_thread(run_with_deadline, 1, time.sleep, 0.2)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(isinstance(outcome, DeadlineExceeded) for outcome in outcomes) == 1
+    assert None in outcomes
+
+
+""" Test referee """
+def test_referee_times_out_in_thread(random_infinite_referee):
+    game_over = in_thread(random_infinite_referee.run_games, 1)
+    assert game_over.condition is GameOverCondition.Timeout
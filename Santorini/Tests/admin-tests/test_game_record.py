@@ -0,0 +1,119 @@
+import pytest
+
+from Admin.board import GameBoard
+from Admin.game_over import GameOverCondition
+from Admin.game_record import GameRecord, GameRecordReader, GameRecordWriter, FILE_MAGIC, encode
+from Admin.referee import Referee
+from Admin.rule_checker import RuleChecker
+from Observer.record_observer import RecordObserver
+
+
+@pytest.fixture
+def record():
+    return GameRecord(("one", "two"), 1, GameOverCondition.FairGame, [
+        {'type': 'place', 'p': 'one', 'wid': '1', 'xy': [0, 0]},
+        {'type': 'place', 'p': 'two', 'wid': '1', 'xy': [5, 5]},
+        {'type': 'move', 'p': 'one', 'wid': '1', 'xy1': [0, 0], 'xy2': [1, 1]},
+        {'type': 'build', 'p': 'one', 'wid': '1', 'xy1': [1, 1], 'xy2': [2, 1]},
+    ])
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "games.sgr")
+
+
+def replay(record):
+    """ Take the actions of a record on a new board, checking each one, and return the winner """
+    board = GameBoard()
+    checker = RuleChecker(board)
+    for action in record.actions:
+        if action['type'] == 'place':
+            assert checker.check_place(action['p'], action['wid'], *action['xy'])
+            board.place_worker(action['p'], action['wid'], *action['xy'])
+        elif action['type'] == 'move':
+            assert checker.check_move(action['p'], *(action['xy1'] + action['xy2']))
+            board.move_worker(*(action['xy1'] + action['xy2']))
+        else:
+            assert checker.check_build(action['p'], action['wid'], *(action['xy1'] + action['xy2']))
+            board.build_floor(*action['xy2'])
+    return checker.check_game_over(*record.players)
+
+
+""" Test format """
+def test_header_and_actions_are_packed(record):
+    data = encode(record)
+    assert len(data) == 5 + len("one") + len("two") + 2 * 4
+
+def test_records_read_back(record, path):
+    with open(path, 'ab') as output:
+        writer = GameRecordWriter(output)
+        writer.write(record)
+        writer.write(record)
+    with GameRecordReader(path) as reader:
+        assert len(reader) == 2
+        assert list(reader) == [record, record]
+
+def test_writer_appends_to_file(record, path):
+    for _ in range(2):
+        with open(path, 'ab') as output:
+            GameRecordWriter(output).write(record)
+    with open(path, 'rb') as records:
+        assert records.read().count(FILE_MAGIC) == 1
+    with GameRecordReader(path) as reader:
+        assert len(reader) == 2
+
+def test_empty_file_has_no_games(path):
+    open(path, 'wb').close()
+    with GameRecordReader(path) as reader:
+        assert list(reader) == []
+
+@pytest.mark.parametrize("cut", [2, 12])
+def test_records_cut_short_are_rejected(record, path, cut):
+    with open(path, 'ab') as output:
+        writer = GameRecordWriter(output)
+        writer.write(record)
+        writer.write(record)
+    # Cut the second record part way into its header or its actions
+    second = len(FILE_MAGIC) + len(encode(record))
+    with open(path, 'r+b') as records:
+        records.truncate(second + cut)
+    with GameRecordReader(path) as reader:
+        assert reader.read(len(FILE_MAGIC)) == record
+        with pytest.raises(ValueError, match="truncated record at offset {}".format(second)):
+            list(reader)
+        with pytest.raises(ValueError, match="truncated record at offset {}".format(second)):
+            reader.read(second)
+
+def test_other_files_are_rejected(path):
+    with open(path, 'wb') as output:
+        output.write(b"not a record")
+    with pytest.raises(ValueError):
+        GameRecordReader(path)
+
+def test_actions_that_do_not_fit_are_rejected(record):
+    record.actions.append({'type': 'move', 'p': 'three', 'wid': '1', 'xy1': [0, 0], 'xy2': [1, 1]})
+    with pytest.raises(ValueError):
+        encode(record)
+
+
+""" Test RecordObserver """
+def test_records_refereed_games(random_player_one, random_player_two, path):
+    with open(path, 'ab') as output:
+        referee = Referee(random_player_one, random_player_two, observers=[RecordObserver(output)])
+        game_over = referee.run_games(3)
+    with GameRecordReader(path) as reader:
+        records = list(reader)
+    assert len(records) == 3
+    assert [r.players[0] for r in records] == ["random_one", "random_two", "random_one"]
+    for record in records:
+        assert record.condition is GameOverCondition.FairGame
+        assert replay(record) == record.winner_id
+    assert max(["random_one", "random_two"], key=[r.winner_id for r in records].count) == game_over.winner.get_id()
+
+def test_records_broken_players(random_player_one, misbehaving_player_one, path):
+    with open(path, 'ab') as output:
+        Referee(random_player_one, misbehaving_player_one, observers=[RecordObserver(output)]).run_games(1)
+    with GameRecordReader(path) as reader:
+        record, = list(reader)
+    assert record.winner_id == "random_one"
+    assert record.condition is GameOverCondition.InvalidAction
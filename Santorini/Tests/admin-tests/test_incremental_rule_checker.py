@@ -0,0 +1,128 @@
+import pytest
+import random
+
+from Admin.board import GameBoard
+from Admin.compact_board import CompactGameBoard
+from Admin.incremental_rule_checker import IncrementalRuleChecker
+from Admin.referee import Referee
+from Admin.rule_checker import RuleChecker
+from Admin.game_over import GameOverCondition
+from Lib import bitboard
+from Lib.util import gen_moves, gen_builds
+
+
+@pytest.fixture(params=[GameBoard, CompactGameBoard])
+def board(request):
+    return request.param()
+
+
+def play_random_game(board, seed, on_action):
+    """ Play random legal turns on board, calling on_action after every action until it returns a winner """
+    rand = random.Random(seed)
+    checker = RuleChecker(board)
+    cells = rand.sample([(x, y) for x in range(6) for y in range(6)], 4)
+    for i, (x, y) in enumerate(cells):
+        board.place_worker(["one", "two"][i % 2], str(i // 2 + 1), x, y)
+        if on_action() is not None:
+            return
+
+    for turn in range(200):
+        player = ["one", "two"][turn % 2]
+        move = rand.choice(list(gen_moves(player, board, checker)))
+        board.move_worker(*(move['xy1'] + move['xy2']))
+        if on_action() is not None:
+            return
+        build = rand.choice(list(gen_builds(player, move['xy2'], board, checker)))
+        board.build_floor(*build['xy2'])
+        if on_action() is not None:
+            return
+
+
+""" Test game over matches RuleChecker """
+def test_same_winner_as_rule_checker(board):
+    for seed in range(10):
+        game_board = type(board)()
+        rule_checker = RuleChecker(game_board)
+        incremental_checker = IncrementalRuleChecker(game_board)
+
+        def compare():
+            expected = rule_checker.check_game_over("one", "two")
+            assert incremental_checker.check_game_over("one", "two") == expected
+            return expected
+
+        play_random_game(game_board, seed, compare)
+
+def test_same_results_as_rule_checker_on_its_own_board(board):
+    # Each checker looks at its own board, so on a GameBoard the order of the workers
+    # only stays the same if both look the board up the same way
+    for seed in range(20):
+        rand = random.Random(seed)
+        boards = [type(board)(), type(board)()]
+        checkers = [RuleChecker(boards[0]), IncrementalRuleChecker(boards[1])]
+
+        def apply(action):
+            for game_board, checker in zip(boards, checkers):
+                if action['type'] == 'place':
+                    game_board.place_worker(action['p'], action['wid'], *action['xy'])
+                elif action['type'] == 'move':
+                    game_board.move_worker(*(action['xy1'] + action['xy2']))
+                else:
+                    game_board.build_floor(*action['xy2'])
+                checker.notify_of_action(action)
+            results = [checker.check_game_over(*players) for checker in checkers
+                       for players in [("one", "two"), ("two", "one")]]
+            assert results[:2] == results[2:]
+            assert boards[0].find_workers() == boards[1].find_workers()
+            return results[0]
+
+        cells = rand.sample([(x, y) for x in range(6) for y in range(6)], 4)
+        winner = None
+        for i, (x, y) in enumerate(cells):
+            winner = apply({'type': 'place', 'p': ["one", "two"][i % 2], 'wid': str(i // 2 + 1), 'xy': [x, y]})
+        for turn in range(200):
+            if winner is not None:
+                break
+            player = ["one", "two"][turn % 2]
+            move = rand.choice(sorted(bitboard.gen_moves(player, boards[1]), key=lambda m: m['xy1'] + m['xy2']))
+            winner = apply(move)
+            if winner is None:
+                builds = sorted(bitboard.gen_builds(player, move['xy2'], boards[1]), key=lambda b: b['xy2'])
+                winner = apply(rand.choice(builds))
+        assert winner is not None
+
+def test_notified_build_traps_worker(board):
+    checker = IncrementalRuleChecker(board)
+    board.place_worker("one", "1", 0, 0)
+    board.place_worker("two", "1", 5, 5)
+    board.build_floor(1, 0, 4)
+    board.build_floor(0, 1, 4)
+    assert checker.check_game_over("one", "two") is None
+    board.build_floor(1, 1)
+    assert checker.check_game_over("one", "two") is None
+    board.build_floor(1, 1)
+    checker.notify_of_action({'type': 'build', 'xy1': [2, 2], 'xy2': [1, 1]})
+    assert checker.check_game_over("one", "two") == "two"
+
+def test_players_swapped(board):
+    checker = IncrementalRuleChecker(board)
+    board.build_floor(0, 0, 3)
+    board.place_worker("one", "1", 0, 0)
+    assert checker.check_game_over("one", "two") == "one"
+    assert checker.check_game_over("two", "one") == "one"
+
+def test_trapped_after_build(board):
+    checker = IncrementalRuleChecker(board)
+    board.place_worker("one", "1", 0, 0)
+    board.place_worker("two", "1", 5, 5)
+    board.build_floor(1, 0, 4)
+    board.build_floor(0, 1, 4)
+    assert checker.check_game_over("one", "two") is None
+    board.build_floor(1, 1, 4)
+    assert checker.check_game_over("one", "two") == "two"
+
+
+""" Test running games """
+def test_referee_runs_with_incremental_checker(random_player_one, random_player_two):
+    referee = Referee(random_player_one, random_player_two, time_limit=1, checker_cls=IncrementalRuleChecker)
+    game_over = referee.run_games(3)
+    assert game_over.condition is GameOverCondition.FairGame
@@ -0,0 +1,129 @@
+import pytest
+import os
+import time
+
+from Admin.board import GameBoard
+from Admin.referee import Referee
+from Admin.rule_checker import RuleChecker
+from Lib.util import import_cls
+from Player.mcts_strategy import Strategy
+from Player.players.mcts_player import MCTSPlayer
+
+
+@pytest.fixture
+def board():
+    board = GameBoard()
+    board.place_worker("one", "1", 0, 0)
+    board.place_worker("one", "2", 5, 5)
+    board.place_worker("two", "1", 2, 2)
+    board.place_worker("two", "2", 3, 3)
+    return board
+
+@pytest.fixture
+def mcts_player():
+    return MCTSPlayer("mcts", time_budget=60, iterations=300, seed=1)
+
+
+""" Test Strategy """
+def test_climbs_to_win(board):
+    board.build_floor(0, 0, 2)
+    board.build_floor(1, 0, 3)
+    move, build = Strategy("one", time_budget=60, iterations=200, seed=1).decide_turn(board)
+    assert move['xy2'] == [1, 0]
+    assert build is None
+
+def test_blocks_opponent_win(board):
+    # Worker two 1 stands on the second floor next to a third floor at 2,1
+    board.build_floor(2, 2, 2)
+    board.build_floor(2, 1, 3)
+    board.build_floor(0, 0, 1)
+    board.build_floor(1, 1, 2)
+    move, build = Strategy("one", time_budget=60, iterations=2000, seed=1).decide_turn(board)
+    assert move['xy2'] == [1, 1]
+    assert build['xy2'] == [2, 1]
+
+def test_plays_by_custom_rules(board):
+    class NoLastColumn(RuleChecker):
+        def check_move(self, pid, x1, y1, x2, y2):
+            return super().check_move(pid, x1, y1, x2, y2) and x2 != 5
+
+    strategy = Strategy("one", time_budget=60, iterations=50, seed=1)
+    move, build = strategy.decide_turn(board, NoLastColumn)
+    assert move['xy2'][0] != 5
+    assert strategy.playouts == 50
+
+def test_stops_at_iterations(board):
+    strategy = Strategy("one", time_budget=60, iterations=50, seed=1)
+    strategy.decide_turn(board)
+    assert strategy.playouts == 50
+
+def test_stays_within_time_budget(board):
+    strategy = Strategy("one", time_budget=0.2, iterations=10 ** 9, seed=1)
+    start = time.monotonic()
+    strategy.decide_turn(board)
+    assert time.monotonic() - start < 0.5
+    assert strategy.playouts > 0
+
+def test_decision_leaves_board_unchanged(board):
+    heights = list(board.get_heights())
+    workers = board.find_workers()
+    Strategy("one", time_budget=0.1, seed=1).decide_turn(board)
+    assert list(board.get_heights()) == heights
+    assert board.find_workers() == workers
+
+def test_reads_board_with_only_common_interface(board):
+    class InterfaceBoard:
+        """ Board that only offers the reads of the Common GameBoard interface """
+        def __init__(self, board):
+            self.get_height = board.get_height
+            self.get_player_id = board.get_player_id
+            self.get_worker_id = board.get_worker_id
+            self.find_worker = board.find_worker
+            self.find_player_workers = board.find_player_workers
+            self.find_workers = board.find_workers
+
+    board.build_floor(0, 0, 2)
+    board.build_floor(1, 0, 3)
+    move, build = Strategy("one", time_budget=60, iterations=200, seed=1).decide_turn(InterfaceBoard(board))
+    assert move['xy2'] == [1, 0]
+    assert build is None
+
+def test_reuses_tree_after_opponent_turn(board):
+    strategy = Strategy("one", time_budget=60, iterations=300, seed=1)
+    move, build = strategy.decide_turn(board)
+    board.move_worker(*(move['xy1'] + move['xy2']))
+    board.build_floor(*build['xy2'])
+    chosen = strategy._Strategy__root
+    # The opponent takes one of the turns the search already tried
+    reply = max(chosen.children, key=lambda c: c.visits)
+    reply_move, reply_build = reply.turn
+    board.move_worker(*(reply_move['xy1'] + reply_move['xy2']))
+    board.build_floor(*reply_build['xy2'])
+    visits = reply.visits
+    strategy.decide_turn(board)
+    assert reply.visits == visits + 300
+
+def test_reset_drops_tree(board):
+    strategy = Strategy("one", time_budget=60, iterations=20, seed=1)
+    strategy.decide_turn(board)
+    strategy.reset()
+    assert strategy._Strategy__root is None
+
+
+""" Test MCTSPlayer """
+def test_beats_random_player(mcts_player, random_player_one):
+    referee = Referee(mcts_player, random_player_one, time_limit=5, observers=[])
+    assert referee.run_games(1).winner.get_id() == "mcts"
+
+def test_build_follows_searched_move(board):
+    player = MCTSPlayer("one", time_budget=0.1, seed=1)
+    checker = RuleChecker(board)
+    move = player.get_move(board, checker)
+    board.move_worker(*(move['xy1'] + move['xy2']))
+    build = player.get_build(board, board.get_worker_id(*move['xy2']), checker)
+    assert build['xy1'] == move['xy2']
+    assert checker.check_build("one", board.get_worker_id(*move['xy2']), *(build['xy1'] + build['xy2']))
+
+def test_loads_through_import_cls():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../Player/players/mcts_player.py')
+    assert import_cls(path).Player("mcts").get_id() == "mcts"
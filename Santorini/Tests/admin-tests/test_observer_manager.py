@@ -1,8 +1,12 @@
 import pytest
 import io
+import threading
+import time
 
-from Admin.observer_manager import ObserverManager
+from Admin.observer_manager import ObserverManager, QueuePolicy
+from Admin.referee import Referee
 from Admin.board import GameBoard
+from Admin.board_snapshot import SnapshotTracker
 from Admin.game_over import GameOverCondition
 from Observer.xobserver import XObserver
 from Lib.util import xboard, make_build, make_move, make_place, make_action
@@ -135,4 +139,84 @@ def test_player_game_over(guarded_player, board, rule_checker, manager, output):
 
     assert output.getvalue() is ""
     manager.game_over(guarded_player)
-    assert output.getvalue() is not ""
\ No newline at end of file
+    assert output.getvalue() is not ""
+
+""" Test queued updates """
+class SlowObserver(XObserver):
+    """ Observer that waits for an event before taking any update """
+    def __init__(self, output, release):
+        super().__init__(output)
+        self.release = release
+        # Set once the observer is given its first update
+        self.taken = threading.Event()
+
+    def give_up(self, pid):
+        self.taken.set()
+        self.release.wait(5)
+        super().give_up(pid)
+
+@pytest.fixture
+def release():
+    event = threading.Event()
+    yield event
+    event.set()
+
+def test_queued_updates_are_delivered_in_order(output, observer):
+    manager = ObserverManager([observer], queue_size=4)
+    for pid in ["a", "b", "c"]:
+        manager.give_up(pid)
+    manager.flush()
+    assert output.getvalue() == "Player gave up: a\nPlayer gave up: b\nPlayer gave up: c\n"
+    manager.close()
+
+def test_queued_updates_do_not_wait_for_observers(output, release):
+    manager = ObserverManager([SlowObserver(output, release)], queue_size=4)
+    start = time.monotonic()
+    manager.give_up("a")
+    assert time.monotonic() - start < 1
+    assert output.getvalue() == ""
+    release.set()
+    manager.close()
+    assert output.getvalue() == "Player gave up: a\n"
+
+@pytest.mark.parametrize("policy, delivered", [(QueuePolicy.DropNewest, "abc"), (QueuePolicy.DropOldest, "ade")])
+def test_full_queue_drops_updates(output, release, policy, delivered):
+    observer = SlowObserver(output, release)
+    manager = ObserverManager([observer], queue_size=2, policy=policy)
+    manager.give_up("a")
+    # Wait for the background thread to take the first update, leaving the queue empty
+    assert observer.taken.wait(5)
+    for pid in "bcde":
+        manager.give_up(pid)
+    assert manager.dropped == 2
+    release.set()
+    manager.close()
+    assert output.getvalue() == "".join("Player gave up: {}\n".format(pid) for pid in delivered)
+
+def test_broken_observer_is_removed_by_queued_update(manager, output):
+    manager = ObserverManager(manager.observers, queue_size=4)
+    manager.give_up(None)
+    manager.close()
+    assert manager.observers == []
+
+def test_referee_delivers_queued_updates_by_end_of_series(random_player_one, random_player_two):
+    output = io.StringIO()
+    expected = io.StringIO()
+    Referee(random_player_one, random_player_two, observers=[XObserver(output)], observer_queue_size=1).run_games(1)
+    Referee(random_player_one, random_player_two, observers=[XObserver(expected)]).run_games(1)
+    assert output.getvalue() == expected.getvalue()
+
+def test_referee_stops_background_thread_by_end_of_series(random_player_one, random_player_two):
+    threads = threading.active_count()
+    referee = Referee(random_player_one, random_player_two, observers=[XObserver(io.StringIO())], observer_queue_size=1)
+    referee.run_games(3)
+    assert threading.active_count() == threads
+
+def test_queued_update_detaches_board_snapshot(output, release, board):
+    snapshot = SnapshotTracker(board).snapshot()
+    manager = ObserverManager([SlowObserver(output, release)], queue_size=4)
+    manager.update_state(snapshot)
+    # The background thread reads the snapshot's own copy, never the board the game goes on with
+    assert snapshot.detached
+    release.set()
+    manager.close()
@@ -0,0 +1,94 @@
+import pytest
+
+from Admin.board import GameBoard
+from Admin.game_record import GameRecordReader
+from Admin.referee import Referee
+from Admin.replay import Replay
+from Lib.stack_board import StackBoard
+from Observer.record_observer import RecordObserver
+
+
+@pytest.fixture
+def actions():
+    return [
+        {'type': 'place', 'p': 'one', 'wid': '1', 'xy': [0, 0]},
+        {'type': 'place', 'p': 'two', 'wid': '1', 'xy': [5, 5]},
+        {'type': 'place', 'p': 'one', 'wid': '2', 'xy': [0, 5]},
+        {'type': 'place', 'p': 'two', 'wid': '2', 'xy': [5, 0]},
+        {'type': 'move', 'p': 'one', 'wid': '1', 'xy1': [0, 0], 'xy2': [1, 1]},
+        {'type': 'build', 'p': 'one', 'wid': '1', 'xy1': [1, 1], 'xy2': [2, 1]},
+        {'type': 'move', 'p': 'two', 'wid': '1', 'xy1': [5, 5], 'xy2': [4, 4]},
+        {'type': 'build', 'p': 'two', 'wid': '1', 'xy1': [4, 4], 'xy2': [4, 3]},
+        {'type': 'move', 'p': 'one', 'wid': '1', 'xy1': [1, 1], 'xy2': [2, 1]},
+        {'type': 'build', 'p': 'one', 'wid': '1', 'xy1': [2, 1], 'xy2': [2, 2]},
+    ]
+
+def state(board):
+    """ Heights and workers of a board """
+    return [board.get_height(x, y) for y in range(6) for x in range(6)], \
+           sorted((x, y, board.get_player_id(x, y), board.get_worker_id(x, y)) for x, y in board.find_workers())
+
+def boards_by_ply(actions):
+    """ State of the board after every ply, by taking the actions one at a time """
+    board = GameBoard()
+    stack = StackBoard(board)
+    states = [state(board)]
+    for action in actions:
+        stack.push(dict(action, pid=action['p']))
+        states.append(state(board))
+    return states
+
+
+""" Test checking """
+def test_valid_actions_replay(actions):
+    replay = Replay(actions)
+    assert replay.players == ("one", "two")
+    assert len(replay) == len(actions)
+    assert replay.invalid_ply is None
+    assert replay.winner is None
+
+def test_stops_at_invalid_move(actions):
+    actions[6]['xy2'] = [3, 3]
+    replay = Replay(actions)
+    assert replay.invalid_ply == 6
+    assert len(replay) == 6
+    assert state(replay.seek(-1)) == boards_by_ply(actions)[6]
+
+def test_build_must_follow_its_move(actions):
+    actions[5]['xy1'] = [0, 5]
+    actions[5]['wid'] = '2'
+    assert Replay(actions).invalid_ply == 5
+
+def test_replays_recorded_games(random_player_one, random_player_two, tmp_path):
+    path = str(tmp_path / "games.sgr")
+    with open(path, 'ab') as output:
+        Referee(random_player_one, random_player_two, observers=[RecordObserver(output)]).run_games(3)
+    with GameRecordReader(path) as reader:
+        for record in reader:
+            replay = Replay.from_record(record)
+            assert replay.invalid_ply is None
+            assert len(replay) == len(record.actions)
+            assert replay.winner == record.winner_id
+
+def test_no_actions_after_game_over(random_player_one, random_player_two, tmp_path):
+    path = str(tmp_path / "games.sgr")
+    with open(path, 'ab') as output:
+        Referee(random_player_one, random_player_two, observers=[RecordObserver(output)]).run_games(1)
+    with GameRecordReader(path) as reader:
+        record, = list(reader)
+    actions = record.actions + [record.actions[-1]]
+    assert Replay(actions, record.players).invalid_ply == len(record.actions)
+
+
+""" Test seeking """
+@pytest.mark.parametrize("interval", [1, 3, 16])
+def test_seek_matches_every_ply(actions, interval):
+    replay = Replay(actions, keyframe_interval=interval)
+    expected = boards_by_ply(actions)
+    for ply in [10, 0, 7, 3, 4, 9, 1, 10, 2]:
+        assert state(replay.seek(ply)) == expected[ply]
+        assert replay.ply == ply
+
+def test_seek_out_of_range(actions):
+    with pytest.raises(IndexError):
+        Replay(actions).seek(11)
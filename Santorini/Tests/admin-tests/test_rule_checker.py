@@ -0,0 +1,62 @@
+import pytest
+
+from Admin.board import GameBoard
+from Admin.rule_checker import RuleChecker
+from Lib.util import get_adjacent, get_neighbors
+
+
+@pytest.fixture
+def board():
+    return GameBoard()
+
+@pytest.fixture
+def checker(board):
+    return RuleChecker(board)
+
+
+""" Test neighbor tables """
+def test_neighbors_are_on_board_adjacent_cells():
+    for x in range(6):
+        for y in range(6):
+            expected = [(x2, y2) for x2, y2 in get_adjacent(x, y) if 0 <= x2 < 6 and 0 <= y2 < 6]
+            assert list(get_neighbors(x, y)) == expected
+
+def test_corner_has_three_neighbors():
+    assert get_neighbors(0, 0) == ((1, 0), (1, 1), (0, 1))
+
+def test_off_board_cell_has_no_neighbors():
+    assert get_neighbors(6, 0) == ()
+    assert get_neighbors(-1, -1) == ()
+
+
+""" Test check_valid_cell """
+def test_valid_cells(checker):
+    assert checker.check_valid_cell(0, 0)
+    assert checker.check_valid_cell(5, 5)
+    assert checker.check_valid_cell(1.0, 2)
+
+def test_invalid_cells(checker):
+    assert not checker.check_valid_cell(6, 0)
+    assert not checker.check_valid_cell(0, -1)
+    assert not checker.check_valid_cell(1.5, 2)
+    assert not checker.check_valid_cell([1], 2)
+    assert not checker.check_valid_cell("1", 2)
+
+
+""" Test check_game_over """
+def test_no_winner(board, checker):
+    board.place_worker("one", 1, 0, 0)
+    board.place_worker("two", 1, 5, 5)
+    assert checker.check_game_over("one", "two") is None
+
+def test_worker_on_third_floor_wins(board, checker):
+    board.build_floor(2, 2, 3)
+    board.place_worker("two", 1, 2, 2)
+    assert checker.check_game_over("one", "two") == "two"
+
+def test_trapped_corner_worker_loses(board, checker):
+    board.place_worker("one", 1, 0, 0)
+    board.place_worker("two", 1, 5, 5)
+    for x, y in get_neighbors(0, 0):
+        board.build_floor(x, y, 4)
+    assert checker.check_game_over("one", "two") == "two"
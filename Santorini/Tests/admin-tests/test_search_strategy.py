@@ -0,0 +1,130 @@
+import pytest
+import os
+import time
+import pickle
+import multiprocessing
+
+from Admin.board import GameBoard
+from Admin.referee import Referee
+from Admin.rule_checker import RuleChecker
+from Lib.util import import_cls
+from Lib.zobrist import heights_key, player_keys
+from Player.search_strategy import INFINITY, Strategy, _update_best
+from Player.players.search_player import SearchPlayer
+
+
+@pytest.fixture
+def board():
+    board = GameBoard()
+    board.place_worker("one", "1", 0, 0)
+    board.place_worker("one", "2", 5, 5)
+    board.place_worker("two", "1", 2, 2)
+    board.place_worker("two", "2", 3, 3)
+    return board
+
+@pytest.fixture
+def search_player():
+    return SearchPlayer("search", time_budget=0.2)
+
+
+""" Test Strategy """
+def test_climbs_to_win(board):
+    board.build_floor(0, 0, 2)
+    board.build_floor(1, 0, 3)
+    move, build = Strategy("one", time_budget=0.5).decide_turn(board)
+    assert move['xy2'] == [1, 0]
+    assert build is None
+
+def test_blocks_opponent_win(board):
+    # Worker two 1 stands on the second floor next to a third floor at 2,1
+    board.build_floor(2, 2, 2)
+    board.build_floor(2, 1, 3)
+    board.build_floor(0, 0, 1)
+    board.build_floor(1, 1, 2)
+    move, build = Strategy("one", time_budget=0.5).decide_turn(board)
+    assert move['xy2'] == [1, 1]
+    assert build['xy2'] == [2, 1]
+
+def test_stays_within_time_budget(board):
+    strategy = Strategy("one", time_budget=0.2)
+    start = time.monotonic()
+    strategy.decide_turn(board)
+    assert time.monotonic() - start < 0.5
+    assert strategy.depth >= 1
+    assert strategy.nodes > 0
+
+def test_decision_leaves_board_unchanged(board):
+    heights = list(board.get_heights())
+    workers = board.find_workers()
+    Strategy("one", time_budget=0.1).decide_turn(board)
+    assert list(board.get_heights()) == heights
+    assert board.find_workers() == workers
+
+
+""" Test Zobrist keys """
+def test_keys_are_stable():
+    assert player_keys("one") == player_keys("one")
+    assert player_keys("one") != player_keys("two")
+    assert heights_key([0] * 36) == 0
+    assert heights_key([1] + [0] * 35) != heights_key([2] + [0] * 35)
+
+
+""" Test SearchPlayer """
+def test_beats_random_player(search_player, random_player_one):
+    referee = Referee(search_player, random_player_one, time_limit=5, observers=[])
+    assert referee.run_games(1).winner.get_id() == "search"
+
+def test_build_follows_searched_move(board):
+    player = SearchPlayer("one", time_budget=0.1)
+    checker = RuleChecker(board)
+    move = player.get_move(board, checker)
+    board.move_worker(*(move['xy1'] + move['xy2']))
+    build = player.get_build(board, board.get_worker_id(*move['xy2']), checker)
+    assert build['xy1'] == move['xy2']
+    assert checker.check_build("one", board.get_worker_id(*move['xy2']), *(build['xy1'] + build['xy2']))
+
+def test_loads_through_import_cls():
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../Player/players/search_player.py')
+    assert import_cls(path).Player("search").get_id() == "search"
+
+
+""" Test parallel search """
+@pytest.fixture
+def built_board(board):
+    for x, y, n in [(1, 0, 1), (1, 1, 2), (2, 1, 1), (4, 4, 2), (4, 5, 3), (2, 3, 1)]:
+        board.build_floor(x, y, n)
+    return board
+
+def test_parallel_search_matches_serial(built_board):
+    serial = Strategy("one", time_budget=60, max_depth=3)
+    parallel = Strategy("one", time_budget=60, max_depth=3, processes=2)
+    try:
+        assert parallel.decide_turn(built_board) == serial.decide_turn(built_board)
+        assert parallel.depth == serial.depth == 3
+    finally:
+        parallel.close()
+
+def test_parallel_strategy_pickles_without_pool(board):
+    strategy = Strategy("one", time_budget=0.1, processes=2)
+    try:
+        strategy.decide_turn(board)
+        copy = pickle.loads(pickle.dumps(strategy))
+        assert copy.processes == 2
+    finally:
+        strategy.close()
+
+def test_stale_turn_does_not_update_best():
+    best = multiprocessing.Array('q', 3)
+    best[0], best[1], best[2] = -INFINITY, 5, 2
+    _update_best(best, 0, 100, -INFINITY, 1)
+    assert list(best) == [-INFINITY, 5, 2]
+    _update_best(best, 0, 100, -INFINITY, 2)
+    assert list(best) == [100, 0, 2]
+
+def test_game_over_stops_search_processes(board):
+    children = len(multiprocessing.active_children())
+    player = SearchPlayer("one", time_budget=0.05, processes=2)
+    player.get_move(board, RuleChecker(board))
+    assert len(multiprocessing.active_children()) == children + 2
+    player.game_over("WIN")
+    assert len(multiprocessing.active_children()) == children
@@ -0,0 +1,107 @@
+import pytest
+import random
+
+from Admin.board import GameBoard
+from Admin.compact_board import CompactGameBoard
+from Admin.game_over import GameOverCondition
+from Admin.incremental_rule_checker import IncrementalRuleChecker
+from Admin.referee import Referee
+from Admin.rule_checker import RuleChecker
+from Admin.simulator import Simulator, picks_on_bit_masks
+from Lib.util import gen_builds, gen_moves
+from Player.players.random_player import Player as RandomPlayer
+
+
+class SeededPlayer(RandomPlayer):
+    """ Player that makes random legal actions, the same ones whether it makes or picks them """
+    def __init__(self, player_id, seed):
+        super().__init__(player_id)
+        self.rand = random.Random(seed)
+
+    def get_move(self, board, rule_checker):
+        return self.rand.choice(list(gen_moves(self.get_id(), board, rule_checker)))
+
+    def get_build(self, board, wid, rule_checker):
+        worker = board.find_worker(self.get_id(), wid)
+        return self.rand.choice(list(gen_builds(self.get_id(), worker, board, rule_checker)))
+
+    def pick_move(self, moves):
+        return self.rand.choice(moves)
+
+    def pick_build(self, builds):
+        return self.rand.choice(builds)
+
+
+class BoardMakingPlayer(SeededPlayer):
+    """ Seeded player that only makes its actions, so it is never played on bit masks """
+    def get_move(self, board, rule_checker):
+        return super().get_move(board, rule_checker)
+
+
+class VandalPlayer(RandomPlayer):
+    """ Random player that builds under every worker on the boards it is handed """
+    def get_move(self, board, rule_checker):
+        move = super().get_move(board, rule_checker)
+        for x, y in board.find_workers():
+            board.build_floor(x, y, 3)
+        return move
+
+
+@pytest.fixture
+def simulator(random_player_one, random_player_two):
+    return Simulator(random_player_one, random_player_two)
+
+
+""" Test Simulator """
+def test_same_players_raise(random_player_one):
+    with pytest.raises(ValueError):
+        Simulator(random_player_one, RandomPlayer("random_one"))
+
+@pytest.mark.parametrize("board_cls, checker_cls", [(GameBoard, RuleChecker),
+                                                    (CompactGameBoard, IncrementalRuleChecker)])
+def test_game_matches_referee(random_player_one, random_player_two, board_cls, checker_cls):
+    referee = Referee(RandomPlayer("random_one"), RandomPlayer("random_two"), time_limit=5, observers=[],
+                      checker_cls=checker_cls, board_cls=board_cls)
+    game_over = referee.run_games(1)
+    game = Simulator(random_player_one, random_player_two, checker_cls, board_cls).play_game()
+    assert game.winner == game_over.winner.get_id()
+    assert game.loser == game_over.loser.get_id()
+    assert game.condition is GameOverCondition.FairGame
+
+def test_players_alternate_going_first(simulator):
+    games = list(simulator.run(4))
+    assert [game.game for game in games] == [0, 1, 2, 3]
+    assert [game.first for game in games] == ["random_one", "random_two"] * 2
+    assert all(game.turns > 0 for game in games)
+
+def test_start_decides_first_player(simulator):
+    assert list(simulator.run(2, start=1)) == list(simulator.run(3))[1:]
+
+def test_invalid_action_loses(misbehaving_player_one, random_player_one):
+    game = Simulator(misbehaving_player_one, random_player_one).play_game()
+    assert game.winner == "random_one"
+    assert game.condition is GameOverCondition.InvalidAction
+
+def test_sharded_run_matches_single_process(simulator):
+    assert list(simulator.run_sharded(10, processes=2, chunk_size=3)) == list(simulator.run(10))
+
+
+""" Test boards handed to players """
+def test_players_can_not_change_the_game_board(random_player_one, random_player_two):
+    game = Simulator(VandalPlayer("random_one"), VandalPlayer("random_two")).play_game()
+    assert game == Simulator(random_player_one, random_player_two).play_game()
+
+
+""" Test games on bit masks """
+def test_bit_masks_play_same_games():
+    on_bits = Simulator(SeededPlayer("one", 1), SeededPlayer("two", 2))
+    on_board = Simulator(BoardMakingPlayer("one", 1), BoardMakingPlayer("two", 2))
+    games = list(on_bits.run(50))
+    assert games == list(on_board.run(50))
+    assert len({game.turns for game in games}) > 1
+
+def test_only_players_picking_like_they_make_are_played_on_bit_masks():
+    assert picks_on_bit_masks(RandomPlayer("one"))
+    assert picks_on_bit_masks(SeededPlayer("one", 0))
+    assert not picks_on_bit_masks(BoardMakingPlayer("one", 0))
+    assert not picks_on_bit_masks(VandalPlayer("one"))
@@ -0,0 +1,88 @@
+import pytest
+import time
+
+from Admin.board import GameBoard
+from Admin.game_over import GameOverCondition
+from Admin.referee import Referee
+from Admin.rule_checker import RuleChecker
+from Player.test_strategy_alive import Strategy
+from Player.players.stay_alive_player import StayAlivePlayer
+
+
+@pytest.fixture
+def board():
+    board = GameBoard()
+    board.place_worker("one", "1", 0, 0)
+    board.place_worker("one", "2", 5, 5)
+    board.place_worker("two", "1", 2, 2)
+    board.place_worker("two", "2", 3, 4)
+    return board
+
+@pytest.fixture
+def strategy(board):
+    return Strategy("one", init=board)
+
+
+def build(x1, y1, x2, y2):
+    return {'type': 'build', 'xy1': [x1, y1], 'xy2': [x2, y2]}
+
+
+""" Test decide_build_within """
+def test_finds_loss_and_stops(board, strategy):
+    # two 1 stands on the second floor and one 1 builds a third floor next to it
+    board.build_floor(2, 2, 2)
+    board.build_floor(1, 1, 2)
+    assert strategy.decide_build_within(build(0, 0, 1, 1), 5) is False
+    assert sorted(strategy.nodes_per_look_ahead) == [1, 2]
+    assert strategy.nodes_per_look_ahead[2] > 0
+
+def test_answers_within_budget(board, strategy):
+    start = time.monotonic()
+    alive = strategy.decide_build_within(build(0, 0, 1, 0), 0.3, max_look_ahead=20)
+    assert time.monotonic() - start < 1
+    assert alive is not None
+    assert 1 in strategy.nodes_per_look_ahead
+
+def test_leaves_board_and_look_ahead_unchanged(board, strategy):
+    strategy.look_ahead = 3
+    heights = board.get_heights()
+    workers = board.find_workers()
+    strategy.decide_build_within(build(0, 0, 1, 0), 0.2)
+    assert board.get_heights() == heights
+    assert board.find_workers() == workers
+    assert strategy.look_ahead == 3
+
+def test_matches_fixed_look_ahead(board):
+    board.build_floor(1, 2, 1)
+    deepened = Strategy("one", init=board)
+    answer = deepened.decide_build_within(build(0, 0, 1, 0), 10, max_look_ahead=2)
+
+    fixed = Strategy("one", init=board)
+    fixed.look_ahead = max(deepened.nodes_per_look_ahead)
+    assert fixed.decide_build(build(0, 0, 1, 0)) == answer
+
+
+""" Test decide_turn_within """
+def test_turn_leaves_board_unchanged(board, strategy):
+    heights = board.get_heights()
+    workers = board.find_workers()
+    move = {'type': 'move', 'xy1': [0, 0], 'xy2': [1, 0]}
+    assert strategy.decide_turn_within(move, build(1, 0, 2, 0), 0.2) is not None
+    assert board.get_heights() == heights
+    assert board.find_workers() == workers
+
+
+""" Test stay-alive player """
+def test_deep_look_ahead_returns_within_budget(board):
+    player = StayAlivePlayer("one", time_budget=0.3, max_look_ahead=20)
+    start = time.monotonic()
+    move = player.get_move(board, RuleChecker(board))
+    assert time.monotonic() - start < 0.5
+    assert move['type'] == 'move'
+    board.move_worker(*(move['xy1'] + move['xy2']))
+    assert player.get_build(board, board.get_worker_id(*move['xy2']), RuleChecker(board))['xy1'] == move['xy2']
+
+def test_plays_games_within_referee_time_limit(random_player_two):
+    referee = Referee(StayAlivePlayer("one", time_budget=0.2), random_player_two, time_limit=1)
+    game_over = referee.run_games(1)
+    assert game_over.condition is GameOverCondition.FairGame
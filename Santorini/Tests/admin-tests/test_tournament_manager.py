@@ -1,9 +1,12 @@
 import pytest
+import copy
 import sys, os
+import threading
+import time
 dir_path = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, dir_path + '/../../')
 
-from Admin.tournament_manager import TournamentManager
+from Admin.tournament_manager import TournamentManager, round_robin_rounds
 from Admin.referee import Referee
 from Admin.game_over import GameOverCondition
 from Admin.rule_checker import RuleChecker
@@ -15,6 +18,22 @@ from Observer.xobserver import XObserver
 
 from Tests.configuration import Configuration
 
+class BreakingPlayer(RandomPlayer):
+    """ Random player that raises on every move against the given opponent, whatever it played before """
+    def __init__(self, player_id, breaks_against):
+        super().__init__(player_id)
+        self.breaks_against = breaks_against
+        self.opponent = None
+
+    def notify_of_opponent(self, opponent_id):
+        self.opponent = opponent_id
+
+    def get_move(self, board, rule_checker):
+        if self.opponent == self.breaks_against:
+            raise TypeError()
+        return super().get_move(board, rule_checker)
+
+
 @pytest.fixture
 def duplicate_players_conf(random_player_one, infinite_player_one, misbehaving_player_one):
     return Configuration([random_player_one, infinite_player_one, RandomPlayer("random_one"), misbehaving_player_one], [])
@@ -45,3 +64,76 @@ class TestInit:
 
 
 
+
+
+class TestParallel:
+    def run(self, players, processes):
+        manager = TournamentManager(Configuration(players, []), processes=processes)
+        return manager.run_tournament()
+
+    def test_same_result_as_sequential(self, random_player_one, random_player_two, misbehaving_player_one,
+                                       crashing_player_one):
+        players = [random_player_one, misbehaving_player_one, random_player_two, crashing_player_one]
+        sequential = self.run(copy.deepcopy(players), 1)
+        parallel = self.run(copy.deepcopy(players), 3)
+        assert parallel == sequential
+        assert parallel[0] == ["misbehaving_one", "crashing_player_one"]
+
+
+class TestConcurrent:
+    def run(self, players, threads):
+        manager = TournamentManager(Configuration(players, []), threads=threads)
+        return manager.run_tournament()
+
+    @pytest.mark.parametrize("count", [2, 3, 4, 7, 10])
+    def test_rounds_pair_everyone_once(self, count):
+        rounds = round_robin_rounds(count)
+        pairings = [pairing for pairings in rounds for pairing in pairings]
+        assert sorted(pairings) == [(i, j) for i in range(count) for j in range(i + 1, count)]
+        for pairings in rounds:
+            players = [player for pairing in pairings for player in pairing]
+            assert len(players) == len(set(players))
+        assert len(rounds) == count - 1 + count % 2
+
+    def test_same_result_as_sequential(self):
+        players = [RandomPlayer(name) for name in ["one", "two", "three", "four", "five"]]
+        sequential = self.run(copy.deepcopy(players), 1)
+        concurrent = self.run(copy.deepcopy(players), 2)
+        assert concurrent == sequential
+
+    def test_same_result_as_sequential_with_misbehaving_players(self, random_player_one, random_player_two):
+        players = [random_player_one, BreakingPlayer("breaking_one", "random_two"), random_player_two,
+                   BreakingPlayer("breaking_two", "random_one"), RandomPlayer("three")]
+        sequential = self.run(copy.deepcopy(players), 1)
+        concurrent = self.run(copy.deepcopy(players), 2)
+        assert concurrent == sequential
+        assert concurrent[0] == ["breaking_two", "breaking_one"]
+
+    def test_misbehaving_player_plays_series_before_its_failure(self, random_player_one, random_player_two):
+        # The breaking player fails against the last player in the second round, before it
+        # plays the first player in the last round, which comes first in the usual order
+        players = [random_player_one, BreakingPlayer("breaking_one", "three"), random_player_two,
+                   RandomPlayer("three")]
+        sequential = self.run(copy.deepcopy(players), 1)
+        concurrent = self.run(copy.deepcopy(players), 2)
+        assert concurrent == sequential
+        opponents = {player for meet_up in concurrent[1] if "breaking_one" in meet_up for player in meet_up}
+        assert opponents == {"breaking_one", "random_one", "random_two", "three"}
+
+    def test_plays_series_of_round_at_once(self):
+        active = []
+        most_active = []
+        lock = threading.Lock()
+
+        class SlowPlayer(RandomPlayer):
+            def get_move(self, board, rule_checker):
+                with lock:
+                    active.append(self.get_id())
+                    most_active.append(len(active))
+                time.sleep(0.001)
+                with lock:
+                    active.remove(self.get_id())
+                return super().get_move(board, rule_checker)
+
+        self.run([SlowPlayer(name) for name in ["one", "two", "three", "four"]], 2)
+        assert max(most_active) > 1
@@ -0,0 +1,70 @@
+import pytest
+import copy
+import random
+
+from Admin.board import GameBoard
+from Admin.board_snapshot import BoardSnapshot
+from Admin.compact_board import CompactGameBoard
+from Lib.stack_board import StackBoard
+from Lib.zobrist import heights_key, player_keys
+from Lib.bitboard import CELL_INDEX
+
+
+@pytest.fixture(params=[GameBoard, CompactGameBoard])
+def board(request):
+    board = request.param()
+    board.place_worker("one", "1", 0, 0)
+    board.place_worker("two", "1", 3, 3)
+    return board
+
+
+def full_key(board):
+    """ Zobrist key of the board computed from scratch """
+    key = heights_key(board.get_heights())
+    for x, y in board.find_workers():
+        key ^= player_keys(board.get_player_id(x, y))[CELL_INDEX[(x, y)]]
+    return key
+
+
+""" Test hash_key """
+def test_empty_board_key_is_zero():
+    assert GameBoard().hash_key() == 0
+    assert CompactGameBoard().hash_key() == 0
+
+def test_key_follows_changes(board):
+    rand = random.Random(3)
+    for _ in range(100):
+        x, y = rand.randrange(6), rand.randrange(6)
+        if board.get_player_id(x, y) is None:
+            if rand.random() < 0.5:
+                board.build_floor(x, y)
+            else:
+                board.move_worker(*board.find_workers()[0], x, y)
+        assert board.hash_key() == full_key(board)
+
+def test_same_position_same_key():
+    one = GameBoard()
+    two = CompactGameBoard()
+    for board in (one, two):
+        board.build_floor(1, 1, 2)
+        board.place_worker("one", "1", 0, 0)
+    one.move_worker(0, 0, 0, 1)
+    two.place_worker("one", "1", 0, 1)
+    two.place_worker(None, None, 0, 0)
+    assert one.hash_key() == two.hash_key()
+
+def test_copies_keep_key(board):
+    assert copy.deepcopy(board).hash_key() == board.hash_key()
+    assert BoardSnapshot(board).hash_key() == board.hash_key()
+
+
+""" Test StackBoard """
+def test_pop_restores_key(board):
+    stack = StackBoard(board)
+    key = stack.hash_key()
+    stack.push({'type': 'move', 'xy1': [0, 0], 'xy2': [1, 0]})
+    stack.push({'type': 'build', 'xy1': [1, 0], 'xy2': [2, 0]})
+    assert stack.hash_key() != key
+    stack.pop()
+    stack.pop()
+    assert stack.hash_key() == key
@@ -0,0 +1,70 @@
+import pytest
+import random
+import socket
+import threading
+import time
+from itertools import islice
+
+from Remote.backoff import Backoff
+from Remote.relay import Relay
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('localhost', 0))
+        return s.getsockname()[1]
+
+
+""" Test backoff """
+def test_delays_grow_to_maximum():
+    delays = list(islice(Backoff(0.1, 1.0, 2.0, jitter=False), 6))
+    assert delays == pytest.approx([0.1, 0.2, 0.4, 0.8, 1.0, 1.0])
+
+
+def test_jitter_stays_below_bound():
+    bounds = islice(Backoff(0.1, 1.0, 2.0, jitter=False), 20)
+    delays = islice(Backoff(0.1, 1.0, 2.0, rng=random.Random(0)), 20)
+    assert all(0 <= delay <= bound for delay, bound in zip(delays, bounds))
+
+
+def test_jitter_spreads_clients():
+    first_delays = [next(iter(Backoff(1.0, rng=random.Random(seed)))) for seed in range(10)]
+    assert len(set(first_delays)) == 10
+
+
+def test_invalid_backoff():
+    with pytest.raises(ValueError):
+        Backoff(factor=0.5)
+
+
+""" Test connect """
+def test_gives_up_at_deadline():
+    relay = Relay('localhost', free_port(), backoff=Backoff(0.01, 0.05), connect_deadline=0.3)
+    start = time.monotonic()
+    with pytest.raises(TimeoutError):
+        relay.connect()
+    assert time.monotonic() - start < 1
+    assert not relay.live
+
+
+def test_connects_once_server_is_up():
+    port = free_port()
+    server = socket.socket()
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+    def start_server():
+        time.sleep(0.2)
+        server.bind(('localhost', port))
+        server.listen(1)
+    thread = threading.Thread(target=start_server)
+    thread.start()
+
+    relay = Relay('localhost', port, backoff=Backoff(0.01, 0.05), connect_deadline=5)
+    relay.connect()
+    thread.join()
+
+    assert relay.live
+    assert relay.connect_attempts > 1
+    assert 0.2 <= relay.connect_time < 5
+    relay.close()
+    server.close()
@@ -0,0 +1,97 @@
+import pytest
+import socket
+
+from Admin.board import GameBoard
+from Lib.util import xboard
+from Remote.binary_codec import (TAG_BOARD, decode, decode_cell, encode_board, encode_cell, encode_delta,
+                                 encode_turn)
+from Remote.board_delta import delta_message
+from Remote.framing import (BINARY, LENGTH_PREFIX, SUPPORTED_FEATURES, MessageDecoder, encode, framing_of,
+                            receive)
+from Remote.remote_player import RemotePlayer
+
+TURN = ["2", "EAST", "NORTH", "WEST", "PUT"]
+
+
+@pytest.fixture
+def board():
+    board = GameBoard()
+    board.place_worker("one", "1", 0, 0)
+    board.place_worker("one", "2", 0, 5)
+    board.place_worker("two", "1", 5, 5)
+    board.place_worker("two", "2", 5, 0)
+    board.build_floor(0, 5, 3)
+    board.build_floor(2, 2, 4)
+    return board
+
+
+""" Test codec """
+@pytest.mark.parametrize("el", [0, 4, "0one1", "3one2", "2two1", "1two2"])
+def test_cell_round_trip(el):
+    assert decode_cell(encode_cell(el, "one"), "one", "two") == el
+
+
+def test_cells_are_relative_to_receiver():
+    assert encode_cell("0one1", "one") == encode_cell("0two1", "two")
+    assert decode_cell(encode_cell("0one1", "two"), "two", "one") == "0one1"
+
+
+def test_unknown_worker_id_is_not_encoded():
+    with pytest.raises(ValueError):
+        encode_cell("0one3", "one")
+
+
+def test_board_is_one_byte_per_cell(board):
+    message = encode_board(xboard(board), "one")
+    assert len(message) == 37 and message[0] == TAG_BOARD
+    assert decode(message, "one", "two") == xboard(board)
+
+
+def test_delta_round_trip(board):
+    previous = xboard(board)
+    board.move_worker(0, 0, 1, 1)
+    board.build_floor(1, 0)
+    delta = delta_message(previous, xboard(board))
+    assert decode(encode_delta(delta, "two"), "two", "one") == delta
+
+
+@pytest.mark.parametrize("turn", [TURN, ["1", "PUT", "SOUTH", "EAST", "SOUTH"]])
+def test_turn_is_four_bytes(turn):
+    message = encode_turn(turn)
+    assert len(message) == 4
+    assert decode(message) == turn
+
+
+@pytest.mark.parametrize("payload", [b"", b"\x01\x00", b"\x03\x02\x00\x00", b"\x03\x00\x09\x00", b"\x02\x00\x00\x00\x00\x24\x00"])
+def test_invalid_binary_message(payload):
+    with pytest.raises(ValueError):
+        decode(payload, "one", "two")
+
+
+""" Test framing """
+def test_binary_is_negotiable_and_length_prefixed():
+    assert BINARY in SUPPORTED_FEATURES
+    assert framing_of([BINARY]) == LENGTH_PREFIX
+
+
+def test_decoder_hands_out_binary_and_json_messages():
+    decoder = MessageDecoder(LENGTH_PREFIX)
+    decoder.feed(encode(encode_turn(TURN), LENGTH_PREFIX) + encode(["resend-board"], LENGTH_PREFIX))
+    assert decoder.pop() == encode_turn(TURN)
+    assert decoder.pop() == ["resend-board"]
+
+
+""" Test remote player """
+def test_remote_player_sends_binary_board(board):
+    left, right = socket.socketpair()
+    player = RemotePlayer("one", left, features=[BINARY])
+    right.sendall(encode(encode_turn(["1", "EAST", "SOUTH", "EAST", "PUT"]), LENGTH_PREFIX))
+
+    move = player.get_move(board, None)
+    message = receive(right, MessageDecoder(LENGTH_PREFIX))
+
+    assert move == {'type': 'move', 'xy1': [0, 0], 'xy2': [1, 1]}
+    assert player.get_build(board, "1", None) == {'type': 'build', 'xy1': [1, 1], 'xy2': [2, 1]}
+    assert decode(message, "one", "two") == xboard(board)
+    left.close()
+    right.close()
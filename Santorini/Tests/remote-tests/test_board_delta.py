@@ -0,0 +1,127 @@
+import pytest
+import socket
+
+from Admin.board import GameBoard
+from Lib.util import xboard
+from Remote.board_delta import RESEND_BOARD, apply_delta, checksum, delta_message, is_delta_message
+from Remote.framing import BOARD_DELTA, SUPPORTED_FEATURES, MessageDecoder, encode, read_sign_up, receive
+from Remote.remote_player import RemotePlayer
+
+TURN = ["1", "EAST", "PUT", "EAST", "PUT"]
+
+
+@pytest.fixture
+def board():
+    board = GameBoard()
+    board.place_worker("one", "1", 0, 0)
+    board.place_worker("one", "2", 0, 5)
+    board.place_worker("two", "1", 5, 5)
+    board.place_worker("two", "2", 5, 0)
+    return board
+
+
+@pytest.fixture
+def connection():
+    left, right = socket.socketpair()
+    yield left, right
+    left.close()
+    right.close()
+
+
+def take_turn(player, board, right, *responses):
+    """ Answer the player's next turn with the responses and return the messages it sent """
+    right.sendall(b"".join(encode(response) for response in responses))
+    player.get_move(board, None)
+    decoder = MessageDecoder()
+    right.setblocking(False)
+    messages = []
+    try:
+        while True:
+            messages.append(receive(right, decoder))
+    except BlockingIOError:
+        pass
+    right.setblocking(True)
+    return messages
+
+
+""" Test deltas """
+def test_delta_applies_to_previous_board(board):
+    previous = xboard(board)
+    board.move_worker(0, 0, 1, 1)
+    board.build_floor(2, 2)
+    message = delta_message(previous, xboard(board))
+
+    assert is_delta_message(message)
+    assert sorted(message[1]) == [[0, 0, 0], [1, 1, "0one1"], [2, 2, 1]]
+    assert apply_delta(previous, message) == xboard(board)
+
+
+def test_delta_without_previous_board_is_not_applied(board):
+    assert apply_delta(None, delta_message(xboard(board), xboard(board))) is None
+
+
+def test_delta_with_wrong_checksum_is_not_applied(board):
+    previous = xboard(board)
+    board.build_floor(2, 2)
+    message = delta_message(previous, xboard(board))
+    previous[3][3] = 2
+    assert apply_delta(previous, message) is None
+
+
+def test_delta_off_the_board_is_not_applied(board):
+    previous = xboard(board)
+    assert apply_delta(previous, ["board-delta", [[6, 0, 1]], checksum(previous)]) is None
+
+
+def test_board_delta_is_negotiable():
+    assert BOARD_DELTA in SUPPORTED_FEATURES
+    assert read_sign_up(["sign-up", "one", [BOARD_DELTA]]) == ("one", [BOARD_DELTA])
+
+
+""" Test remote player """
+def test_first_turn_sends_full_board(board, connection):
+    left, right = connection
+    player = RemotePlayer("one", left, features=[BOARD_DELTA])
+    assert take_turn(player, board, right, TURN) == [xboard(board)]
+
+
+def test_later_turns_send_delta(board, connection):
+    left, right = connection
+    player = RemotePlayer("one", left, features=[BOARD_DELTA])
+    first = take_turn(player, board, right, TURN)[0]
+    board.move_worker(5, 5, 4, 4)
+    board.build_floor(3, 3)
+
+    message, = take_turn(player, board, right, TURN)
+    assert is_delta_message(message)
+    assert apply_delta(first, message) == xboard(board)
+
+
+def test_resend_board_sends_full_board(board, connection):
+    left, right = connection
+    player = RemotePlayer("one", left, features=[BOARD_DELTA])
+    take_turn(player, board, right, TURN)
+    board.build_floor(3, 3)
+
+    delta, full = take_turn(player, board, right, RESEND_BOARD, TURN)
+    assert is_delta_message(delta)
+    assert full == xboard(board)
+
+
+def test_placement_starts_over_with_full_board(board, connection):
+    left, right = connection
+    player = RemotePlayer("one", left, features=[BOARD_DELTA])
+    take_turn(player, board, right, TURN)
+    right.sendall(encode([2, 2]))
+    player.get_placement(GameBoard(), "1", None)
+    receive(right, MessageDecoder())
+
+    assert take_turn(player, board, right, TURN) == [xboard(board)]
+
+
+def test_no_delta_without_feature(board, connection):
+    left, right = connection
+    player = RemotePlayer("one", left)
+    take_turn(player, board, right, TURN)
+    board.build_floor(3, 3)
+    assert take_turn(player, board, right, TURN) == [xboard(board)]
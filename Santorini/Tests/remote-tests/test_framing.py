@@ -0,0 +1,94 @@
+import pytest
+import socket
+
+from Remote.framing import (JSON_STREAM, LENGTH_PREFIX, MessageDecoder, encode, frame, read_sign_up,
+                            receive, sign_up_message)
+from Remote.remote_player import RemotePlayer
+
+
+def decode_all(decoder, *chunks):
+    """ Feed every chunk to the decoder and pop every complete message """
+    messages = []
+    for chunk in chunks:
+        decoder.feed(chunk)
+        while decoder:
+            messages.append(decoder.pop())
+    return messages
+
+
+""" Test JSON stream """
+def test_decodes_coalesced_messages():
+    assert decode_all(MessageDecoder(), b'["a", 1]"b"{"c": null}') == [["a", 1], "b", {"c": None}]
+
+def test_decodes_split_messages():
+    chunks = [b'[["one", "EA', b'ST"], 0', b', 1]  "tw', b'o"']
+    assert decode_all(MessageDecoder(), *chunks) == [[["one", "EAST"], 0, 1], "two"]
+
+def test_decodes_split_literal():
+    assert decode_all(MessageDecoder(), b'[tr', b'ue, nu', b'll]') == [[True, None]]
+
+def test_holds_trailing_number():
+    decoder = MessageDecoder()
+    assert decode_all(decoder, b'12') == []
+    assert decode_all(decoder, b'.5', b' ') == [12.5]
+
+def test_decodes_split_character():
+    data = '"été"'.encode()
+    assert decode_all(MessageDecoder(), data[:2], data[2:]) == ["été"]
+
+def test_raises_on_invalid_json():
+    decoder = MessageDecoder()
+    decoder.feed(b'invalid JSON')
+    with pytest.raises(ValueError):
+        decoder.pop()
+
+
+""" Test length prefix """
+def test_decodes_length_prefixed_messages():
+    data = encode(["a", 1], LENGTH_PREFIX) + encode("b", LENGTH_PREFIX)
+    assert decode_all(MessageDecoder(LENGTH_PREFIX), data[:3], data[3:9], data[9:]) == [["a", 1], "b"]
+
+def test_switching_framing_keeps_pending_bytes():
+    decoder = MessageDecoder()
+    decoder.feed(b'"name"' + encode("next", LENGTH_PREFIX))
+    assert decoder.pop() == "name"
+    decoder.framing = LENGTH_PREFIX
+    assert decoder.pop() == "next"
+
+def test_stream_frame_is_plain_json():
+    assert frame(b'"a"', JSON_STREAM) == b'"a"'
+
+
+""" Test sign up """
+def test_bare_name_sign_up():
+    assert sign_up_message("one", []) == "one"
+    assert read_sign_up("one") == ("one", None)
+
+def test_sign_up_keeps_supported_features():
+    assert read_sign_up(sign_up_message("one", [LENGTH_PREFIX, "unknown"])) == ("one", [LENGTH_PREFIX])
+
+
+""" Test connections """
+def test_receive_raises_when_closed():
+    left, right = socket.socketpair()
+    right.close()
+    with pytest.raises(EOFError):
+        receive(left, MessageDecoder())
+    left.close()
+
+@pytest.mark.parametrize("features", [[], [LENGTH_PREFIX]])
+def test_remote_player_reads_pipelined_messages(features):
+    left, right = socket.socketpair()
+    player = RemotePlayer("one", left, features=features)
+    framing = LENGTH_PREFIX if features else JSON_STREAM
+    right.sendall(encode([0, 0], framing) + encode([1, 1], framing))
+
+    assert player.get_placement(BoardStub(), "1", None)['xy'] == [0, 0]
+    assert player.get_placement(BoardStub(), "2", None)['xy'] == [1, 1]
+    left.close()
+    right.close()
+
+
+class BoardStub:
+    def find_workers(self):
+        return []
@@ -0,0 +1,155 @@
+import json
+
+from Player.players.random_player import Player as RandomPlayer
+from Remote.binary_codec import decode, encode_board, encode_delta
+from Remote.board_delta import RESEND_BOARD, delta_message
+from Remote.framing import BINARY
+from Remote.relay_player import RelayPlayer
+
+
+class ScriptedRelay:
+    """ Relay that hands the player scripted server messages and keeps what it sends """
+    def __init__(self, messages, features=()):
+        self.messages = messages
+        self.features = list(features)
+        self.sent = []
+
+    def sign_up(self, name):
+        return self.features
+
+    def subscribe(self, handler, on_connection_loss):
+        for message in self.messages:
+            handler(message)
+
+    def send(self, message):
+        self.sent.append(message if isinstance(message, bytes) else json.loads(message))
+
+
+class RecordingPlayer(RandomPlayer):
+    """ Random player that keeps the Board specification of every board it is asked to move and build on """
+    def __init__(self, player_id):
+        super().__init__(player_id)
+        self.move_boards = []
+        self.build_boards = []
+
+    def get_move(self, board, rule_checker):
+        self.move_boards.append(specification(board))
+        return super().get_move(board, rule_checker)
+
+    def get_build(self, board, wid, rule_checker):
+        self.build_boards.append(specification(board))
+        return super().get_build(board, wid, rule_checker)
+
+
+def specification(board):
+    """ Board specification of a board, as the server sends it """
+    spec = [[board.get_height(x, y) for x in range(6)] for y in range(6)]
+    for x, y in board.find_workers():
+        spec[y][x] = "{}{}{}".format(spec[y][x], board.get_player_id(x, y), board.get_worker_id(x, y))
+    return spec
+
+
+def board_with(cells):
+    """ Board specification of an empty board with the given cells """
+    spec = [[0] * 6 for _ in range(6)]
+    for (x, y), cell in cells.items():
+        spec[y][x] = cell
+    return spec
+
+
+def play(messages, features=()):
+    """ Play the messages with a RecordingPlayer named one against two """
+    player = RecordingPlayer("one")
+    relay = ScriptedRelay(["two"] + messages, features)
+    RelayPlayer(player, relay).run()
+    return player, relay
+
+
+def moved(spec, xy1, xy2):
+    """ Board specification after the worker on xy1 moves to xy2 """
+    spec = [list(row) for row in spec]
+    x1, y1 = xy1
+    x2, y2 = xy2
+    worker = spec[y1][x1]
+    spec[y1][x1] = int(worker[0])
+    spec[y2][x2] = str(spec[y2][x2]) + worker[1:]
+    return spec
+
+
+FIRST = board_with({(0, 0): "0one1", (5, 5): "0one2", (0, 5): "0two1", (5, 0): "0two2"})
+SECOND = board_with({(1, 1): "1one1", (5, 5): "0one2", (0, 4): "0two1", (5, 0): "0two2",
+                     (2, 2): 2, (0, 5): 1})
+
+
+""" Test turns """
+def test_player_sees_server_board():
+    player, _ = play([[], [["one", 3, 3], ["two", 4, 4]], FIRST])
+    assert player.move_boards == [FIRST]
+
+
+def test_player_sees_changed_cells():
+    player, _ = play([[], FIRST, SECOND])
+    assert player.move_boards == [FIRST, SECOND]
+
+
+def test_player_builds_after_its_move():
+    player, relay = play([[], FIRST, SECOND])
+    for move_board, build_board, turn in zip(player.move_boards, player.build_boards, relay.sent[1:]):
+        wid, move_EW, move_NS = turn[:3]
+        x, y = next((x, y) for y, row in enumerate(move_board) for x, cell in enumerate(row)
+                    if cell in ["{}one{}".format(height, wid) for height in range(4)])
+        x2 = x + {"EAST": 1, "WEST": -1, "PUT": 0}[move_EW]
+        y2 = y + {"SOUTH": 1, "NORTH": -1, "PUT": 0}[move_NS]
+        assert build_board == moved(move_board, (x, y), (x2, y2))
+    assert len(player.build_boards) == 2
+
+
+def test_new_game_starts_from_empty_board():
+    player, _ = play([[], SECOND, [], FIRST])
+    assert player.move_boards == [SECOND, FIRST]
+
+
+def test_turn_after_placement_keeps_server_board():
+    player, _ = play([[], FIRST, [["two", 1, 1]], board_with({(2, 3): "3one1", (3, 2): "0one2",
+                                                              (1, 1): "0two1", (4, 4): "0two2"})])
+    assert player.move_boards[-1] == board_with({(2, 3): "3one1", (3, 2): "0one2",
+                                                 (1, 1): "0two1", (4, 4): "0two2"})
+
+
+""" Test board deltas """
+def test_player_sees_board_delta():
+    player, _ = play([[], FIRST, delta_message(FIRST, SECOND)])
+    assert player.move_boards == [FIRST, SECOND]
+
+
+def test_mismatched_delta_asks_for_full_board():
+    message = delta_message(FIRST, SECOND)
+    message[2] += 1
+    player, relay = play([[], FIRST, message, SECOND])
+    assert relay.sent[2] == RESEND_BOARD
+    assert player.move_boards == [FIRST, SECOND]
+
+
+def test_delta_of_new_game_asks_for_full_board():
+    player, relay = play([[], FIRST, [], delta_message(FIRST, SECOND)])
+    assert relay.sent[-1] == RESEND_BOARD
+    assert player.move_boards == [FIRST]
+
+
+""" Test binary messages """
+def test_player_sees_binary_boards():
+    player, relay = play([[], encode_board(FIRST, "one"), encode_delta(delta_message(FIRST, SECOND), "one")], [BINARY])
+    assert player.move_boards == [FIRST, SECOND]
+    assert all(isinstance(turn, bytes) for turn in relay.sent[1:])
+    assert len(relay.sent) == 3
+
+
+def test_binary_turn_matches_json_turn():
+    _, json_relay = play([[], FIRST])
+    _, binary_relay = play([[], encode_board(FIRST, "one")], [BINARY])
+    assert decode(binary_relay.sent[-1]) == json_relay.sent[-1]
+
+
+def test_invalid_binary_message_gives_up():
+    _, relay = play([[], b"\x01\x00"], [BINARY])
+    assert relay.sent[-1] == "one"
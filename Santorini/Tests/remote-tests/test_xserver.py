@@ -0,0 +1,99 @@
+import pytest
+import json
+import socket
+import sys, os
+import threading
+dir_path = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, dir_path + '/../../')
+
+from Tests.xserver import XServer
+from Remote.framing import LENGTH_PREFIX, MessageDecoder, encode, receive, sign_up_message
+
+
+class ServerConfiguration:
+    def __init__(self, port, waiting_for):
+        self.__port = port
+        self.__waiting_for = waiting_for
+
+    def min_players(self):
+        return 0
+
+    def port(self):
+        return self.__port
+
+    def waiting_for(self):
+        return self.__waiting_for
+
+    def repeat(self):
+        return False
+
+    def backlog(self):
+        return 512
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('localhost', 0))
+        return s.getsockname()[1]
+
+
+def connect_all(port, names):
+    """ Connect a client for every name, returning the sockets """
+    clients = []
+    for name in names:
+        client = socket.create_connection(('localhost', port))
+        client.sendall(json.dumps(name).encode())
+        clients.append(client)
+    return clients
+
+
+""" Test sign up """
+def test_signs_up_burst_of_players():
+    port = free_port()
+    server = XServer(ServerConfiguration(port, 2))
+    server._XServer__socket.listen(server.backlog)
+
+    names = ["player{}".format(i) for i in range(200)]
+    clients = []
+    thread = threading.Thread(target=lambda: clients.extend(connect_all(port, names)))
+    thread.start()
+    server._XServer__accept_connections()
+    thread.join()
+
+    assert sorted(p.get_id() for p in server.players) == sorted(names)
+    for client in clients:
+        client.close()
+    server.close()
+
+def test_drops_connections_without_name():
+    port = free_port()
+    server = XServer(ServerConfiguration(port, 1))
+    server._XServer__socket.listen(server.backlog)
+
+    silent = socket.create_connection(('localhost', port))
+    invalid = socket.create_connection(('localhost', port))
+    invalid.sendall(b'not json')
+    server._XServer__accept_connections()
+
+    assert server.players == []
+    assert silent.recv(10) == b''
+    silent.close()
+    invalid.close()
+    server.close()
+
+def test_negotiates_length_prefix():
+    port = free_port()
+    server = XServer(ServerConfiguration(port, 1))
+    server._XServer__socket.listen(server.backlog)
+
+    client = socket.create_connection(('localhost', port))
+    client.sendall(encode(sign_up_message("one", [LENGTH_PREFIX])))
+    server._XServer__accept_connections()
+
+    decoder = MessageDecoder()
+    assert receive(client, decoder) == ["features", [LENGTH_PREFIX]]
+    decoder.framing = LENGTH_PREFIX
+    server.players[0].set_id("two")
+    assert receive(client, decoder) == ["playing-as", "two"]
+    client.close()
+    server.close()
@@ -25,13 +25,15 @@ from Remote.relay_player import RelayPlayer
 class XClients:
     """ Client side of a Santorini tournament. """
 
-    def __init__(self, configuration=STDINRemoteConfiguration()):
+    def __init__(self, configuration=STDINRemoteConfiguration(), features=()):
         """
         Initialize XClients with given configuration, which provides, players, observers, ip
         address and port number.
 
         :param configuration: Configuration, configuration for xclients.
+        :param features: [string, ...], features every relay asks the server for at sign-up
         """
+        self.features = list(features)
         self.players = configuration.players()
         self.observers = configuration.observers()
         self.ip = configuration.ip()
@@ -64,7 +66,7 @@ class XClients:
 
         :return: Relay, client proxy
         """
-        return Relay(self.ip, self.port)
+        return Relay(self.ip, self.port, features=self.features)
 
 
 
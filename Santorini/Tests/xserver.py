@@ -9,19 +9,22 @@ import json
 import names
 import fileinput
 import names
+import asyncio
 
 sys.path.append('./Santorini/')
 sys.path.append('./gija-emmi/Santorini/')
 sys.path.append('../Santorini/')
 
-from threading import Thread
-from timeout_decorator import timeout, TimeoutError
 from pprint import pprint
 
 from Remote.server_configurations.stdin_server_configuration import ServerConfiguration
 from Admin.tournament_manager import TournamentManager
 from Admin.configurations.standard_configuration import StandardConfiguration
 from Remote.remote_player import RemotePlayer
+from Remote.framing import BUFFER_SIZE, MessageDecoder, encode, read_sign_up
+
+# Seconds a read or write on a player's connection may block, longer than a Referee's time limit
+SOCKET_TIMEOUT = 10
 
 
 class XServer:
@@ -35,13 +38,14 @@ class XServer:
         """
         # Server attributes
         self.ip = 'localhost'
-        self.buffer_size = 1024
+        self.buffer_size = BUFFER_SIZE
 
         # Configuration attributes
         self.min_players = configuration.min_players()
         self.port = configuration.port()
         self.waiting_for = configuration.waiting_for()
         self.repeat = configuration.repeat()
+        self.backlog = configuration.backlog()
         
         # Socket initialization
         self.__socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -58,7 +62,7 @@ class XServer:
         """
 
         # Start socket
-        self.__socket.listen(3)
+        self.__socket.listen(self.backlog)
         self.live = True
 
         # Accept all connections
@@ -69,8 +73,9 @@ class XServer:
             self.__reset()
             return self.start() # return to avoid stack overflow
 
-        # Run TournamentManager
-        tournament_manager = TournamentManager(StandardConfiguration(self.players, []))
+        # Run TournamentManager, playing the series of a round at the same time
+        tournament_manager = TournamentManager(StandardConfiguration(self.players, []),
+                                               threads=max(1, len(self.players) // 2))
         result = tournament_manager.run_tournament()
 
         # Print result and notify players
@@ -112,35 +117,69 @@ class XServer:
 
     def __accept_connections(self):
         """
-        Accept incoming TCP connections and delegating each one
-        to a new thread to handle player initialization.
+        Accept incoming TCP connections for the waiting period, signing up a
+        player from each one on an event loop instead of a thread per connection.
+        """
+        asyncio.run(self.__sign_up_players())
+
+
+    async def __sign_up_players(self):
+        """
+        Accept connections until the waiting period is over, then drop the
+        connections that have not sent their name yet.
         """
+        loop = asyncio.get_running_loop()
+        sign_ups = set()
 
-        @timeout(self.waiting_for)
-        def go():
+        async def accept():
             while True:
-                conn, addr = self.__socket.accept()
-                thread = Thread(target=self.__init_player, args=(conn,))
-                thread.start()
+                connection, addr = await loop.sock_accept(self.__socket)
+                sign_ups.add(loop.create_task(self.__init_player(connection)))
 
+        self.__socket.setblocking(False)
         try:
-            go()
-        except TimeoutError:
-            return
-            
-        
-    def __init_player(self, connection):
+            await asyncio.wait_for(accept(), self.waiting_for)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self.__socket.setblocking(True)
+
+        for sign_up in sign_ups:
+            sign_up.cancel()
+        await asyncio.gather(*sign_ups, return_exceptions=True)
+
+
+    async def __init_player(self, connection):
         """
         Create a RemotePlayer from the TCP connection and append to players list.
 
         :param connection: conn, TCP connection
         """
+        loop = asyncio.get_running_loop()
+        # Keeps whatever the client sent after its sign-up for the RemotePlayer
+        decoder = MessageDecoder()
+        connection.setblocking(False)
         try:
-            name = connection.recv(self.buffer_size).decode()
+            while not decoder:
+                data = await loop.sock_recv(connection, self.buffer_size)
+                if not data:
+                    raise EOFError("Connection closed before sign-up")
+                decoder.feed(data)
+            name, features = read_sign_up(decoder.pop())
+
+            # Clients asking for features are told which ones they get
+            if features is not None:
+                await loop.sock_sendall(connection, encode(["features", features]))
+        except asyncio.CancelledError:
+            connection.close()
+            raise
         except:
+            connection.close()
             return
-        player = RemotePlayer(json.loads(name), connection)
-        self.players.append(player)
+
+        # Games talk to the player with blocking calls, which time out
+        connection.setblocking(True)
+        self.players.append(RemotePlayer(name, connection, self.buffer_size, decoder, features or (), SOCKET_TIMEOUT))
 
 
     def __reset(self):